@@ -118,6 +118,18 @@ def create_app(config_class=None):
             logger.error(f"清除缓存失败: {str(e)}")
             return jsonify({"error": "清除缓存失败"}), 500
 
+    @app.route('/cache/stats', methods=['GET'])
+    @jwt_required()
+    @admin_required
+    def cache_stats_endpoint():
+        """查看余额缓存命中统计"""
+        try:
+            from app.utils.balance_cache import get_cache_stats
+            return jsonify({"balance_cache": get_cache_stats()})
+        except Exception as e:
+            logger.error(f"获取缓存统计失败: {e}")
+            return jsonify({"error": "获取缓存统计失败"}), 500
+
     # 应用启动日志
     logger.success(f"应用创建完成: {config.APP_NAME}")
     logger.info(f"API 端点前缀: /api/v1")
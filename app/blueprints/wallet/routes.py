@@ -1,31 +1,126 @@
-from flask import jsonify
+import json
+from flask import jsonify, request, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import wallet_bp
 from .schemas import (
-    WalletSchema, TransferSchema, RemoveStakeSchema,
+    WalletSchema, WalletQuerySchema, BalanceHistoryQuerySchema, BalanceHistorySchema, StakeBreakdownSchema, SyncJobSchema, TransferSchema, TransferBatchSchema, TransferBatchResultSchema, RemoveStakeSchema,
     WalletPasswordSetSchema, WalletPasswordBatchSchema, WalletPasswordBatchResultSchema,
     MinerSchema, MinerRegSchema, MinerRegBatchSchema,
-    ExternalWalletSchema, ExternalWalletCreateSchema, ExternalWalletUpdateSchema, ExternalTransferSchema
+    ExternalWalletSchema, ExternalWalletCreateSchema, ExternalWalletUpdateSchema, ExternalTransferSchema,
+    TransferJobSchema
 )
-from .services import WalletService, WalletPasswordService, MinerService, ExternalWalletService, TransferRecordService
+from .services import WalletService, WalletPasswordService, MinerService, ExternalWalletService, TransferRecordService, TransferJobService
+from app.extensions import logger
 from app.utils.decorators import admin_required
+from app.errors.custom_errors import AppException, ValidationError
+
+# 钱包列表支持的响应格式
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+# 调用方指定余额最大陈旧时间的请求头
+MAX_STALENESS_HEADER = 'X-Max-Staleness'
 
 @wallet_bp.route('', methods=['GET'])
+@wallet_bp.arguments(WalletQuerySchema, location='query')
 @wallet_bp.response(200, WalletSchema(many=True))
 @jwt_required()
-def get_wallets_for_user():
+def get_wallets_for_user(args):
     user_id = int(get_jwt_identity())
-    wallets = WalletService.get_wallets_for_user(user_id)
+
+    # 通过 Accept 头选择流式响应（NDJSON 或 SSE），默认返回完整 JSON 数组
+    mimetype = request.accept_mimetypes.best_match(
+        ['application/json', NDJSON_MIMETYPE, SSE_MIMETYPE], default='application/json'
+    )
+    max_staleness = _get_max_staleness()
+    if mimetype in (NDJSON_MIMETYPE, SSE_MIMETYPE):
+        rows = WalletService.iter_wallets_for_user(user_id, fresh=args['fresh'], max_staleness=max_staleness)
+        return _stream_wallets(rows, sse=(mimetype == SSE_MIMETYPE))
+
+    wallets = WalletService.get_wallets_for_user(user_id, fresh=args['fresh'], max_staleness=max_staleness)
     return wallets
 
+def _get_max_staleness():
+    """读取调用方可接受的余额最大陈旧时间（秒）：X-Max-Staleness 头，或 Cache-Control: max-age"""
+    value = request.headers.get(MAX_STALENESS_HEADER)
+    if value is None:
+        return request.cache_control.max_age
+    try:
+        max_staleness = int(value)
+    except ValueError:
+        raise ValidationError(f"{MAX_STALENESS_HEADER} 必须是非负整数（秒）")
+    if max_staleness < 0:
+        raise ValidationError(f"{MAX_STALENESS_HEADER} 必须是非负整数（秒）")
+    return max_staleness
+
+def _stream_wallets(rows, sse=False):
+    """按行流式输出钱包信息，每个余额分块查询完成后立即发送"""
+    schema = WalletSchema()
+
+    def _format(payload, event=None):
+        data = json.dumps(payload, ensure_ascii=False)
+        if not sse:
+            return data + '\n'
+        return (f"event: {event}\n" if event else '') + f"data: {data}\n\n"
+
+    def generate():
+        try:
+            for row in rows:
+                yield _format(schema.dump(row))
+        except AppException as e:
+            # 响应头已经发出，只能在流中返回错误
+            yield _format({'error': {'code': e.error_code, 'message': e.message}}, event='error')
+            return
+        except Exception as e:
+            # 未预期的异常不会经过全局错误处理器，在这里记录堆栈并结束流
+            logger.opt(exception=e).error("钱包列表流式输出时出错")
+            yield _format({'error': {'code': 500, 'message': "An internal server error occurred"}}, event='error')
+            return
+        if sse:
+            yield _format({}, event='end')
+
+    mimetype = SSE_MIMETYPE if sse else NDJSON_MIMETYPE
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+
+@wallet_bp.route('/stake-breakdown', methods=['GET'])
+@wallet_bp.response(200, StakeBreakdownSchema)
+@jwt_required()
+def get_stake_breakdown():
+    """获取可见钱包的分子网/分 hotkey 质押明细"""
+    user_id = int(get_jwt_identity())
+    return WalletService.get_stake_breakdown(user_id)
+
+@wallet_bp.route('/<string:coldkey_name>/history', methods=['GET'])
+@wallet_bp.arguments(BalanceHistoryQuerySchema, location='query')
+@wallet_bp.response(200, BalanceHistorySchema)
+@jwt_required()
+def get_balance_history(args, coldkey_name):
+    """获取钱包余额历史（服务端降采样）"""
+    user_id = int(get_jwt_identity())
+    return WalletService.get_balance_history(user_id, coldkey_name, args['from_'], args['to'], args['step'])
+
 @wallet_bp.route('', methods=['POST'])
 @wallet_bp.arguments(TransferSchema)
 @wallet_bp.response(200)
+@wallet_bp.alt_response(202, schema=TransferJobSchema)
 @jwt_required()
 def transfer(data):
+    """本地钱包转账：启用转账队列时入队并返回 202 和任务，否则在请求内同步执行"""
     user_id = int(get_jwt_identity())
+    if current_app.config['TRANSFER_QUEUE_ENABLED']:
+        return TransferJobSchema().dump(TransferJobService.enqueue_transfer(user_id, data)), 202
     WalletService.transfer(user_id, data)
 
+@wallet_bp.route('/transfer/batch', methods=['POST'])
+@wallet_bp.arguments(TransferBatchSchema)
+@wallet_bp.response(200, TransferBatchResultSchema)
+@jwt_required()
+def transfer_batch(data):
+    """批量转账：按转出钱包合并为 batch_all 交易并发提交，返回每笔转账的结果（目标为外部钱包时仅限管理员）"""
+    user_id = int(get_jwt_identity())
+    return WalletService.transfer_batch(user_id, data)
+
 @wallet_bp.route('', methods=['PUT'])
 @wallet_bp.arguments(RemoveStakeSchema)
 @wallet_bp.response(200)
@@ -57,12 +152,28 @@ def set_wallets_password_batch(data):
     return result
 
 @wallet_bp.route('/sync', methods=['POST'])
-@wallet_bp.response(200)
+@wallet_bp.response(202, SyncJobSchema)
 @jwt_required()
 @admin_required
 def sync_wallets():
-    """从文件系统同步钱包到数据库（仅管理员）"""
-    WalletService.sync_wallets_from_filesystem()
+    """提交后台任务强制重新扫描钱包目录并同步到数据库，已有任务运行时返回该任务（仅管理员）"""
+    return WalletService.start_sync_job(force=True)
+
+@wallet_bp.route('/sync/stats', methods=['GET'])
+@wallet_bp.response(200)
+@jwt_required()
+@admin_required
+def get_sync_stats():
+    """查看钱包同步的锁等待和跳过统计（仅管理员）"""
+    return WalletService.get_sync_stats()
+
+@wallet_bp.route('/sync/<string:job_id>', methods=['GET'])
+@wallet_bp.response(200, SyncJobSchema)
+@jwt_required()
+@admin_required
+def get_sync_job(job_id):
+    """查看钱包同步任务的阶段、进度、耗时和错误（仅管理员）"""
+    return WalletService.get_sync_job(job_id)
 
 @wallet_bp.route('/miners', methods=['GET'])
 @wallet_bp.response(200, MinerSchema(many=True))
@@ -134,13 +245,24 @@ def delete_external_wallet(wallet_id):
 @wallet_bp.route('/external/transfer', methods=['POST'])
 @wallet_bp.arguments(ExternalTransferSchema)
 @wallet_bp.response(200)
+@wallet_bp.alt_response(202, schema=TransferJobSchema)
 @jwt_required()
 @admin_required
 def transfer_to_external_wallet(data):
-    """向外部钱包转账（仅管理员）"""
+    """向外部钱包转账（仅管理员）：启用转账队列时入队并返回 202 和任务"""
     user_id = int(get_jwt_identity())
+    if current_app.config['TRANSFER_QUEUE_ENABLED']:
+        return TransferJobSchema().dump(TransferJobService.enqueue_external_transfer(user_id, data)), 202
     ExternalWalletService.transfer_to_external(user_id, data)
 
+@wallet_bp.route('/transfer-jobs/<int:job_id>', methods=['GET'])
+@wallet_bp.response(200, TransferJobSchema)
+@jwt_required()
+def get_transfer_job(job_id):
+    """查看转账任务状态（普通用户只能查看自己提交的任务）"""
+    user_id = int(get_jwt_identity())
+    return TransferJobService.get_job(user_id, job_id)
+
 # =====================
 # 转账记录API
 # =====================
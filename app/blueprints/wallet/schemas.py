@@ -8,15 +8,106 @@ class WalletSchema(Schema):
     free = fields.Float(dump_only=True)
     staked = fields.Float(dump_only=True)
     total = fields.Float(dump_only=True)
+    block = fields.Int(dump_only=True, allow_none=True)
+    as_of = fields.DateTime(dump_only=True, allow_none=True)
+    age = fields.Float(dump_only=True, allow_none=True)
 
     # 管理员专用字段（仅在管理员查看时返回）
     has_password = fields.Bool(dump_only=True, allow_none=True)
 
+class WalletQuerySchema(Schema):
+    """钱包列表查询参数Schema"""
+    fresh = fields.Bool(load_default=False, load_only=True)
+
+class BalanceHistoryQuerySchema(Schema):
+    """余额历史查询参数Schema（时间不带时区时按 UTC 处理）"""
+    from_ = fields.DateTime(data_key='from', load_default=None, load_only=True)
+    to = fields.DateTime(load_default=None, load_only=True)
+    step = fields.Int(load_default=None, validate=validate.Range(min=1), load_only=True)  # 降采样桶宽（秒）
+
+class BalanceHistorySchema(Schema):
+    """余额历史Schema（列式返回，便于图表使用）"""
+    coldkey_name = fields.Str(dump_only=True)
+    coldkey_address = fields.Str(dump_only=True)
+    from_ = fields.DateTime(data_key='from', dump_only=True)
+    to = fields.DateTime(dump_only=True)
+    step = fields.Int(dump_only=True)
+    ts = fields.List(fields.Int(), dump_only=True)
+    block = fields.List(fields.Int(), dump_only=True)
+    free = fields.List(fields.Float(), dump_only=True)
+    staked = fields.List(fields.Float(), dump_only=True)
+    total = fields.List(fields.Float(), dump_only=True)
+
+class StakeBreakdownColdkeySchema(Schema):
+    coldkey_name = fields.Str(dump_only=True)
+    coldkey_address = fields.Str(dump_only=True)
+
+class StakeBreakdownSchema(Schema):
+    """质押明细Schema（矩阵行顺序与 coldkeys/hotkeys 一致，列顺序与 netuids 一致）"""
+    block = fields.Int(dump_only=True)
+    block_hash = fields.Str(dump_only=True)
+    netuids = fields.List(fields.Int(), dump_only=True)
+    prices = fields.List(fields.Float(), dump_only=True)  # 各子网价格（TAO/alpha）
+    coldkeys = fields.List(fields.Nested(StakeBreakdownColdkeySchema), dump_only=True)
+    hotkeys = fields.List(fields.Str(), dump_only=True)
+    coldkey_alpha = fields.List(fields.List(fields.Float()), dump_only=True)
+    coldkey_tao = fields.List(fields.List(fields.Float()), dump_only=True)
+    hotkey_alpha = fields.List(fields.List(fields.Float()), dump_only=True)
+    hotkey_tao = fields.List(fields.List(fields.Float()), dump_only=True)
+
+class SyncJobSchema(Schema):
+    """钱包同步任务状态Schema"""
+    id = fields.Str(dump_only=True)
+    status = fields.Str(dump_only=True)  # queued / running / succeeded / skipped / failed
+    phase = fields.Str(dump_only=True)  # waiting_lock / syncing / done / failed
+    force = fields.Bool(dump_only=True)
+    wallets_scanned = fields.Int(dump_only=True)
+    files_scanned = fields.Int(dump_only=True)
+    files_parsed = fields.Int(dump_only=True)
+    file_errors = fields.Int(dump_only=True)
+    wallets_found = fields.Int(dump_only=True)
+    hotkeys_found = fields.Int(dump_only=True)
+    wallets_inserted = fields.Int(dump_only=True)
+    hotkeys_inserted = fields.Int(dump_only=True)
+    outcome = fields.Str(dump_only=True)
+    error = fields.Str(dump_only=True)
+    elapsed = fields.Float(dump_only=True)  # 秒
+    created_at = fields.Float(dump_only=True)
+    started_at = fields.Float(dump_only=True)
+    finished_at = fields.Float(dump_only=True)
+
 class TransferSchema(Schema):
     alias = fields.Str(validate=validate.Length(max=50), required=True, load_only=True)
     to = fields.Str(validate=validate.Length(equal=48), required=True, load_only=True)
     amount = fields.Float(required=True, load_only=True)
 
+class TransferBatchItemSchema(Schema):
+    from_wallet = fields.Str(validate=validate.Length(max=50), required=True)
+    to_address = fields.Str(validate=validate.Length(equal=48), required=True)
+    amount = fields.Float(required=True, validate=validate.Range(min=0, min_inclusive=False))
+
+class TransferBatchSchema(Schema):
+    """批量转账Schema（目标可以是本地钱包或已登记的外部钱包）"""
+    transfers = fields.List(fields.Nested(TransferBatchItemSchema), required=True,
+                            validate=validate.Length(min=1, max=100), load_only=True)
+
+class TransferBatchLegSchema(Schema):
+    index = fields.Int(dump_only=True)  # 在请求中的位置
+    from_wallet = fields.Str(dump_only=True)
+    to_address = fields.Str(dump_only=True)
+    to_wallet_name = fields.Str(dump_only=True)
+    amount = fields.Float(dump_only=True)
+    transfer_type = fields.Str(dump_only=True)  # local / external
+    status = fields.Str(dump_only=True)  # success / failed
+    block_hash = fields.Str(dump_only=True, allow_none=True)
+    error = fields.Str(dump_only=True, allow_none=True)
+
+class TransferBatchResultSchema(Schema):
+    total = fields.Int(dump_only=True)
+    succeeded = fields.Int(dump_only=True)
+    failed = fields.Int(dump_only=True)
+    results = fields.List(fields.Nested(TransferBatchLegSchema), dump_only=True)
+
 class RemoveStakeSchema(Schema):
     coldkey_name = fields.Str(validate=validate.Length(max=50), required=True, load_only=True)
     amount = fields.Float(required=True, load_only=True)
@@ -136,4 +227,19 @@ class TransferRecordSchema(Schema):
     result_message = fields.Str(dump_only=True, allow_none=True)
     error_message = fields.Str(dump_only=True, allow_none=True)
     transfer_type = fields.Str(dump_only=True)
+    transfer_job_id = fields.Int(dump_only=True, allow_none=True)
+    created_at = fields.DateTime(dump_only=True)
+
+class TransferJobSchema(Schema):
+    """转账任务Schema"""
+    id = fields.Int(dump_only=True)
+    transfer_type = fields.Str(dump_only=True)  # local / external
+    from_wallet_name = fields.Str(dump_only=True)
+    to_wallet_address = fields.Str(dump_only=True)
+    amount = fields.Float(dump_only=True)
+    status = fields.Str(dump_only=True)  # queued / running / succeeded / failed / interrupted
+    error_message = fields.Str(dump_only=True, allow_none=True)
     created_at = fields.DateTime(dump_only=True)
+    started_at = fields.DateTime(dump_only=True, allow_none=True)
+    finished_at = fields.DateTime(dump_only=True, allow_none=True)
+    transfer_record = fields.Nested(TransferRecordSchema, dump_only=True, allow_none=True)
@@ -1,5 +1,10 @@
 import bittensor
 import asyncio
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
 from app.models.user import User
 from app.models.wallet import Wallet
@@ -7,106 +12,547 @@ from app.models.miners import Miners
 from app.models.miners_to_reg import MinersToReg
 from app.models.external_wallet import ExternalWallet
 from app.models.transfer_record import TransferRecord
-from app.utils.wallet_db import get_coldkey_wallets_for_path, insert_wallets_to_db, get_hotkey_wallets_for_path, insert_hotkeys_to_db
-from app.utils.wallet_crypto import WalletPasswordCrypto
-from app.utils.blockchain import get_wallets_balances, transfer, remove_stake
-from app.errors.custom_errors import ResourceNotFoundError, WalletNotFoundError, BlockchainError, TransferFailedError, WalletPasswordSetError, WalletPasswordError, MinerRegistrationError
-from app.extensions import logger
+from app.models.transfer_job import TransferJob, STATUS_SUCCEEDED as TRANSFER_JOB_SUCCEEDED, STATUS_FAILED as TRANSFER_JOB_FAILED
+from app.models.wallet_balance_snapshot import WalletBalanceSnapshot
+from app.utils.wallet_db import sync_wallet_changes
+from app.utils.wallet_manifest import WalletManifest
+from app.utils.single_flight import SingleFlight
+from app.utils.redis_jobs import RedisJobs, STATUS_RUNNING, STATUS_SUCCEEDED, STATUS_SKIPPED, STATUS_FAILED
+from app.utils.wallet_index import wallet_index
+from app.utils.blockchain import (
+    get_chain_head, get_free_balance, get_account_state, get_stake_infos, get_account_next_index,
+    transfer, batch_transfer, remove_stake
+)
+from app.utils.balance_cache import get_balances
+from app.utils.balance_table import WALLETS_CHANNEL, read_free_balances
+from app.utils.balance_history import read_series
+from app.utils.stake_breakdown import aggregate_stakes
+from app.utils.chain_pool import chain_pool
+from app.utils.nonce_manager import nonce_manager, NonceManager
+from app.utils.keypair_cache import keypair_cache
+from app.errors.custom_errors import ResourceNotFoundError, PermissionDeniedError, ValidationError, WalletNotFoundError, BlockchainError, TransferFailedError, WalletPasswordSetError, WalletPasswordError, MinerRegistrationError
+from app.extensions import db, logger
+
+# 后台刷新余额快照的线程（每个 worker 进程一个，首次提交任务时创建）
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='balance-refresh')
+REFRESH_KEY_PREFIX = 'balance_refresh:'
+
+# 后台钱包同步任务的线程（每个 worker 进程一个）
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wallet-sync')
+
+def _chunked(iterable, size):
+    """将可迭代对象按固定大小分块"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _to_utc(value):
+    """将时间转换为不带时区的 UTC 时间（不带时区的输入按 UTC 处理）"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 class Wallet_http:
     def __init__(self, coldkey_name, coldkey_address, free, staked, total,
-                 has_password=None):
+                 block=None, as_of=None, age=None, has_password=None):
         self.coldkey_name = coldkey_name
         self.coldkey_address = coldkey_address
         self.free = free
         self.staked = staked
         self.total = total
+        # 余额对应的区块高度、快照时间和陈旧时间（秒）
+        self.block = block
+        self.as_of = as_of
+        self.age = age
         # 管理员专用字段
         self.has_password = has_password
 
 class WalletService:
     @staticmethod
-    def sync_wallets_from_filesystem():
+    def sync_wallets_from_filesystem(force=False):
         """
-        从文件系统同步钱包到数据库
+        从文件系统增量同步钱包到数据库
+
+        通过 Redis 锁在所有 worker 之间单飞执行：其他 worker 正在同步时等待其完成，
+        最近 WALLET_SYNC_MIN_INTERVAL 秒内已同步过则跳过（force 时不跳过）
+
+        Args:
+            force: 为True时忽略清单，全量重新扫描
+
+        Returns:
+            str: 单飞执行结果（ran / ran_unlocked / skipped_*）
+        """
+        outcome = WalletService._sync_flight().run(
+            getattr(current_app, 'redis', None),
+            lambda: WalletService._sync_wallets(force),
+            force=force
+        )
+        if outcome.startswith('skipped'):
+            logger.debug(f"跳过钱包同步: {outcome}")
+        return outcome
+
+    @staticmethod
+    def start_sync_job(force=True):
+        """
+        提交后台钱包同步任务
+
+        已有同步任务在运行时不重复提交，直接返回正在运行的任务
+
+        Args:
+            force: 为True时忽略清单，全量重新扫描
+
+        Returns:
+            dict: 任务状态
+        """
+        jobs = WalletService._sync_jobs()
+        client = current_app.redis
+        job_id, created = jobs.start(client, force=int(force))
+        if created:
+            app = current_app._get_current_object()
+            _sync_executor.submit(WalletService._run_sync_job, app, job_id, force)
+            logger.info(f"已提交钱包同步任务 {job_id}")
+        else:
+            logger.info(f"钱包同步任务 {job_id} 正在运行，不重复提交")
+        return WalletService._sync_job_view(jobs.get(client, job_id) or {'id': job_id})
+
+    @staticmethod
+    def get_sync_job(job_id):
+        """获取钱包同步任务状态"""
+        job = WalletService._sync_jobs().get(current_app.redis, job_id)
+        if job is None:
+            raise ResourceNotFoundError(f"同步任务 {job_id} 不存在或已过期")
+        return WalletService._sync_job_view(job)
+
+    @staticmethod
+    def _sync_jobs():
+        return RedisJobs('wallet_sync', active_timeout=current_app.config['WALLET_SYNC_LOCK_TIMEOUT'])
+
+    @staticmethod
+    def _sync_job_view(job):
+        """补充耗时字段（运行中的任务按当前时间计算）"""
+        started_at = job.get('started_at')
+        if started_at is not None:
+            job['elapsed'] = round(job.get('finished_at', time.time()) - started_at, 3)
+        return job
+
+    @staticmethod
+    def _run_sync_job(app, job_id, force):
+        """后台线程：执行同步并把进度写入任务状态"""
+        with app.app_context():
+            jobs = WalletService._sync_jobs()
+            client = app.redis
+
+            def progress(**fields):
+                try:
+                    jobs.update(client, job_id, **fields)
+                except Exception as e:
+                    logger.debug(f"更新同步任务 {job_id} 进度失败: {e}")
+
+            progress(status=STATUS_RUNNING, phase='waiting_lock', started_at=time.time())
+            try:
+                outcome = WalletService._sync_flight().run(
+                    client,
+                    lambda: WalletService._sync_wallets(force, progress),
+                    force=force
+                )
+                status = STATUS_SKIPPED if outcome.startswith('skipped') else STATUS_SUCCEEDED
+                jobs.finish(client, job_id, status, phase='done', outcome=outcome)
+                logger.info(f"钱包同步任务 {job_id} 完成: {outcome}")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"钱包同步任务 {job_id} 失败: {e}")
+                try:
+                    jobs.finish(client, job_id, STATUS_FAILED, phase='failed', error=str(e))
+                except Exception as redis_error:
+                    logger.warning(f"记录同步任务 {job_id} 失败状态出错: {redis_error}")
+            finally:
+                db.session.remove()
+
+    @staticmethod
+    def get_sync_stats():
+        """获取钱包同步的锁等待和跳过统计"""
+        return WalletService._sync_flight().get_stats(current_app.redis)
+
+    @staticmethod
+    def _sync_flight():
+        config = current_app.config
+        return SingleFlight(
+            'wallet_sync',
+            min_interval=config['WALLET_SYNC_MIN_INTERVAL'],
+            lock_timeout=config['WALLET_SYNC_LOCK_TIMEOUT'],
+            wait_timeout=config['WALLET_SYNC_LOCK_WAIT']
+        )
+
+    @staticmethod
+    def _sync_wallets(force=False, progress=None):
+        """
+        扫描钱包目录变化并写入数据库（调用方负责加锁）
+
+        Args:
+            force: 为True时忽略清单，全量重新扫描
+            progress: 可选的进度回调，以关键字参数接收 phase 和各项计数（见 sync_wallet_changes）
         """
+        progress = progress or (lambda **fields: None)
+
         # 获取钱包路径
         wallet_path = current_app.config['BITTENSOR_WALLET_PATH']
+        manifest = WalletManifest.load(current_app.config['WALLET_MANIFEST_PATH'])
 
-        # 从文件系统读取钱包
-        filesystem_wallets = get_coldkey_wallets_for_path(wallet_path)
+        # 边扫描边分批写库（扫描 → 解析 → 每批 N 行批量插入），内存占用与钱包树大小无关
+        progress(phase='syncing')
+        try:
+            counters = sync_wallet_changes(wallet_path, manifest, force, progress=lambda counters: progress(**counters))
+        except Exception:
+            # 写库失败时不保存清单，下次同步重新处理这些文件（已写入的批次会被跳过）
+            manifest.discard()
+            raise
 
-        logger.info(f"开始同步钱包，从路径 {wallet_path} 发现 {len(filesystem_wallets)} 个钱包")
+        manifest.save()
 
-        # 直接调用已有的函数
-        insert_wallets_to_db(filesystem_wallets)
+        if not counters['wallets_found'] and not counters['hotkeys_found']:
+            return
 
-        # 从文件系统读取hotkeys
-        filesystem_hotkeys = get_hotkey_wallets_for_path(wallet_path)
+        # 有新钱包时刷新各 worker 的钱包索引，并通知余额订阅服务重新订阅
+        inserted = counters['wallets_inserted']
+        if inserted:
+            wallet_index.invalidate()
+            try:
+                current_app.redis.publish(WALLETS_CHANNEL, inserted)
+            except Exception as e:
+                logger.warning(f"发布钱包变化通知失败: {e}")
 
-        logger.info(f"开始同步hotkeys，从路径 {wallet_path} 发现 {len(filesystem_hotkeys)} 个hotkeys")
+        logger.info(f"钱包同步完成，从路径 {wallet_path} 发现 {counters['wallets_found']} 个新增或变化的钱包、"
+                    f"{counters['hotkeys_found']} 个新增或变化的hotkeys，"
+                    f"新写入 {inserted} 个钱包、{counters['hotkeys_inserted']} 个hotkeys")
 
-        # 直接调用已有的函数
-        insert_hotkeys_to_db(filesystem_hotkeys)
+    @staticmethod
+    def get_wallets_for_user(user_id, fresh=False, max_staleness=None):
+        """
+        获取用户可见的钱包及余额
 
-        logger.info("钱包同步完成")
+        Args:
+            user_id: 用户ID
+            fresh: 为True时忽略余额快照，直接查询链上
+            max_staleness: 可接受的余额最大陈旧时间（秒），超过时同步查询链上
+        """
+        return list(WalletService.iter_wallets_for_user(user_id, fresh, max_staleness))
 
     @staticmethod
-    def get_wallets_for_user(user_id):
+    def iter_wallets_for_user(user_id, fresh=False, max_staleness=None):
+        """
+        按分块逐个产出用户可见的钱包及余额，用于流式响应
+
+        用户校验在调用时立即执行，余额查询随迭代按分块进行
+        """
         user = User.find_by_id(user_id)
 
         if not user:
             raise ResourceNotFoundError("用户不存在")
 
-        WalletService.sync_wallets_from_filesystem()
+        # 钱包同步由目录监听服务完成，未部署监听服务时可开启读时同步
+        if current_app.config['WALLET_SYNC_ON_READ']:
+            WalletService.sync_wallets_from_filesystem()
 
         # 判断用户权限，只做一次
         is_admin = user.has_role('admin')
 
+        chunk_size = current_app.config['BALANCE_CHUNK_SIZE']
         if is_admin:
-            # 管理员可以查看所有钱包
-            wallets = Wallet.query.all()
+            # 管理员可以查看所有钱包，分批从数据库读取
+            wallets = Wallet.query.order_by(Wallet.id).yield_per(chunk_size)
         else:
             wallets = user.wallets
 
-        # 获取所有的 coldkey 地址
-        coldkeys = [wallet.coldkey_address for wallet in wallets]
+        if fresh:
+            max_staleness = 0
 
-        # 异步获取所有钱包的自由余额和质押余额
-        try:
-            free_balances, staked_balances = asyncio.run(get_wallets_balances(coldkeys))
-        except Exception as e:
-            raise BlockchainError(f"Failed to get balances: {str(e)}")
+        return WalletService._iter_wallet_rows(wallets, is_admin, chunk_size, max_staleness)
 
-        # 包装钱包信息
-        wallets_list = []
+    @staticmethod
+    def _iter_wallet_rows(wallets, is_admin, chunk_size, max_staleness=None):
+        """
+        逐块查询余额并产出 Wallet_http 对象
 
-        for wallet in wallets:
-            name = wallet.coldkey_name
-            coldkey = wallet.coldkey_address
-            free = free_balances[coldkey].tao
-            staked = staked_balances[coldkey][0].tao
-
-            # 创建基础 Wallet 对象
-            wallet_data = {
-                'coldkey_name': name,
+        已有快照的钱包立即返回最近一次的余额（附带区块高度和陈旧时间），
+        超过 BALANCE_STALE_AFTER 的快照在后台刷新；只有没有快照、或快照比
+        max_staleness 更旧的钱包才同步查询链上
+        """
+        stale_after = current_app.config['BALANCE_STALE_AFTER']
+        # 所有分块的实时查询固定在同一区块
+        head = None
+        # 实时查询结果在遍历结束后统一写回快照：管理员的钱包列表通过服务端游标分批读取，
+        # 遍历期间提交事务会使游标失效
+        snapshot_wallets = []
+        snapshot_balances = {}
+
+        for chunk in _chunked(wallets, chunk_size):
+            now = datetime.utcnow()
+
+            # 读取后台轮询服务写入的余额快照
+            snapshots = {} if max_staleness == 0 else WalletBalanceSnapshot.find_by_wallet_ids([wallet.id for wallet in chunk])
+            balances = {}
+            for wallet_id, snapshot in snapshots.items():
+                balances[wallet_id] = (float(snapshot.free), float(snapshot.staked), snapshot.block, snapshot.as_of)
+
+            # 自由余额优先使用订阅服务推送的最新值（不早于快照区块时才采用）；
+            # 质押余额仍来自快照，整行的区块高度和时间保持快照的（较旧的）值，
+            # 不把混合了两个区块的余额当作最新结果，陈旧判断和后台刷新也按快照进行
+            if balances:
+                pushed = WalletService._read_pushed_balances(
+                    [wallet.coldkey_address for wallet in chunk if wallet.id in balances]
+                )
+                for wallet in chunk:
+                    entry = pushed.get(wallet.coldkey_address)
+                    if wallet.id not in balances or entry is None:
+                        continue
+                    _, staked, snapshot_block, snapshot_as_of = balances[wallet.id]
+                    free, block, _ = entry
+                    if block >= snapshot_block:
+                        balances[wallet.id] = (free, staked, snapshot_block, snapshot_as_of)
+
+            # 超过调用方容忍度的快照同步刷新，其余过期快照先返回再后台刷新
+            stale_wallets = []
+            for wallet in chunk:
+                if wallet.id not in balances:
+                    continue
+                age = (now - balances[wallet.id][3]).total_seconds()
+                if max_staleness is not None and age > max_staleness:
+                    del balances[wallet.id]
+                elif age > stale_after:
+                    stale_wallets.append((wallet.id, wallet.coldkey_address))
+            if stale_wallets:
+                WalletService._schedule_refresh(stale_wallets)
+
+            # 没有可用快照的钱包直接查询链上
+            live_wallets = [wallet for wallet in chunk if wallet.id not in balances]
+            if live_wallets:
+                coldkeys = [wallet.coldkey_address for wallet in live_wallets]
+                try:
+                    if head is None:
+                        head = chain_pool.run(get_chain_head)
+                    block_hash, block = head
+                    free_balances, staked_balances, _ = get_balances(coldkeys, block_hash=block_hash)
+                except Exception as e:
+                    raise BlockchainError(f"Failed to get balances: {str(e)}")
+
+                as_of = datetime.utcnow()
+                for wallet in live_wallets:
+                    coldkey = wallet.coldkey_address
+                    balances[wallet.id] = (free_balances[coldkey].tao, staked_balances[coldkey][0].tao, block, as_of)
+
+                # 实时结果稍后写回快照，供后续请求直接返回
+                snapshot_wallets.extend((wallet.id, wallet.coldkey_address) for wallet in live_wallets)
+                snapshot_balances.update((wallet.id, balances[wallet.id]) for wallet in live_wallets)
+
+            for wallet in chunk:
+                free, staked, block, as_of = balances[wallet.id]
+
+                # 创建基础 Wallet 对象
+                wallet_data = {
+                    'coldkey_name': wallet.coldkey_name,
+                    'coldkey_address': wallet.coldkey_address,
+                    'free': free,
+                    'staked': staked,
+                    'total': free + staked,
+                    'block': block,
+                    'as_of': as_of,
+                    'age': max((now - as_of).total_seconds(), 0.0)
+                }
+
+                # 如果是管理员，添加密码状态信息
+                if is_admin:
+                    wallet_data['has_password'] = wallet.has_password()
+
+                yield Wallet_http(**wallet_data)
+
+        if snapshot_wallets:
+            WalletService._save_snapshots(snapshot_wallets, snapshot_balances, head[0])
+
+    @staticmethod
+    def _save_snapshots(wallets, balances, block_hash):
+        """
+        将实时查询的余额写入快照表，写入失败不影响本次响应
+
+        Args:
+            wallets: [(wallet_id, coldkey_address)]
+            balances: {wallet_id: (free, staked, block, as_of)}
+            block_hash: 查询所在区块哈希
+        """
+        rows = []
+        for wallet_id, coldkey in wallets:
+            free, staked, block, as_of = balances[wallet_id]
+            rows.append({
+                'wallet_id': wallet_id,
                 'coldkey_address': coldkey,
                 'free': free,
                 'staked': staked,
-                'total': free + staked
-            }
+                'block': block,
+                'block_hash': block_hash,
+                'as_of': as_of
+            })
+        try:
+            WalletBalanceSnapshot.upsert_many(rows)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"写入余额快照失败: {e}")
+
+    @staticmethod
+    def _schedule_refresh(wallets):
+        """
+        在后台刷新过期快照
+
+        通过 Redis SET NX 按钱包去重，同一钱包在所有 worker 中同时只有一个刷新任务
+        """
+        timeout = current_app.config['CHAIN_POOL_CALL_TIMEOUT']
+        try:
+            pipe = current_app.redis.pipeline()
+            for wallet_id, _ in wallets:
+                pipe.set(f"{REFRESH_KEY_PREFIX}{wallet_id}", 1, nx=True, ex=timeout)
+            claimed = [wallet for wallet, ok in zip(wallets, pipe.execute()) if ok]
+        except Exception as e:
+            logger.warning(f"余额刷新去重失败，跳过后台刷新: {e}")
+            return
+
+        if claimed:
+            app = current_app._get_current_object()
+            _refresh_executor.submit(WalletService._refresh_snapshots, app, claimed)
+
+    @staticmethod
+    def _refresh_snapshots(app, wallets):
+        """后台线程：查询链上余额并更新快照"""
+        with app.app_context():
+            try:
+                block_hash, block = chain_pool.run(get_chain_head)
+                free_balances, staked_balances, _ = get_balances(
+                    [coldkey for _, coldkey in wallets], block_hash=block_hash
+                )
+                as_of = datetime.utcnow()
+                balances = {}
+                for wallet_id, coldkey in wallets:
+                    if free_balances.get(coldkey) is None or staked_balances.get(coldkey) is None:
+                        continue
+                    balances[wallet_id] = (free_balances[coldkey].tao, staked_balances[coldkey][0].tao, block, as_of)
+                WalletService._save_snapshots(
+                    [wallet for wallet in wallets if wallet[0] in balances], balances, block_hash
+                )
+                logger.info(f"后台刷新余额快照完成: {len(balances)} 个钱包，区块 {block}")
+            except Exception as e:
+                logger.warning(f"后台刷新余额快照失败: {e}")
+            finally:
+                try:
+                    app.redis.delete(*[f"{REFRESH_KEY_PREFIX}{wallet_id}" for wallet_id, _ in wallets])
+                except Exception:
+                    pass
+                db.session.remove()
+
+    @staticmethod
+    def get_balance_history(user_id, coldkey_name, start=None, end=None, step=None):
+        """
+        获取钱包余额历史
+
+        Args:
+            user_id: 用户ID
+            coldkey_name: 钱包名称
+            start: 起始时间，默认 end 前 7 天
+            end: 结束时间，默认当前时间
+            step: 降采样桶宽（秒），默认及最小值由 BALANCE_HISTORY_MAX_POINTS 决定
+        """
+        user = User.find_by_id(user_id)
+        if not user:
+            raise ResourceNotFoundError("用户不存在")
+
+        wallet = Wallet.find_by_name(coldkey_name)
+        if not wallet:
+            raise WalletNotFoundError(f"Wallet {coldkey_name} not found")
+        if wallet.user_id != user.id and not user.has_role('admin'):
+            raise PermissionDeniedError("无权查看该钱包")
+
+        end = _to_utc(end) if end else datetime.utcnow()
+        start = _to_utc(start) if start else end - timedelta(days=7)
+        if start >= end:
+            raise ValidationError("from 必须早于 to")
+
+        start_ts = int(start.replace(tzinfo=timezone.utc).timestamp())
+        end_ts = int(end.replace(tzinfo=timezone.utc).timestamp())
+
+        # 限制返回点数，避免长时间范围返回过多数据
+        min_step = max(math.ceil((end_ts - start_ts) / current_app.config['BALANCE_HISTORY_MAX_POINTS']), 1)
+        step = max(step or min_step, min_step)
+
+        series = read_series(
+            current_app.config['BALANCE_HISTORY_PATH'], wallet.coldkey_address, start_ts, end_ts, step
+        )
+        return {
+            'coldkey_name': wallet.coldkey_name,
+            'coldkey_address': wallet.coldkey_address,
+            'from_': start,
+            'to': end,
+            'step': step,
+            **series
+        }
+
+    @staticmethod
+    def get_stake_breakdown(user_id):
+        """
+        获取用户可见钱包的分子网/分 hotkey 质押明细（同一区块）
+
+        Returns:
+            dict: 区块信息、coldkey 列表及 aggregate_stakes 的聚合矩阵
+        """
+        user = User.find_by_id(user_id)
+        if not user:
+            raise ResourceNotFoundError("用户不存在")
 
-            # 如果是管理员，添加密码状态信息
-            if is_admin:
-                wallet_data['has_password'] = wallet.has_password()
+        if user.has_role('admin'):
+            wallets = Wallet.query.order_by(Wallet.id).all()
+        else:
+            wallets = user.wallets
+        coldkeys = [wallet.coldkey_address for wallet in wallets]
 
-            wallet_obj = Wallet_http(**wallet_data)
-            wallets_list.append(wallet_obj)
+        config = current_app.config
+        try:
+            block_hash, block = chain_pool.run(get_chain_head)
+            stake_infos, prices = chain_pool.run(
+                get_stake_infos, coldkeys,
+                block_hash=block_hash,
+                chunk_size=config['BALANCE_CHUNK_SIZE'],
+                concurrency=config['BALANCE_CHUNK_CONCURRENCY']
+            )
+        except Exception as e:
+            raise BlockchainError(f"Failed to get stake breakdown: {str(e)}")
 
-        return wallets_list
+        return {
+            'block': block,
+            'block_hash': block_hash,
+            'coldkeys': [
+                {'coldkey_name': wallet.coldkey_name, 'coldkey_address': wallet.coldkey_address}
+                for wallet in wallets
+            ],
+            **aggregate_stakes(coldkeys, stake_infos, prices)
+        }
 
     @staticmethod
-    def transfer(user_id, data):
+    def _read_pushed_balances(coldkeys):
+        """读取推送式余额表，Redis 不可用时退回快照"""
+        try:
+            return read_free_balances(current_app.redis, coldkeys)
+        except Exception as e:
+            logger.warning(f"读取推送式余额表失败，使用余额快照: {e}")
+            return {}
+
+    @staticmethod
+    def transfer(user_id, data, transfer_job_id=None):
+        """
+        执行本地钱包之间的转账（同步等待上链）
+
+        Args:
+            user_id: 操作用户ID
+            data: {'alias', 'to', 'amount'}
+            transfer_job_id: 由转账 worker 执行时对应的任务ID，写入转账记录
+        """
         alias = data['alias']
         to = data['to']
         transfer_amount = data['amount']
@@ -116,18 +562,22 @@ class WalletService:
         if not operator:
             raise ResourceNotFoundError("操作用户不存在")
 
-        # 获取发送方和接收方钱包信息
-        walletInfo = Wallet.find_by_name(alias)
-        toInfo = Wallet.find_by_address(to)
+        # 获取发送方和接收方钱包信息（先查内存索引，发送方再按主键加载密码）
+        senderEntry = wallet_index.wallet_by_name(alias)
+        toInfo = wallet_index.wallet_by_address(to)
+
+        if senderEntry is None or toInfo is None:
+            raise WalletNotFoundError
 
-        if walletInfo is None or toInfo is None:
+        walletInfo = db.session.get(Wallet, senderEntry.id)
+        if walletInfo is None:
             raise WalletNotFoundError
 
         # 获取接收方地址
-        toAddress = toInfo.coldkey_address
+        toAddress = toInfo.address
 
         # 获取转账前余额
-        balance_before = TransferRecordService.get_wallet_balance(walletInfo.coldkey_address)
+        balance_before, account_nonce = TransferRecordService.get_wallet_account(walletInfo.coldkey_address)
         if balance_before is None:
             logger.warning(f"无法获取钱包 {alias} 的余额，但继续执行转账")
             # 不终止转账，继续执行，但余额字段将为None
@@ -135,26 +585,23 @@ class WalletService:
         # 将 TAO 金额转换为 Bittensor 的 Balance 类型
         amount = bittensor.Balance.from_tao(transfer_amount)
 
-        # 获取钱包密码（只能从数据库获取）
+        # 钱包密码只能从数据库获取
         if not walletInfo.has_password():
             logger.error(f"钱包 {alias} 未设置密码，无法执行转账操作")
             raise WalletPasswordError(f"钱包 {alias} 未设置密码，请先设置钱包密码")
 
-        wallet_password = WalletPasswordCrypto.decrypt_password(walletInfo.encrypted_password, walletInfo.id)
-
         # 执行转账操作
-        wallet_path = current_app.config['BITTENSOR_WALLET_PATH']
-        wallet = bittensor.Wallet(name=alias, path=wallet_path)
-
         try:
-            success = transfer(wallet, alias, toAddress, amount, wallet_password)
+            outcome = WalletService._submit_transfer(walletInfo, toAddress, amount)
+            success = outcome['success']
 
-            # 获取转账后余额
-            balance_after = TransferRecordService.get_wallet_balance(walletInfo.coldkey_address)
-            # 如果获取转账后余额失败，保持为None
+            # 根据交易回执计算转账后余额（打包失败时只扣除手续费）
+            balance_after = TransferRecordService.balance_after_transfer(
+                walletInfo.coldkey_address, balance_before, account_nonce, outcome
+            )
 
             if success:
-                result = f"成功从 {alias} 转账 {transfer_amount} TAO 到地址 {toAddress}。"
+                result = f"成功从 {alias} 转账 {transfer_amount} TAO 到地址 {toAddress}，区块 {outcome['block_hash']}。"
                 logger.info("transfer", result if result is not None else "No result")
 
                 # 记录成功转账
@@ -162,14 +609,15 @@ class WalletService:
                     operator_username=operator.name,
                     from_wallet_name=alias,
                     from_wallet_address=walletInfo.coldkey_address,
-                    to_wallet_name=toInfo.coldkey_name,  # 本地钱包名称
+                    to_wallet_name=toInfo.name,  # 本地钱包名称
                     to_wallet_address=toAddress,
                     amount=transfer_amount,
                     transfer_type='local',
                     balance_before=balance_before,
                     balance_after=balance_after,
                     status='success',
-                    result_message=result
+                    result_message=result,
+                    transfer_job_id=transfer_job_id
                 )
             else:
                 # 记录失败转账
@@ -177,14 +625,15 @@ class WalletService:
                     operator_username=operator.name,
                     from_wallet_name=alias,
                     from_wallet_address=walletInfo.coldkey_address,
-                    to_wallet_name=toInfo.coldkey_name,
+                    to_wallet_name=toInfo.name,
                     to_wallet_address=toAddress,
                     amount=transfer_amount,
                     transfer_type='local',
                     balance_before=balance_before,
-                    balance_after=balance_before,  # 失败时余额不变
+                    balance_after=balance_after,
                     status='failed',
-                    error_message="Transfer failed"
+                    error_message=outcome['error'] or "Transfer failed",
+                    transfer_job_id=transfer_job_id
                 )
                 raise TransferFailedError
 
@@ -194,14 +643,15 @@ class WalletService:
                 operator_username=operator.name,
                 from_wallet_name=alias,
                 from_wallet_address=walletInfo.coldkey_address,
-                to_wallet_name=toInfo.coldkey_name,
+                to_wallet_name=toInfo.name,
                 to_wallet_address=toAddress,
                 amount=transfer_amount,
                 transfer_type='local',
                 balance_before=balance_before,
                 balance_after=balance_before,  # 异常时余额不变
                 status='failed',
-                error_message=str(e)
+                error_message=str(e),
+                transfer_job_id=transfer_job_id
             )
 
             if isinstance(e, (BlockchainError, WalletPasswordError, TransferFailedError)):
@@ -209,29 +659,184 @@ class WalletService:
             else:
                 raise BlockchainError(f"Failed to transfer: {str(e)}")
 
+    @staticmethod
+    def _submit_transfer(wallet_info, to_address, amount):
+        """
+        提交单笔转账：已解锁的钱包从缓存获取，nonce 由分配器按 coldkey 分配（同一钱包的多笔转账无需等待上一笔上链）
+
+        提交失败或调用异常时清除该钱包的 nonce，下次从链上重新同步；
+        失败原因是 nonce 已被占用（如注册服务使用了同一钱包）时交易未进入交易池，换新 nonce 重试一次
+
+        Returns:
+            dict: success, block_hash, error, fee, amount, nonce（实际使用的 nonce）
+        """
+        name = wallet_info.coldkey_name
+        coldkey_address = wallet_info.coldkey_address
+        wallet = keypair_cache.get(wallet_info)
+
+        client = current_app.redis
+        for attempt in range(2):
+            try:
+                nonce = nonce_manager.allocate(
+                    client, coldkey_address, lambda: chain_pool.run(get_account_next_index, coldkey_address)
+                )
+                outcome = chain_pool.run(transfer, wallet, to_address, amount, nonce=nonce)
+            except Exception:
+                # 连接池超时或连接失败时交易可能没有提交，已分配的 nonce 不能留在 Redis 中，
+                # 否则后续交易都排在空缺之后；清除后从链上重新同步（已提交的交易会计入链上 nonce）
+                nonce_manager.reset(client, coldkey_address)
+                raise
+            if outcome['success']:
+                break
+
+            nonce_manager.reset(client, coldkey_address)
+            if attempt or nonce is None or not NonceManager.is_stale_nonce_error(outcome['error']):
+                break
+            logger.warning(f"钱包 {name} 的 nonce {nonce} 已被占用，从链上同步后重试: {outcome['error']}")
+        outcome['nonce'] = nonce
+        return outcome
+
+    @staticmethod
+    def transfer_batch(user_id, data):
+        """
+        批量转账
+
+        按转出钱包分组，每组合并为一个 utility.batch_all 交易并发提交（组内原子，全部成功或全部失败），
+        所有转账记录在一个事务中写入
+
+        Args:
+            user_id: 操作用户ID
+            data: {'transfers': [{'from_wallet', 'to_address', 'amount'}, ...]}
+
+        Returns:
+            dict: 汇总和每笔转账的结果（顺序与请求一致）
+        """
+        operator = User.find_by_id(user_id)
+        if not operator:
+            raise ResourceNotFoundError("操作用户不存在")
+
+        # 向外部钱包转账仅限管理员（与 /external/transfer 一致）
+        is_admin = operator.has_role('admin')
+
+        # 解析目标地址（本地钱包或已登记的外部钱包），按转出钱包分组并保持请求顺序
+        legs = []
+        groups = {}
+        for index, item in enumerate(data['transfers']):
+            to_address = item['to_address']
+            destination, transfer_type = wallet_index.destination_by_address(to_address)
+            if destination is None:
+                raise ResourceNotFoundError(f"目标地址 {to_address} 不是本地钱包或已登记的外部钱包")
+            if transfer_type == 'external' and not is_admin:
+                raise PermissionDeniedError(f"向外部钱包 {to_address} 转账需要管理员权限")
+
+            leg = {
+                'index': index,
+                'from_wallet': item['from_wallet'],
+                'to_address': to_address,
+                'to_wallet_name': destination.name,
+                'amount': item['amount'],
+                'transfer_type': transfer_type,
+            }
+            legs.append(leg)
+            groups.setdefault(item['from_wallet'], []).append(leg)
+
+        # 加载并解锁所有转出钱包（优先使用缓存），任何一个失败都不提交
+        sources = []
+        for name in groups:
+            entry = wallet_index.wallet_by_name(name)
+            wallet_info = db.session.get(Wallet, entry.id) if entry else None
+            if wallet_info is None:
+                raise WalletNotFoundError(f"发送方钱包 {name} 不存在")
+            if not wallet_info.has_password():
+                logger.error(f"钱包 {name} 未设置密码，无法执行转账操作")
+                raise WalletPasswordError(f"钱包 {name} 未设置密码，请先设置钱包密码")
+
+            try:
+                wallet = keypair_cache.get(wallet_info)
+            except Exception as e:
+                raise WalletPasswordError(f"钱包 {name} 解锁失败: {e}")
+            sources.append((name, wallet_info.coldkey_address, wallet))
+
+        # 每个转出钱包一个 batch_all 交易，使用各自分配的 nonce 并发提交
+        client = current_app.redis
+        try:
+            nonces = [
+                nonce_manager.allocate(client, address, lambda address=address: chain_pool.run(get_account_next_index, address))
+                for _, address, _ in sources
+            ]
+            outcomes = chain_pool.run(batch_transfer, [
+                (wallet, [(leg['to_address'], bittensor.Balance.from_tao(leg['amount'])) for leg in groups[name]], nonce)
+                for (name, _, wallet), nonce in zip(sources, nonces)
+            ])
+        except Exception as e:
+            logger.error(f"批量转账提交失败: {e}")
+            outcomes = [{'success': False, 'block_hash': None, 'error': str(e),
+                         'balance_before': None, 'balance_after': None}] * len(sources)
+
+        records = []
+        for (name, coldkey_address, _), outcome in zip(sources, outcomes):
+            balance_before = float(outcome['balance_before'].tao) if outcome['balance_before'] is not None else None
+            balance_after = float(outcome['balance_after'].tao) if outcome['balance_after'] is not None else None
+            balance_after = balance_after if outcome['block_hash'] else balance_before
+            group = groups[name]
+            if outcome['success']:
+                logger.info(f"批量转账成功: {name} 共 {len(group)} 笔，区块 {outcome['block_hash']}")
+            else:
+                logger.error(f"批量转账失败: {name} 共 {len(group)} 笔: {outcome['error']}")
+                # 提交失败后该钱包的 nonce 从链上重新同步
+                nonce_manager.reset(client, coldkey_address)
+
+            for leg in group:
+                leg['status'] = 'success' if outcome['success'] else 'failed'
+                leg['block_hash'] = outcome['block_hash']
+                leg['error'] = outcome['error'] if not outcome['success'] else None
+                records.append({
+                    'operator_username': operator.name,
+                    'from_wallet_name': name,
+                    'from_wallet_address': coldkey_address,
+                    'to_wallet_name': leg['to_wallet_name'],
+                    'to_wallet_address': leg['to_address'],
+                    'amount': leg['amount'],
+                    'transfer_type': leg['transfer_type'],
+                    'balance_before': balance_before,
+                    # 未打包时余额不变，打包但执行失败时只扣除手续费
+                    'balance_after': balance_after,
+                    'status': leg['status'],
+                    'result_message': (f"批量转账：从 {name} 转账 {leg['amount']} TAO 到 {leg['to_address']}，"
+                                       f"区块 {outcome['block_hash']}") if outcome['success'] else None,
+                    'error_message': leg['error'],
+                })
+
+        TransferRecordService.create_records(records)
+
+        succeeded = sum(1 for leg in legs if leg['status'] == 'success')
+        return {
+            'total': len(legs),
+            'succeeded': succeeded,
+            'failed': len(legs) - succeeded,
+            'results': legs,
+        }
+
     @staticmethod
     def remove_stake(data):
         alias = data['coldkey_name']
         remove_amount = data['amount']
 
-        walletInfo = Wallet.find_by_name(alias)
+        entry = wallet_index.wallet_by_name(alias)
+        walletInfo = db.session.get(Wallet, entry.id) if entry else None
 
         if walletInfo is None :
             raise WalletNotFoundError
 
-        # 获取钱包密码（只能从数据库获取）
+        # 钱包密码只能从数据库获取
         if not walletInfo.has_password():
             logger.error(f"钱包 {alias} 未设置密码，无法执行解质押操作")
             raise WalletPasswordError(f"钱包 {alias} 未设置密码，请先设置钱包密码")
 
-        wallet_password = WalletPasswordCrypto.decrypt_password(walletInfo.encrypted_password, walletInfo.id)
-
-        # 执行解质押操作
-        wallet_path = current_app.config['BITTENSOR_WALLET_PATH']
-        wallet = bittensor.Wallet(name=alias, path=wallet_path)
-
+        # 执行解质押操作（已解锁的钱包从缓存获取）
         try:
-            asyncio.run(remove_stake(wallet, alias, remove_amount, wallet_password))
+            wallet = keypair_cache.get(walletInfo)
+            asyncio.run(remove_stake(wallet, remove_amount))
         except Exception as e:
             raise BlockchainError(f"Failed to remove stake: {str(e)}")
 
@@ -262,6 +867,9 @@ class WalletPasswordService:
             logger.error(f"钱包 {coldkey_name} 密码设置失败")
             raise WalletPasswordSetError(f"钱包 {coldkey_name} 密码设置失败")
 
+        # 清除本进程中用旧密码解锁的钱包（其他进程取用时比对加密密码发现变化）
+        keypair_cache.purge(wallet.id)
+
         logger.info(f"管理员成功设置钱包 {coldkey_name} 的密码")
 
     @staticmethod
@@ -325,7 +933,9 @@ class MinerService:
         if not user:
             raise ResourceNotFoundError("用户不存在")
 
-        WalletService.sync_wallets_from_filesystem()
+        # 钱包同步由目录监听服务完成，未部署监听服务时可开启读时同步
+        if current_app.config['WALLET_SYNC_ON_READ']:
+            WalletService.sync_wallets_from_filesystem()
 
         # 判断用户权限，只做一次
         is_admin = user.has_role('admin')
@@ -437,12 +1047,13 @@ class ExternalWalletService:
         address = data['address']
 
         # 检查地址是否已存在
-        existing_wallet = ExternalWallet.find_by_address(address)
+        existing_wallet = wallet_index.external_by_address(address)
         if existing_wallet:
             raise ResourceNotFoundError(f"地址 {address} 已存在")
 
         try:
             external_wallet = ExternalWallet.create(name, address)
+            wallet_index.invalidate()
             logger.info(f"成功创建外部钱包: {name} ({address})")
             return external_wallet.to_dict()
         except Exception as e:
@@ -461,12 +1072,13 @@ class ExternalWalletService:
 
         # 如果要更新地址，检查新地址是否已存在
         if address and address != external_wallet.address:
-            existing_wallet = ExternalWallet.find_by_address(address)
+            existing_wallet = wallet_index.external_by_address(address)
             if existing_wallet:
                 raise ResourceNotFoundError(f"地址 {address} 已存在")
 
         try:
             external_wallet.update(name=name, address=address)
+            wallet_index.invalidate()
             logger.info(f"成功更新外部钱包 {wallet_id}: {external_wallet.name}")
             return external_wallet.to_dict()
         except Exception as e:
@@ -482,14 +1094,22 @@ class ExternalWalletService:
 
         try:
             external_wallet.delete()
+            wallet_index.invalidate()
             logger.info(f"成功删除外部钱包 {wallet_id}: {external_wallet.name}")
         except Exception as e:
             logger.error(f"删除外部钱包失败: {e}")
             raise ResourceNotFoundError(f"删除外部钱包失败: {e}")
 
     @staticmethod
-    def transfer_to_external(user_id, data):
-        """向外部钱包转账"""
+    def transfer_to_external(user_id, data, transfer_job_id=None):
+        """
+        向外部钱包转账（同步等待上链）
+
+        Args:
+            user_id: 操作用户ID
+            data: {'from_wallet', 'to_address', 'amount'}
+            transfer_job_id: 由转账 worker 执行时对应的任务ID，写入转账记录
+        """
         from_wallet = data['from_wallet']
         to_address = data['to_address']
         transfer_amount = data['amount']
@@ -500,17 +1120,18 @@ class ExternalWalletService:
             raise ResourceNotFoundError("操作用户不存在")
 
         # 检查外部钱包地址是否存在
-        external_wallet = ExternalWallet.find_by_address(to_address)
+        external_wallet = wallet_index.external_by_address(to_address)
         if not external_wallet:
             raise ResourceNotFoundError(f"外部钱包地址 {to_address} 不存在")
 
-        # 获取发送方钱包信息
-        wallet_info = Wallet.find_by_name(from_wallet)
+        # 获取发送方钱包信息（先查内存索引，再按主键加载密码）
+        sender_entry = wallet_index.wallet_by_name(from_wallet)
+        wallet_info = db.session.get(Wallet, sender_entry.id) if sender_entry else None
         if not wallet_info:
             raise WalletNotFoundError(f"发送方钱包 {from_wallet} 不存在")
 
         # 获取转账前余额
-        balance_before = TransferRecordService.get_wallet_balance(wallet_info.coldkey_address)
+        balance_before, account_nonce = TransferRecordService.get_wallet_account(wallet_info.coldkey_address)
         if balance_before is None:
             logger.warning(f"无法获取钱包 {from_wallet} 的余额，但继续执行转账")
             # 不终止转账，继续执行，但余额字段将为None
@@ -520,25 +1141,21 @@ class ExternalWalletService:
             logger.error(f"钱包 {from_wallet} 未设置密码，无法执行转账操作")
             raise WalletPasswordError(f"钱包 {from_wallet} 未设置密码，请先设置钱包密码")
 
-        # 获取钱包密码
-        wallet_password = WalletPasswordCrypto.decrypt_password(wallet_info.encrypted_password, wallet_info.id)
-
         # 将 TAO 金额转换为 Bittensor 的 Balance 类型
         amount = bittensor.Balance.from_tao(transfer_amount)
 
         # 执行转账操作
-        wallet_path = current_app.config['BITTENSOR_WALLET_PATH']
-        wallet = bittensor.Wallet(name=from_wallet, path=wallet_path)
-
         try:
-            success = transfer(wallet, from_wallet, to_address, amount, wallet_password)
+            outcome = WalletService._submit_transfer(wallet_info, to_address, amount)
+            success = outcome['success']
 
-            # 获取转账后余额
-            balance_after = TransferRecordService.get_wallet_balance(wallet_info.coldkey_address)
-            # 如果获取转账后余额失败，保持为None
+            # 根据交易回执计算转账后余额（打包失败时只扣除手续费）
+            balance_after = TransferRecordService.balance_after_transfer(
+                wallet_info.coldkey_address, balance_before, account_nonce, outcome
+            )
 
             if success:
-                result = f"成功从 {from_wallet} 转账 {transfer_amount} TAO 到外部钱包 {external_wallet.name} ({to_address})"
+                result = f"成功从 {from_wallet} 转账 {transfer_amount} TAO 到外部钱包 {external_wallet.name} ({to_address})，区块 {outcome['block_hash']}"
                 logger.info("transfer", result if result is not None else "No result")
 
                 # 记录成功转账
@@ -553,7 +1170,8 @@ class ExternalWalletService:
                     balance_before=balance_before,
                     balance_after=balance_after,
                     status='success',
-                    result_message=result
+                    result_message=result,
+                    transfer_job_id=transfer_job_id
                 )
             else:
                 # 记录失败转账
@@ -566,9 +1184,10 @@ class ExternalWalletService:
                     amount=transfer_amount,
                     transfer_type='external',
                     balance_before=balance_before,
-                    balance_after=balance_before,  # 失败时余额不变
+                    balance_after=balance_after,
                     status='failed',
-                    error_message="Transfer failed"
+                    error_message=outcome['error'] or "Transfer failed",
+                    transfer_job_id=transfer_job_id
                 )
                 raise TransferFailedError
 
@@ -585,7 +1204,8 @@ class ExternalWalletService:
                 balance_before=balance_before,
                 balance_after=balance_before,  # 异常时余额不变
                 status='failed',
-                error_message=str(e)
+                error_message=str(e),
+                transfer_job_id=transfer_job_id
             )
 
             if isinstance(e, (BlockchainError, WalletPasswordError, TransferFailedError)):
@@ -594,6 +1214,86 @@ class ExternalWalletService:
                 raise BlockchainError(f"Failed to transfer: {str(e)}")
 
 
+class TransferJobService:
+    """转账任务服务：API 只做校验并入队，由转账 worker 进程执行"""
+
+    @staticmethod
+    def enqueue_transfer(user_id, data):
+        """校验本地钱包转账参数并入队"""
+        if wallet_index.wallet_by_address(data['to']) is None:
+            raise WalletNotFoundError
+        return TransferJobService._enqueue(user_id, 'local', data['alias'], data['to'], data['amount'])
+
+    @staticmethod
+    def enqueue_external_transfer(user_id, data):
+        """校验外部钱包转账参数并入队"""
+        if wallet_index.external_by_address(data['to_address']) is None:
+            raise ResourceNotFoundError(f"外部钱包地址 {data['to_address']} 不存在")
+        return TransferJobService._enqueue(user_id, 'external', data['from_wallet'], data['to_address'], data['amount'])
+
+    @staticmethod
+    def _enqueue(user_id, transfer_type, from_wallet_name, to_address, amount):
+        # 入队前完成能立即判断的校验，避免任务在 worker 中才失败
+        if not User.find_by_id(user_id):
+            raise ResourceNotFoundError("操作用户不存在")
+
+        entry = wallet_index.wallet_by_name(from_wallet_name)
+        wallet_info = db.session.get(Wallet, entry.id) if entry else None
+        if wallet_info is None:
+            raise WalletNotFoundError(f"发送方钱包 {from_wallet_name} 不存在")
+        if not wallet_info.has_password():
+            raise WalletPasswordError(f"钱包 {from_wallet_name} 未设置密码，请先设置钱包密码")
+
+        job = TransferJob.enqueue(transfer_type, user_id, from_wallet_name, to_address, amount)
+        logger.info(f"转账任务 {job.id} 已入队: {from_wallet_name} -> {to_address} ({amount} TAO)")
+        return job.to_dict()
+
+    @staticmethod
+    def get_job(user_id, job_id):
+        """获取转账任务状态（普通用户只能查看自己提交的任务）"""
+        user = User.find_by_id(user_id)
+        if not user:
+            raise ResourceNotFoundError("用户不存在")
+
+        job = TransferJob.find_by_id(job_id)
+        if job is None or (job.operator_id != user.id and not user.has_role('admin')):
+            raise ResourceNotFoundError(f"转账任务 {job_id} 不存在")
+        return job.to_dict()
+
+    @staticmethod
+    def execute(job):
+        """
+        执行转账任务（由转账 worker 调用），结果写入转账记录并更新任务状态
+
+        Returns:
+            bool: 是否成功
+        """
+        amount = float(job.amount)
+        try:
+            if job.transfer_type == 'external':
+                ExternalWalletService.transfer_to_external(job.operator_id, {
+                    'from_wallet': job.from_wallet_name,
+                    'to_address': job.to_wallet_address,
+                    'amount': amount,
+                }, transfer_job_id=job.id)
+            else:
+                WalletService.transfer(job.operator_id, {
+                    'alias': job.from_wallet_name,
+                    'to': job.to_wallet_address,
+                    'amount': amount,
+                }, transfer_job_id=job.id)
+        except Exception as e:
+            db.session.rollback()
+            message = getattr(e, 'message', None) or str(e) or e.__class__.__name__
+            job.finish(TRANSFER_JOB_FAILED, error_message=message)
+            logger.error(f"转账任务 {job.id} 失败: {message}")
+            return False
+
+        job.finish(TRANSFER_JOB_SUCCEEDED)
+        logger.info(f"转账任务 {job.id} 完成")
+        return True
+
+
 class TransferRecordService:
     """转账记录管理服务"""
 
@@ -601,7 +1301,7 @@ class TransferRecordService:
     def create_record(operator_username, from_wallet_name, from_wallet_address,
                      to_wallet_address, amount, transfer_type, to_wallet_name,
                      balance_before=None, balance_after=None, status='success',
-                     result_message=None, error_message=None):
+                     result_message=None, error_message=None, transfer_job_id=None):
         """创建转账记录"""
         try:
             record = TransferRecord.create(
@@ -616,7 +1316,8 @@ class TransferRecordService:
                 balance_after=balance_after,
                 status=status,
                 result_message=result_message,
-                error_message=error_message
+                error_message=error_message,
+                transfer_job_id=transfer_job_id
             )
             logger.info(f"转账记录创建成功: {operator_username} {from_wallet_name} -> {to_wallet_address} ({amount} TAO)")
             return record
@@ -625,6 +1326,18 @@ class TransferRecordService:
             # 转账记录创建失败不应该影响转账操作，只记录错误
             return None
 
+    @staticmethod
+    def create_records(rows):
+        """在一个事务中批量创建转账记录（rows 为 create_record 参数字典列表）"""
+        try:
+            records = TransferRecord.create_many(rows)
+            logger.info(f"批量创建转账记录成功: {len(records)} 条")
+            return records
+        except Exception as e:
+            logger.error(f"批量创建转账记录失败: {e}")
+            # 转账记录创建失败不应该影响转账操作，只记录错误
+            return []
+
     @staticmethod
     def get_records_for_user(user_id, page, page_size):
         """获取转账记录（根据用户权限返回相应数据）"""
@@ -654,19 +1367,56 @@ class TransferRecordService:
         }
 
     @staticmethod
-    def get_wallet_balance(wallet_address):
-        """获取单个钱包的余额"""
+    def balance_after_transfer(wallet_address, balance_before, account_nonce, outcome):
+        """
+        根据交易回执计算转账后余额：转账前余额 − Transfer 事件金额 − 手续费
+
+        只有读取转账前余额时链上 nonce 等于本交易的 nonce（该钱包之前的交易都已上链、计入余额）时才能这样计算；
+        同一钱包有其他交易同时在途、转账前余额缺失或回执解析失败时，读取打包区块上的余额。
+        交易未打包时余额不变
+
+        Args:
+            wallet_address: 转出钱包地址
+            balance_before: 转账前余额（TAO），可能为 None
+            account_nonce: 读取转账前余额时链上的 nonce，可能为 None
+            outcome: WalletService._submit_transfer 的返回值
+        """
+        if not outcome['block_hash']:
+            return balance_before
+        if (balance_before is not None and outcome['fee'] is not None and outcome['amount'] is not None
+                and account_nonce is not None and account_nonce == outcome.get('nonce')):
+            return round(balance_before - float(outcome['amount'].tao) - float(outcome['fee'].tao), 9)
+        return TransferRecordService.get_wallet_balance(wallet_address, block_hash=outcome['block_hash'])
+
+    @staticmethod
+    def get_wallet_account(wallet_address):
+        """
+        获取单个钱包的自由余额和链上 nonce（同一次查询）
+
+        Returns:
+            tuple: (自由余额 TAO, nonce)，查询失败时为 (None, None)
+        """
         try:
-            # 使用现有的get_wallets_balances函数
-            free_balances, staked_balances = asyncio.run(get_wallets_balances([wallet_address]))
+            free_balance, nonce = chain_pool.run(get_account_state, wallet_address)
+            return float(free_balance.tao), nonce
 
-            # 获取自由余额
-            free_balance = free_balances.get(wallet_address)
-            if free_balance:
-                return float(free_balance.tao)
-            else:
-                logger.warning(f"无法获取钱包 {wallet_address} 的余额")
-                return None
+        except Exception as e:
+            logger.error(f"获取钱包余额失败: {e}")
+            return None, None
+
+    @staticmethod
+    def get_wallet_balance(wallet_address, block_hash=None):
+        """
+        获取单个钱包的自由余额
+
+        Args:
+            wallet_address: 钱包地址
+            block_hash: 指定查询区块，默认使用最新区块
+        """
+        try:
+            # 只读取 System.Account，复用连接池中的常驻连接
+            free_balance = chain_pool.run(get_free_balance, wallet_address, block_hash=block_hash)
+            return float(free_balance.tao)
 
         except Exception as e:
             logger.error(f"获取钱包余额失败: {e}")
@@ -47,6 +47,47 @@ class Config:
     # Bittensor 配置
     BITTENSOR_NETWORK = os.getenv('BITTENSOR_NETWORK', 'test')
     BITTENSOR_WALLET_PATH = os.getenv('BITTENSOR_WALLET_PATH', '~/.bittensor/wallets')
+    WALLET_MANIFEST_PATH = os.getenv('WALLET_MANIFEST_PATH', 'data/wallet_manifest.msgpack')  # 钱包目录清单（增量同步，msgpack 格式）
+    # 钱包/矿工列表接口是否在读取前同步钱包目录（部署了 wallet-watcher 时保持关闭）
+    WALLET_SYNC_ON_READ = os.getenv('WALLET_SYNC_ON_READ', 'false').lower() == 'true'
+    # 钱包同步单飞锁：最短同步间隔 / 锁过期时间 / 等待其他 worker 的最长时间（秒）
+    WALLET_SYNC_MIN_INTERVAL = int(os.getenv('WALLET_SYNC_MIN_INTERVAL', 5))
+    WALLET_SYNC_LOCK_TIMEOUT = int(os.getenv('WALLET_SYNC_LOCK_TIMEOUT', 300))
+    WALLET_SYNC_LOCK_WAIT = int(os.getenv('WALLET_SYNC_LOCK_WAIT', 30))
+    # 钱包内存索引最长使用时间（秒），兜底错过的失效通知
+    WALLET_INDEX_MAX_AGE = int(os.getenv('WALLET_INDEX_MAX_AGE', 300))
+    # 钱包索引未命中缓存时间（秒），数据库中也不存在的键在此期间不再重复查询
+    WALLET_INDEX_MISS_TTL = int(os.getenv('WALLET_INDEX_MISS_TTL', 10))
+
+    # 链上连接池配置（每个 worker 进程独立）
+    CHAIN_POOL_SIZE = int(os.getenv('CHAIN_POOL_SIZE', 2))                    # 最大并发连接数
+    CHAIN_POOL_IDLE_TIMEOUT = int(os.getenv('CHAIN_POOL_IDLE_TIMEOUT', 300))  # 空闲连接关闭时间（秒）
+    CHAIN_POOL_MAX_RETRIES = int(os.getenv('CHAIN_POOL_MAX_RETRIES', 1))      # 连接失效后的重连重试次数
+    CHAIN_POOL_CALL_TIMEOUT = int(os.getenv('CHAIN_POOL_CALL_TIMEOUT', 120))  # 单次调用超时（秒，不含等待空闲连接）
+
+    # 转账接口只入队并返回 202，由转账 worker 进程（transfer-worker）执行
+    TRANSFER_QUEUE_ENABLED = os.getenv('TRANSFER_QUEUE_ENABLED', 'true').lower() == 'true'
+    # coldkey nonce 在 Redis 中的保留时间（秒），钱包空闲超过该时间后重新从链上同步
+    NONCE_TTL = int(os.getenv('NONCE_TTL', 120))
+
+    # 已解锁钱包缓存（每个进程独立），同一钱包的重复签名跳过密码解密和 keyfile 解密
+    KEYPAIR_CACHE_TTL = int(os.getenv('KEYPAIR_CACHE_TTL', 300))     # 缓存时间（秒），0 表示不缓存
+    KEYPAIR_CACHE_SIZE = int(os.getenv('KEYPAIR_CACHE_SIZE', 64))    # 最多缓存的钱包数
+
+    # 余额缓存时间（秒），约一个出块时间
+    BALANCE_CACHE_TTL = int(os.getenv('BALANCE_CACHE_TTL', 12))
+
+    # 余额分块查询配置
+    BALANCE_CHUNK_SIZE = int(os.getenv('BALANCE_CHUNK_SIZE', 200))               # 每个分块的地址数量
+    BALANCE_CHUNK_CONCURRENCY = int(os.getenv('BALANCE_CHUNK_CONCURRENCY', 4))   # 同时进行的分块数量
+    BALANCE_CHUNK_RETRIES = int(os.getenv('BALANCE_CHUNK_RETRIES', 2))           # 分块失败重试次数
+
+    # 余额快照超过该时长（秒）仍直接返回，同时在后台刷新
+    BALANCE_STALE_AFTER = int(os.getenv('BALANCE_STALE_AFTER', 60))
+
+    # 余额历史配置（由余额轮询服务写入）
+    BALANCE_HISTORY_PATH = os.getenv('BALANCE_HISTORY_PATH', 'data/balance_history')
+    BALANCE_HISTORY_MAX_POINTS = int(os.getenv('BALANCE_HISTORY_MAX_POINTS', 1000))  # 单次查询最多返回的点数
 
     # =====================
     # 钱包密码加密配置
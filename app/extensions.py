@@ -1,5 +1,6 @@
 import sys
 import bittensor
+import redis
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
@@ -59,4 +60,23 @@ def init_extensions(app):
     subtensor = bittensor.subtensor(network=app.config['BITTENSOR_NETWORK'])
     app.subtensor = subtensor
 
+    # 原生 Redis 客户端（推送式余额表、钱包变化通知）
+    app.redis = redis.Redis.from_url(app.config['REDIS_URL'])
+
+    # 链上连接池（每个 worker 进程首次使用时启动）
+    from app.utils.chain_pool import chain_pool
+    chain_pool.init_app(app)
+
+    # 钱包内存索引（名称/地址/ID）
+    from app.utils.wallet_index import wallet_index
+    wallet_index.init_app(app)
+
+    # coldkey nonce 分配器（同一钱包多笔交易无需等待上链）
+    from app.utils.nonce_manager import nonce_manager
+    nonce_manager.init_app(app)
+
+    # 已解锁钱包缓存（转账、解质押签名）
+    from app.utils.keypair_cache import keypair_cache
+    keypair_cache.init_app(app)
+
     return app
@@ -7,5 +7,7 @@ from .miners import Miners
 from .miners_to_reg import MinersToReg
 from .external_wallet import ExternalWallet
 from .transfer_record import TransferRecord
+from .transfer_job import TransferJob
+from .wallet_balance_snapshot import WalletBalanceSnapshot
 
-__all__ = ['User', 'Role', 'UserRole', 'Wallet', 'Miners', 'MinersToReg', 'ExternalWallet', 'TransferRecord']
+__all__ = ['User', 'Role', 'UserRole', 'Wallet', 'Miners', 'MinersToReg', 'ExternalWallet', 'TransferRecord', 'TransferJob', 'WalletBalanceSnapshot']
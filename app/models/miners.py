@@ -9,7 +9,7 @@ class Miners(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False, comment='矿工名称')
     wallet = db.Column(db.String(50), nullable=False, comment='钱包名称')
-    hotkey = db.Column(db.String(48), nullable=False, comment='hotkey')
+    hotkey = db.Column(db.String(48), nullable=False, unique=True, index=True, comment='hotkey')
     coldkey_id = db.Column(db.Integer, db.ForeignKey('wallets.id'), nullable=True, comment='关联的钱包ID')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
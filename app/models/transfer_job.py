@@ -0,0 +1,132 @@
+from datetime import datetime
+from app.extensions import db
+
+# 任务状态
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+STATUS_INTERRUPTED = 'interrupted'  # 执行中 worker 退出，链上结果未知
+
+
+class TransferJob(db.Model):
+    """转账任务模型（API 入队，转账 worker 进程异步执行）"""
+    __tablename__ = 'transfer_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    transfer_type = db.Column(db.String(20), nullable=False, comment='转账类型：local/external')
+    operator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True, comment='操作人ID')
+    from_wallet_name = db.Column(db.String(50), nullable=False, index=True, comment='转出钱包名称')
+    to_wallet_address = db.Column(db.String(48), nullable=False, comment='转入钱包地址')
+    amount = db.Column(db.Numeric(20, 9), nullable=False, comment='转账数量（TAO）')
+
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED, index=True,
+                       comment='任务状态：queued/running/succeeded/failed/interrupted')
+    worker_id = db.Column(db.String(100), nullable=True, comment='执行该任务的 worker')
+    error_message = db.Column(db.Text, nullable=True, comment='失败时的错误信息')
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True, comment='入队时间')
+    started_at = db.Column(db.DateTime, nullable=True, comment='开始执行时间')
+    finished_at = db.Column(db.DateTime, nullable=True, comment='执行结束时间')
+
+    # 执行结果写入的转账记录
+    transfer_records = db.relationship('TransferRecord', back_populates='transfer_job', lazy='select')
+
+    def __init__(self, transfer_type, operator_id, from_wallet_name, to_wallet_address, amount):
+        self.transfer_type = transfer_type
+        self.operator_id = operator_id
+        self.from_wallet_name = from_wallet_name
+        self.to_wallet_address = to_wallet_address
+        self.amount = amount
+        self.status = STATUS_QUEUED
+
+    def to_dict(self):
+        """转换为字典格式"""
+        record = self.transfer_records[-1] if self.transfer_records else None
+        return {
+            'id': self.id,
+            'transfer_type': self.transfer_type,
+            'from_wallet_name': self.from_wallet_name,
+            'to_wallet_address': self.to_wallet_address,
+            'amount': float(self.amount),
+            'status': self.status,
+            'error_message': self.error_message,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'transfer_record': record.to_dict() if record else None
+        }
+
+    @classmethod
+    def enqueue(cls, transfer_type, operator_id, from_wallet_name, to_wallet_address, amount):
+        """创建排队中的转账任务"""
+        job = cls(transfer_type, operator_id, from_wallet_name, to_wallet_address, amount)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @classmethod
+    def find_by_id(cls, job_id):
+        """根据ID查找任务"""
+        return db.session.get(cls, job_id)
+
+    @classmethod
+    def claim_next(cls, worker_id, exclude_wallets=(), serialize_wallets=True):
+        """
+        领取最早入队的任务并标记为执行中
+
+        使用 FOR UPDATE SKIP LOCKED，多个 worker 并发领取时不会拿到同一个任务；
+        serialize_wallets 为真时，同一转出钱包已有任务在执行则跳过该钱包
+
+        Args:
+            worker_id: 领取者标识
+            exclude_wallets: 本进程正在执行的转出钱包，一并跳过
+            serialize_wallets: 同一转出钱包的任务是否串行执行（关闭时依靠 nonce 分配器连续提交）
+
+        Returns:
+            TransferJob: 领取到的任务，没有可执行任务时返回 None
+        """
+        query = cls.query.filter(cls.status == STATUS_QUEUED)
+        if serialize_wallets:
+            busy_wallets = db.session.query(cls.from_wallet_name).filter(cls.status == STATUS_RUNNING)
+            query = query.filter(cls.from_wallet_name.notin_(busy_wallets))
+        if exclude_wallets:
+            query = query.filter(cls.from_wallet_name.notin_(list(exclude_wallets)))
+
+        try:
+            job = query.order_by(cls.id).with_for_update(skip_locked=True).first()
+            if job is None:
+                db.session.rollback()
+                return None
+            job.status = STATUS_RUNNING
+            job.worker_id = worker_id
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return job
+
+    @classmethod
+    def mark_interrupted(cls, worker_prefix):
+        """把指定 worker（按前缀匹配）遗留的执行中任务标记为中断（worker 重启时调用）"""
+        count = cls.query.filter(
+            cls.status == STATUS_RUNNING,
+            cls.worker_id.like(f"{worker_prefix}%")
+        ).update({
+            'status': STATUS_INTERRUPTED,
+            'finished_at': datetime.utcnow(),
+            'error_message': 'worker 在执行过程中退出，交易可能已提交，请核对链上记录和转账记录'
+        }, synchronize_session=False)
+        db.session.commit()
+        return count
+
+    def finish(self, status, error_message=None):
+        """记录执行结果"""
+        self.status = status
+        self.error_message = error_message
+        self.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<TransferJob {self.id} {self.status}: {self.from_wallet_name} -> {self.to_wallet_address} ({self.amount} TAO)>'
@@ -31,13 +31,19 @@ class TransferRecord(db.Model):
     # 转账类型
     transfer_type = db.Column(db.String(20), nullable=False, index=True, comment='转账类型：local/external')
 
+    # 异步执行时对应的转账任务
+    transfer_job_id = db.Column(db.Integer, db.ForeignKey('transfer_jobs.id'), nullable=True, index=True, comment='关联的转账任务ID')
+
     # 时间戳
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True, comment='操作时间')
 
+    # 关系
+    transfer_job = db.relationship('TransferJob', back_populates='transfer_records', lazy='select')
+
     def __init__(self, operator_username, from_wallet_name, from_wallet_address,
                  to_wallet_address, amount, transfer_type, to_wallet_name,
                  balance_before=None, balance_after=None, status='success',
-                 result_message=None, error_message=None):
+                 result_message=None, error_message=None, transfer_job_id=None):
         self.operator_username = operator_username
         self.from_wallet_name = from_wallet_name
         self.from_wallet_address = from_wallet_address
@@ -50,6 +56,7 @@ class TransferRecord(db.Model):
         self.status = status
         self.result_message = result_message
         self.error_message = error_message
+        self.transfer_job_id = transfer_job_id
 
     def to_dict(self):
         """转换为字典格式"""
@@ -67,6 +74,7 @@ class TransferRecord(db.Model):
             'result_message': self.result_message,
             'error_message': self.error_message,
             'transfer_type': self.transfer_type,
+            'transfer_job_id': self.transfer_job_id,
             'created_at': self.created_at
         }
 
@@ -79,7 +87,7 @@ class TransferRecord(db.Model):
     def create(cls, operator_username, from_wallet_name, from_wallet_address,
                to_wallet_address, amount, transfer_type, to_wallet_name,
                balance_before=None, balance_after=None, status='success',
-               result_message=None, error_message=None):
+               result_message=None, error_message=None, transfer_job_id=None):
         """创建转账记录"""
         record = cls(
             operator_username=operator_username,
@@ -93,10 +101,23 @@ class TransferRecord(db.Model):
             balance_after=balance_after,
             status=status,
             result_message=result_message,
-            error_message=error_message
+            error_message=error_message,
+            transfer_job_id=transfer_job_id
         )
         record.save()
         return record
 
+    @classmethod
+    def create_many(cls, rows):
+        """在一个事务中批量创建转账记录（rows 为 create 参数字典列表）"""
+        records = [cls(**row) for row in rows]
+        try:
+            db.session.add_all(records)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return records
+
     def __repr__(self):
         return f'<TransferRecord {self.operator_username}: {self.from_wallet_name} -> {self.to_wallet_address} ({self.amount} TAO)>'
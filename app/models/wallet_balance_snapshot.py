@@ -0,0 +1,61 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
+from app.extensions import db
+
+
+class WalletBalanceSnapshot(db.Model):
+    """钱包余额快照模型（由余额轮询服务定期刷新，每个钱包保留最新一条）"""
+    __tablename__ = 'wallet_balance_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    wallet_id = db.Column(db.Integer, db.ForeignKey('wallets.id'), nullable=False, unique=True, index=True, comment='关联的钱包ID')
+    coldkey_address = db.Column(db.String(48), nullable=False, comment='钱包地址')
+    free = db.Column(db.Numeric(20, 9), nullable=False, comment='自由余额（TAO）')
+    staked = db.Column(db.Numeric(20, 9), nullable=False, comment='质押余额（TAO）')
+    block = db.Column(db.Integer, nullable=False, comment='快照区块高度')
+    block_hash = db.Column(db.String(66), nullable=True, comment='快照区块哈希')
+    as_of = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment='快照时间')
+
+    def to_dict(self):
+        """转换为字典格式"""
+        return {
+            'wallet_id': self.wallet_id,
+            'coldkey_address': self.coldkey_address,
+            'free': float(self.free),
+            'staked': float(self.staked),
+            'block': self.block,
+            'block_hash': self.block_hash,
+            'as_of': self.as_of
+        }
+
+    @classmethod
+    def find_by_wallet_ids(cls, wallet_ids):
+        """批量查询钱包快照，返回 {wallet_id: snapshot}"""
+        if not wallet_ids:
+            return {}
+        snapshots = cls.query.filter(cls.wallet_id.in_(wallet_ids)).all()
+        return {snapshot.wallet_id: snapshot for snapshot in snapshots}
+
+    @classmethod
+    def upsert_many(cls, rows):
+        """批量写入快照（按钱包覆盖，只允许用更新的区块覆盖旧快照）"""
+        if not rows:
+            return
+        stmt = insert(cls.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.wallet_id],
+            set_={
+                'coldkey_address': stmt.excluded.coldkey_address,
+                'free': stmt.excluded.free,
+                'staked': stmt.excluded.staked,
+                'block': stmt.excluded.block,
+                'block_hash': stmt.excluded.block_hash,
+                'as_of': stmt.excluded.as_of
+            },
+            where=cls.__table__.c.block <= stmt.excluded.block
+        )
+        db.session.execute(stmt)
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<WalletBalanceSnapshot wallet_id={self.wallet_id}: free={self.free}, staked={self.staked}, block={self.block}>'
@@ -0,0 +1,106 @@
+"""
+钱包余额缓存
+基于 Flask-Caching (Redis) 在所有 worker 之间共享余额查询结果，
+缓存键由区块哈希和 coldkey 组成，同一区块内的重复查询直接命中缓存
+"""
+
+from flask import current_app
+from app.extensions import cache, logger
+from app.utils.blockchain import get_chain_head, get_wallets_balances
+from app.utils.chain_pool import chain_pool
+
+# 命中/未命中计数器的缓存键
+HITS_KEY = 'balance_cache:hits'
+MISSES_KEY = 'balance_cache:misses'
+
+
+def _cache_key(block_hash, coldkey):
+    return f"balance:{block_hash}:{coldkey}"
+
+
+def _incr(key, delta):
+    """累加计数器，缓存不可用时忽略"""
+    if delta <= 0:
+        return
+    try:
+        cache.inc(key, delta)
+    except Exception as e:
+        logger.debug(f"余额缓存计数失败: {e}")
+
+
+def get_balances(coldkeys, block_hash=None):
+    """
+    获取一批 coldkey 的自由余额和质押余额（优先读取缓存）
+
+    Args:
+        coldkeys: coldkey 地址列表
+        block_hash: 指定查询区块，默认使用当前链头
+
+    Returns:
+        tuple: (free_balances, staked_balances, block_hash)
+    """
+    if block_hash is None:
+        block_hash, _ = chain_pool.run(get_chain_head)
+
+    free_balances = {}
+    staked_balances = {}
+    coldkeys = list(dict.fromkeys(coldkeys))
+    if not coldkeys:
+        return free_balances, staked_balances, block_hash
+
+    # 批量读取缓存
+    keys = [_cache_key(block_hash, coldkey) for coldkey in coldkeys]
+    try:
+        cached = cache.get_many(*keys)
+    except Exception as e:
+        logger.warning(f"读取余额缓存失败，直接查询链上: {e}")
+        cached = [None] * len(keys)
+
+    missing = []
+    for coldkey, value in zip(coldkeys, cached):
+        if value is None:
+            missing.append(coldkey)
+        else:
+            free_balances[coldkey], staked_balances[coldkey] = value
+
+    _incr(HITS_KEY, len(coldkeys) - len(missing))
+    _incr(MISSES_KEY, len(missing))
+
+    if missing:
+        config = current_app.config
+        fetched_free, fetched_staked = chain_pool.run(
+            get_wallets_balances, missing,
+            block_hash=block_hash,
+            chunk_size=config['BALANCE_CHUNK_SIZE'],
+            concurrency=config['BALANCE_CHUNK_CONCURRENCY'],
+            retries=config['BALANCE_CHUNK_RETRIES']
+        )
+
+        to_cache = {}
+        for coldkey in missing:
+            free = fetched_free.get(coldkey)
+            staked = fetched_staked.get(coldkey)
+            free_balances[coldkey] = free
+            staked_balances[coldkey] = staked
+            if free is not None and staked is not None:
+                to_cache[_cache_key(block_hash, coldkey)] = (free, staked)
+
+        if to_cache:
+            try:
+                cache.set_many(to_cache, timeout=current_app.config['BALANCE_CACHE_TTL'])
+            except Exception as e:
+                logger.warning(f"写入余额缓存失败: {e}")
+
+    return free_balances, staked_balances, block_hash
+
+
+def get_cache_stats():
+    """获取余额缓存命中统计"""
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else 0.0
+    }
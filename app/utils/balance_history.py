@@ -0,0 +1,114 @@
+"""
+钱包余额历史存储
+每个 coldkey 每天一个只追加的定长二进制段文件:
+    {base_path}/{YYYYMMDD}/{coldkey_address}.bin
+每条记录 32 字节 (ts, block, free, staked)，余额以 rao 存储为 int64，
+读取时按天 memmap 后用 NumPy 过滤和降采样
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+RAO_PER_TAO = 10 ** 9
+
+# 单条历史记录结构（小端序，定长）
+RECORD_DTYPE = np.dtype([
+    ('ts', '<i8'),       # Unix 时间戳（秒）
+    ('block', '<i8'),    # 区块高度
+    ('free', '<i8'),     # 自由余额（rao）
+    ('staked', '<i8'),   # 质押余额（rao）
+])
+
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y%m%d')
+
+
+def _segment_path(base_path, day, coldkey):
+    return os.path.join(base_path, day, f"{coldkey}.bin")
+
+
+def append_samples(base_path, samples):
+    """
+    追加一批余额采样
+
+    Args:
+        base_path: 历史数据根目录
+        samples: {coldkey_address: (ts, block, free_rao, staked_rao)}
+    """
+    if not samples:
+        return
+
+    by_day = {}
+    for coldkey, sample in samples.items():
+        by_day.setdefault(_day(sample[0]), []).append((coldkey, sample))
+
+    for day, items in by_day.items():
+        os.makedirs(os.path.join(base_path, day), exist_ok=True)
+        for coldkey, sample in items:
+            record = np.array([sample], dtype=RECORD_DTYPE)
+            # O_APPEND 保证单条记录整体写入，不会与其他写入交错
+            with open(_segment_path(base_path, day, coldkey), 'ab') as f:
+                f.write(record.tobytes())
+
+
+def _load_range(base_path, coldkey, start_ts, end_ts):
+    """读取 [start_ts, end_ts] 内的所有记录"""
+    segments = []
+    day = datetime.fromtimestamp(start_ts, tz=timezone.utc).date()
+    last_day = datetime.fromtimestamp(end_ts, tz=timezone.utc).date()
+
+    while day <= last_day:
+        path = _segment_path(base_path, day.strftime('%Y%m%d'), coldkey)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        # 只读取完整记录，忽略正在写入的尾部
+        count = size // RECORD_DTYPE.itemsize
+        if count:
+            segment = np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+            mask = (segment['ts'] >= start_ts) & (segment['ts'] <= end_ts)
+            segments.append(np.array(segment[mask]))
+        day += timedelta(days=1)
+
+    if not segments:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    records = np.concatenate(segments)
+    return records[np.argsort(records['ts'], kind='stable')]
+
+
+def read_series(base_path, coldkey, start_ts, end_ts, step):
+    """
+    读取降采样后的余额序列
+
+    以 step 秒为桶，每个桶取最后一条记录（余额为状态量，取桶末值）
+
+    Args:
+        base_path: 历史数据根目录
+        coldkey: coldkey 地址
+        start_ts: 起始时间戳（秒，含）
+        end_ts: 结束时间戳（秒，含）
+        step: 桶宽（秒）
+
+    Returns:
+        dict: 列式数据 {ts, block, free, staked, total}，ts 为桶起始时间，余额单位为 TAO
+    """
+    records = _load_range(base_path, coldkey, start_ts, end_ts)
+    if len(records):
+        buckets = (records['ts'] - start_ts) // step
+        # 每个桶的最后一条记录
+        last = np.flatnonzero(np.diff(buckets, append=buckets[-1] + 1))
+        records = records[last]
+        bucket_ts = start_ts + buckets[last] * step
+    else:
+        bucket_ts = np.empty(0, dtype=np.int64)
+
+    free = records['free'] / RAO_PER_TAO
+    staked = records['staked'] / RAO_PER_TAO
+    return {
+        'ts': bucket_ts.tolist(),
+        'block': records['block'].tolist(),
+        'free': free.tolist(),
+        'staked': staked.tolist(),
+        'total': (free + staked).tolist(),
+    }
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+钱包余额轮询后台服务程序
+每隔 N 个区块查询 wallets 表中所有钱包的自由余额和质押余额，
+写入 wallet_balance_snapshots 表，供钱包列表接口直接读取
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any
+from dotenv import load_dotenv
+
+from sqlalchemy.exc import OperationalError, InterfaceError, DatabaseError
+
+# 添加项目路径到sys.path
+project_root = os.path.dirname(os.path.abspath(__file__))
+console_root = os.path.dirname(os.path.dirname(project_root))  # 向上两级到项目根目录
+sys.path.insert(0, console_root)
+
+# 数据库连接
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Bittensor相关导入
+from bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+from app.utils.blockchain import get_wallets_balances
+from app.utils.balance_history import append_samples
+
+# 加载环境变量
+load_dotenv(os.path.join(console_root, '.env'))
+
+# 获取数据库配置
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+def create_database_url(database_name):
+    """基于 DATABASE_URL 创建指定数据库的连接URL"""
+    return f"{DATABASE_URL}/{database_name}"
+
+# 创建主数据库连接 (wallet_management)
+main_database_url = create_database_url('wallet_management')
+main_engine = create_engine(main_database_url)
+MainSession = sessionmaker(bind=main_engine)
+db_session = MainSession()
+
+# 轮询配置
+BITTENSOR_NETWORK = os.getenv('BITTENSOR_NETWORK', 'test')
+BALANCE_POLL_BLOCKS = int(os.getenv('BALANCE_POLL_BLOCKS', '5'))        # 每隔多少个区块刷新一次
+BALANCE_POLL_INTERVAL = int(os.getenv('BALANCE_POLL_INTERVAL', '12'))   # 检查链头的间隔（秒）
+BALANCE_CHUNK_SIZE = int(os.getenv('BALANCE_CHUNK_SIZE', '200'))
+BALANCE_CHUNK_CONCURRENCY = int(os.getenv('BALANCE_CHUNK_CONCURRENCY', '4'))
+BALANCE_CHUNK_RETRIES = int(os.getenv('BALANCE_CHUNK_RETRIES', '2'))
+BALANCE_HISTORY_PATH = os.getenv('BALANCE_HISTORY_PATH', 'data/balance_history')  # 余额历史存储目录
+
+# 配置日志
+log_dir = 'logs'
+if not os.path.exists(log_dir):
+    os.makedirs(log_dir)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(log_dir, 'balance_poller.log'))
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+class BalancePollerService:
+    """
+    钱包余额轮询服务类
+    """
+
+    def __init__(self, network: str, poll_blocks: int = 5, check_interval: int = 12):
+        """
+        初始化轮询服务
+
+        Args:
+            network: Bittensor 网络
+            poll_blocks: 每隔多少个区块刷新一次快照
+            check_interval: 检查链头的间隔时间（秒）
+        """
+        self.network = network
+        self.poll_blocks = poll_blocks
+        self.check_interval = check_interval
+        self.running = False
+        self.thread = None
+        self.last_block = None
+
+    def start(self):
+        """
+        启动轮询服务
+        """
+        if self.running:
+            logger.warning("余额轮询服务已经在运行中")
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run_service, daemon=True)
+        self.thread.start()
+        logger.info(f"余额轮询服务已启动，每 {self.poll_blocks} 个区块刷新一次")
+
+    def stop(self):
+        """
+        停止轮询服务
+        """
+        if not self.running:
+            logger.warning("余额轮询服务未在运行")
+            return
+
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+        logger.info("余额轮询服务已停止")
+
+    def _run_service(self):
+        """
+        运行轮询服务主循环（独立事件循环）
+        """
+        logger.info("余额轮询服务开始")
+        asyncio.run(self._poll_loop())
+        logger.info("余额轮询服务结束")
+
+    async def _poll_loop(self):
+        subtensor = None
+
+        while self.running:
+            try:
+                if subtensor is None:
+                    subtensor = SubtensorInterface(network=self.network)
+                    await subtensor.substrate.initialize()
+                    logger.info(f"已连接链上节点，网络: {self.network}")
+
+                block_hash = await subtensor.substrate.get_chain_head()
+                block = await subtensor.substrate.get_block_number(block_hash)
+
+                if self.last_block is None or block - self.last_block >= self.poll_blocks:
+                    await self._refresh_snapshots(subtensor, block_hash, block)
+                    self.last_block = block
+
+            except (OperationalError, InterfaceError, DatabaseError) as e:
+                logger.error(f"数据库连接异常，程序即将退出: {e}")
+                logger.error("等待外部管理程序重启...")
+                os._exit(1)
+            except Exception as e:
+                logger.warning(f"刷新余额快照异常，重建链上连接: {e}")
+                if subtensor is not None:
+                    try:
+                        await subtensor.substrate.close()
+                    except Exception:
+                        pass
+                    subtensor = None
+
+            await asyncio.sleep(self.check_interval)
+
+        if subtensor is not None:
+            try:
+                await subtensor.substrate.close()
+            except Exception:
+                pass
+
+    async def _refresh_snapshots(self, subtensor, block_hash: str, block: int):
+        """查询所有钱包余额并写入快照表"""
+        wallets = self._get_wallets()
+        if not wallets:
+            logger.info("没有需要刷新余额的钱包")
+            return
+
+        coldkeys = [wallet['coldkey_address'] for wallet in wallets]
+        started = time.time()
+        free_balances, staked_balances = await get_wallets_balances(
+            coldkeys, subtensor=subtensor, block_hash=block_hash,
+            chunk_size=BALANCE_CHUNK_SIZE,
+            concurrency=BALANCE_CHUNK_CONCURRENCY,
+            retries=BALANCE_CHUNK_RETRIES
+        )
+
+        rows = []
+        history = {}
+        as_of = datetime.utcnow()
+        ts = int(time.time())
+        for wallet in wallets:
+            coldkey = wallet['coldkey_address']
+            free = free_balances.get(coldkey)
+            staked = staked_balances.get(coldkey)
+            if free is None or staked is None:
+                continue
+            rows.append({
+                'wallet_id': wallet['id'],
+                'coldkey_address': coldkey,
+                'free': free.tao,
+                'staked': staked[0].tao,
+                'block': block,
+                'block_hash': block_hash,
+                'as_of': as_of
+            })
+            history[coldkey] = (ts, block, free.rao, staked[0].rao)
+
+        self._save_snapshots(rows)
+        self._save_history(history)
+        logger.info(f"区块 {block} 余额快照刷新完成: {len(rows)}/{len(wallets)} 个钱包，"
+                    f"耗时 {time.time() - started:.2f} 秒")
+
+    def _get_wallets(self) -> List[dict]:
+        """获取所有钱包"""
+        try:
+            result = db_session.execute(text("SELECT id, coldkey_address FROM wallets"))
+            wallets = [dict(row._mapping) for row in result]
+            db_session.commit()
+            return wallets
+        except (OperationalError, InterfaceError, DatabaseError):
+            # 数据库连接异常，向上传播给主循环处理
+            raise
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"查询钱包列表时出错: {e}")
+            return []
+
+    def _save_snapshots(self, rows: List[dict]):
+        """批量写入余额快照（按钱包覆盖更新）"""
+        if not rows:
+            return
+
+        query = text("""
+            INSERT INTO wallet_balance_snapshots
+                (wallet_id, coldkey_address, free, staked, block, block_hash, as_of)
+            VALUES
+                (:wallet_id, :coldkey_address, :free, :staked, :block, :block_hash, :as_of)
+            ON CONFLICT (wallet_id) DO UPDATE SET
+                coldkey_address = EXCLUDED.coldkey_address,
+                free = EXCLUDED.free,
+                staked = EXCLUDED.staked,
+                block = EXCLUDED.block,
+                block_hash = EXCLUDED.block_hash,
+                as_of = EXCLUDED.as_of
+            WHERE wallet_balance_snapshots.block <= EXCLUDED.block
+        """)
+
+        try:
+            db_session.execute(query, rows)
+            db_session.commit()
+        except (OperationalError, InterfaceError, DatabaseError):
+            db_session.rollback()
+            raise
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"写入余额快照时出错: {e}")
+
+    def _save_history(self, history: Dict[str, tuple]):
+        """追加余额历史采样，写入失败只记录日志"""
+        try:
+            append_samples(BALANCE_HISTORY_PATH, history)
+        except Exception as e:
+            logger.error(f"写入余额历史时出错: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+
+        Returns:
+            服务状态信息
+        """
+        return {
+            'running': self.running,
+            'poll_blocks': self.poll_blocks,
+            'last_block': self.last_block,
+            'thread_alive': self.thread.is_alive() if self.thread else False
+        }
+
+
+service = None
+
+def signal_handler(signum, frame):
+    """
+    信号处理器，用于优雅关闭服务
+    """
+    logger.info(f"接收到信号 {signum}，准备关闭服务...")
+    global service
+    if service:
+        service.stop()
+    sys.exit(0)
+
+def main():
+    """
+    主函数
+    """
+    logger.info("余额轮询服务启动中...")
+
+    # 注册信号处理器
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # 创建并启动轮询服务
+    global service
+    service = BalancePollerService(
+        network=BITTENSOR_NETWORK,
+        poll_blocks=BALANCE_POLL_BLOCKS,
+        check_interval=BALANCE_POLL_INTERVAL
+    )
+    service.start()
+
+    try:
+        # 保持主线程运行
+        while service.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("接收到键盘中断，关闭服务...")
+    finally:
+        service.stop()
+        logger.info("余额轮询服务已关闭")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+钱包余额订阅后台服务程序
+通过 state_subscribeStorage 订阅 wallets 表中所有 coldkey 的 System.Account 存储变化，
+每个区块的变化实时写入 Redis 推送式余额表；钱包同步新增钱包后重新订阅
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import logging
+import threading
+from typing import Dict, Any
+from dotenv import load_dotenv
+
+import websockets
+import redis.asyncio as aioredis
+from sqlalchemy.exc import OperationalError, InterfaceError, DatabaseError
+
+# 添加项目路径到sys.path
+project_root = os.path.dirname(os.path.abspath(__file__))
+console_root = os.path.dirname(os.path.dirname(project_root))  # 向上两级到项目根目录
+sys.path.insert(0, console_root)
+
+# 数据库连接
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Bittensor相关导入
+from bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+from app.utils.balance_table import BALANCE_TABLE_KEY, WALLETS_CHANNEL, encode_entry, decode_free_balance
+
+# 加载环境变量
+load_dotenv(os.path.join(console_root, '.env'))
+
+# 获取数据库配置
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+def create_database_url(database_name):
+    """基于 DATABASE_URL 创建指定数据库的连接URL"""
+    return f"{DATABASE_URL}/{database_name}"
+
+# 创建主数据库连接 (wallet_management)
+main_database_url = create_database_url('wallet_management')
+main_engine = create_engine(main_database_url)
+MainSession = sessionmaker(bind=main_engine)
+db_session = MainSession()
+
+# 订阅配置
+BITTENSOR_NETWORK = os.getenv('BITTENSOR_NETWORK', 'test')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+BALANCE_SUBSCRIBER_RELOAD = int(os.getenv('BALANCE_SUBSCRIBER_RELOAD', '300'))  # 兜底重新加载钱包列表的间隔（秒）
+
+# 配置日志
+log_dir = 'logs'
+if not os.path.exists(log_dir):
+    os.makedirs(log_dir)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(log_dir, 'balance_subscriber.log'))
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+class BalanceSubscriberService:
+    """
+    钱包余额订阅服务类
+    """
+
+    def __init__(self, network: str, redis_url: str, reload_interval: int = 300):
+        """
+        初始化订阅服务
+
+        Args:
+            network: Bittensor 网络
+            redis_url: 推送式余额表所在的 Redis
+            reload_interval: 兜底重新加载钱包列表的间隔（秒）
+        """
+        self.network = network
+        self.redis_url = redis_url
+        self.reload_interval = reload_interval
+        self.running = False
+        self.thread = None
+        self.addresses = set()
+        self.last_block = None
+        self._resubscribe = None
+
+    def start(self):
+        """
+        启动订阅服务
+        """
+        if self.running:
+            logger.warning("余额订阅服务已经在运行中")
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run_service, daemon=True)
+        self.thread.start()
+        logger.info("余额订阅服务已启动")
+
+    def stop(self):
+        """
+        停止订阅服务
+        """
+        if not self.running:
+            logger.warning("余额订阅服务未在运行")
+            return
+
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+        logger.info("余额订阅服务已停止")
+
+    def _run_service(self):
+        """
+        运行订阅服务主循环（独立事件循环）
+        """
+        logger.info("余额订阅服务开始")
+        asyncio.run(self._main())
+        logger.info("余额订阅服务结束")
+
+    async def _main(self):
+        self._resubscribe = asyncio.Event()
+        redis_client = aioredis.from_url(self.redis_url)
+        watchers = [
+            asyncio.create_task(self._watch_wallet_changes(redis_client)),
+            asyncio.create_task(self._periodic_reload()),
+        ]
+
+        try:
+            while self.running:
+                try:
+                    await self._subscribe_once(redis_client)
+                except (OperationalError, InterfaceError, DatabaseError) as e:
+                    logger.error(f"数据库连接异常，程序即将退出: {e}")
+                    logger.error("等待外部管理程序重启...")
+                    os._exit(1)
+                except Exception as e:
+                    logger.warning(f"订阅中断，5 秒后重新订阅: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            for task in watchers:
+                task.cancel()
+            await redis_client.aclose()
+
+    async def _subscribe_once(self, redis_client):
+        """加载钱包列表并订阅存储变化，直到需要重新订阅或连接断开"""
+        self._resubscribe.clear()
+        self.addresses = set(self._get_wallet_addresses())
+        if not self.addresses:
+            logger.info("没有需要订阅的钱包，等待钱包同步")
+            await self._resubscribe.wait()
+            return
+
+        subtensor = SubtensorInterface(network=self.network)
+        await subtensor.substrate.initialize()
+        try:
+            # 存储键 -> 地址
+            key_to_address = {}
+            for address in self.addresses:
+                storage_key = await subtensor.substrate.create_storage_key('System', 'Account', [address])
+                key_to_address[storage_key.to_hex()] = address
+
+            async with websockets.connect(subtensor.chain_endpoint, max_size=None) as ws:
+                await ws.send(json.dumps({
+                    'jsonrpc': '2.0',
+                    'id': 1,
+                    'method': 'state_subscribeStorage',
+                    'params': [list(key_to_address.keys())]
+                }))
+                logger.info(f"已订阅 {len(key_to_address)} 个钱包的 System.Account 存储变化")
+
+                block_numbers = {}
+                while self.running and not self._resubscribe.is_set():
+                    try:
+                        message = await asyncio.wait_for(ws.recv(), timeout=1)
+                    except asyncio.TimeoutError:
+                        continue
+
+                    payload = json.loads(message)
+                    if payload.get('method') != 'state_storage':
+                        if 'error' in payload:
+                            raise RuntimeError(f"订阅失败: {payload['error']}")
+                        continue
+
+                    result = payload['params']['result']
+                    block_hash = result['block']
+                    if block_hash not in block_numbers:
+                        block_numbers.clear()
+                        block_numbers[block_hash] = await subtensor.substrate.get_block_number(block_hash)
+                    block = block_numbers[block_hash]
+
+                    updates = {}
+                    for storage_key, data in result['changes']:
+                        address = key_to_address.get(storage_key)
+                        if address:
+                            updates[address] = encode_entry(decode_free_balance(data), block, block_hash)
+
+                    if updates:
+                        await redis_client.hset(BALANCE_TABLE_KEY, mapping=updates)
+                        self.last_block = block
+                        logger.debug(f"区块 {block} 更新 {len(updates)} 个钱包余额")
+
+            if self._resubscribe.is_set():
+                logger.info("钱包列表变化，重新订阅")
+        finally:
+            await subtensor.substrate.close()
+
+    async def _watch_wallet_changes(self, redis_client):
+        """监听钱包同步发布的变化通知"""
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(WALLETS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self._resubscribe.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"监听钱包变化通知异常: {e}")
+                await asyncio.sleep(5)
+
+    async def _periodic_reload(self):
+        """兜底：定期检查钱包列表是否变化"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                if set(self._get_wallet_addresses()) != self.addresses:
+                    self._resubscribe.set()
+            except Exception as e:
+                logger.warning(f"检查钱包列表变化异常: {e}")
+
+    def _get_wallet_addresses(self):
+        """获取所有钱包地址"""
+        try:
+            result = db_session.execute(text("SELECT coldkey_address FROM wallets"))
+            addresses = [row[0] for row in result]
+            db_session.commit()
+            return addresses
+        except Exception:
+            db_session.rollback()
+            raise
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+
+        Returns:
+            服务状态信息
+        """
+        return {
+            'running': self.running,
+            'subscribed': len(self.addresses),
+            'last_block': self.last_block,
+            'thread_alive': self.thread.is_alive() if self.thread else False
+        }
+
+
+service = None
+
+def signal_handler(signum, frame):
+    """
+    信号处理器，用于优雅关闭服务
+    """
+    logger.info(f"接收到信号 {signum}，准备关闭服务...")
+    global service
+    if service:
+        service.stop()
+    sys.exit(0)
+
+def main():
+    """
+    主函数
+    """
+    logger.info("余额订阅服务启动中...")
+
+    # 注册信号处理器
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # 创建并启动订阅服务
+    global service
+    service = BalanceSubscriberService(
+        network=BITTENSOR_NETWORK,
+        redis_url=REDIS_URL,
+        reload_interval=BALANCE_SUBSCRIBER_RELOAD
+    )
+    service.start()
+
+    try:
+        # 保持主线程运行
+        while service.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("接收到键盘中断，关闭服务...")
+    finally:
+        service.stop()
+        logger.info("余额订阅服务已关闭")
+
+
+if __name__ == '__main__':
+    main()
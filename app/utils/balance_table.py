@@ -0,0 +1,61 @@
+"""
+推送式余额表
+由余额订阅服务 (balance_subscriber.py) 订阅 System.Account 存储变化后写入 Redis 哈希表，
+钱包接口按地址 O(1) 读取最新自由余额，不再访问链上
+"""
+
+import json
+import time
+
+# Redis 键名
+BALANCE_TABLE_KEY = 'balance_table:free'      # 哈希表: 地址 -> 余额记录
+WALLETS_CHANNEL = 'wallets:changed'           # 钱包列表变化通知频道
+
+RAO_PER_TAO = 10 ** 9
+
+
+def encode_entry(free_rao, block, block_hash):
+    """编码单个地址的余额记录"""
+    return json.dumps({
+        'free': int(free_rao),
+        'block': block,
+        'block_hash': block_hash,
+        'ts': time.time()
+    })
+
+
+def decode_free_balance(data_hex):
+    """
+    从 System.Account 存储值中解析自由余额（rao）
+
+    AccountInfo 布局: nonce u32, consumers u32, providers u32, sufficients u32,
+    随后是 AccountData.free u128（小端序）
+    """
+    if not data_hex:
+        return 0
+    raw = bytes.fromhex(data_hex[2:] if data_hex.startswith('0x') else data_hex)
+    return int.from_bytes(raw[16:32], 'little')
+
+
+def read_free_balances(client, addresses):
+    """
+    批量读取推送表中的自由余额
+
+    Args:
+        client: Redis 客户端
+        addresses: 地址列表
+
+    Returns:
+        dict: {地址: (free_tao, block, updated_at_timestamp)}，表中没有的地址不返回
+    """
+    if not addresses:
+        return {}
+
+    values = client.hmget(BALANCE_TABLE_KEY, addresses)
+    balances = {}
+    for address, value in zip(addresses, values):
+        if value is None:
+            continue
+        entry = json.loads(value)
+        balances[address] = (entry['free'] / RAO_PER_TAO, entry['block'], entry['ts'])
+    return balances
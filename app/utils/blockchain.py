@@ -2,13 +2,85 @@ import asyncio
 import bittensor
 from flask import current_app
 from app.errors.custom_errors import BlockchainError
+from websockets.exceptions import ConnectionClosed
 from bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+from bittensor_cli.src.bittensor.utils import format_error_message
 from bittensor_cli.src.commands.stake.remove import _get_hotkeys_to_unstake, _safe_unstake_extrinsic, _unstake_extrinsic
 
-async def get_wallets_balances(coldkeys):
-    subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+async def get_chain_head(subtensor=None):
+    """获取链头区块哈希和区块高度"""
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
 
     block_hash = await subtensor.substrate.get_chain_head()
+    block_number = await subtensor.substrate.get_block_number(block_hash)
+
+    return block_hash, block_number
+
+async def get_wallets_balances(coldkeys, subtensor=None, block_hash=None,
+                               chunk_size=None, concurrency=4, retries=2):
+    """
+    查询一批 coldkey 的自由余额和质押余额
+
+    Args:
+        coldkeys: coldkey 地址列表
+        subtensor: 由连接池传入的常驻连接，为空时临时新建
+        block_hash: 指定查询区块，默认使用链头
+        chunk_size: 分块大小，为空时一次性查询全部地址
+        concurrency: 同时进行的分块查询数量
+        retries: 单个分块失败后的重试次数
+
+    Returns:
+        tuple: (free_balances, staked_balances)
+    """
+    # 由连接池调用时复用常驻连接，否则临时新建
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    # 未指定区块时读取链头，保证所有分块的自由余额和质押余额来自同一区块
+    if block_hash is None:
+        block_hash = await subtensor.substrate.get_chain_head()
+
+    if not chunk_size or len(coldkeys) <= chunk_size:
+        return await _get_balances_chunk(subtensor, coldkeys, block_hash)
+
+    chunks = [coldkeys[i:i + chunk_size] for i in range(0, len(coldkeys), chunk_size)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(chunk):
+        async with semaphore:
+            attempt = 0
+            while True:
+                try:
+                    return await _get_balances_chunk(subtensor, chunk, block_hash)
+                except ConnectionClosed:
+                    # 连接已断开，重试分块没有意义，交给连接池重连后整体重试
+                    raise
+                except Exception as e:
+                    if attempt >= retries:
+                        raise BlockchainError(f"余额分块查询失败（{len(chunk)} 个地址）: {e}")
+                    attempt += 1
+                    # 只重试失败的分块，其余分块结果保留
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+    tasks = [asyncio.ensure_future(fetch(chunk)) for chunk in chunks]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # 任一分块最终失败时取消其余分块，不再占用即将被丢弃的连接
+        for task in tasks:
+            task.cancel()
+        raise
+
+    free_balances, staked_balances = {}, {}
+    for free, staked in results:
+        free_balances.update(free)
+        staked_balances.update(staked)
+
+    return free_balances, staked_balances
+
+async def _get_balances_chunk(subtensor, coldkeys, block_hash):
+    """在指定区块查询一个分块的自由余额和质押余额"""
     free_balances, staked_balances = await asyncio.gather(
         subtensor.get_balances(*coldkeys, block_hash=block_hash),
         subtensor.get_total_stake_for_coldkey(*coldkeys, block_hash=block_hash),
@@ -16,19 +88,225 @@ async def get_wallets_balances(coldkeys):
 
     return free_balances, staked_balances
 
-def transfer(wallet, alias, toAddress, amount, wallet_password):
-    wallet.coldkey_file.save_password_to_env(wallet_password)
-    wallet.unlock_coldkey()
+async def get_stake_infos(coldkeys, subtensor=None, block_hash=None, chunk_size=None, concurrency=4):
+    """
+    在同一区块查询一批 coldkey 的分子网/分 hotkey 质押明细及各子网价格
+
+    Args:
+        coldkeys: coldkey 地址列表
+        subtensor: 由连接池传入的常驻连接，为空时临时新建
+        block_hash: 指定查询区块，默认使用链头
+        chunk_size: 分块大小，为空时一次性查询全部地址
+        concurrency: 同时进行的分块查询数量
+
+    Returns:
+        tuple: ({coldkey: [StakeInfo]}, {netuid: 价格（TAO/alpha）})
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    if block_hash is None:
+        block_hash = await subtensor.substrate.get_chain_head()
+
+    chunk_size = chunk_size or max(len(coldkeys), 1)
+    chunks = [coldkeys[i:i + chunk_size] for i in range(0, len(coldkeys), chunk_size)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(chunk):
+        async with semaphore:
+            return await subtensor.get_stake_for_coldkeys(chunk, block_hash=block_hash)
+
+    subnets, *results = await asyncio.gather(
+        subtensor.all_subnets(block_hash=block_hash),
+        *(fetch(chunk) for chunk in chunks)
+    )
 
-    success = bittensor.core.extrinsics.transfer.transfer_extrinsic(
-        subtensor=current_app.subtensor,
-        wallet=bittensor.Wallet(name=alias),
-        dest=toAddress,
-        amount=amount,
-        transfer_all=False
+    stake_infos = {}
+    for result in results:
+        stake_infos.update(result or {})
+
+    prices = {subnet.netuid: subnet.price.tao for subnet in subnets}
+
+    return stake_infos, prices
+
+async def get_free_balance(address, subtensor=None, block_hash=None):
+    """
+    读取单个地址的自由余额（只查询 System.Account 一个存储项）
+
+    Args:
+        address: 钱包 ss58 地址
+        subtensor: 由连接池传入的常驻连接，为空时临时新建
+        block_hash: 指定查询区块，默认使用最新区块
+
+    Returns:
+        Balance: 自由余额
+    """
+    free, _ = await get_account_state(address, subtensor=subtensor, block_hash=block_hash)
+    return free
+
+async def get_account_state(address, subtensor=None, block_hash=None):
+    """
+    读取单个地址的自由余额和已上链的 nonce（同一次 System.Account 查询）
+
+    Returns:
+        tuple: (自由余额 Balance, nonce)
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    result = await subtensor.substrate.query(
+        module='System',
+        storage_function='Account',
+        params=[address],
+        block_hash=block_hash,
+    )
+    account = getattr(result, 'value', result) or {'nonce': 0, 'data': {'free': 0}}
+
+    return bittensor.Balance.from_rao(int(account['data']['free'])), int(account.get('nonce', 0))
+
+async def get_account_next_index(address, subtensor=None):
+    """
+    读取地址的下一个可用 nonce（system_accountNextIndex，包含交易池中待打包的交易）
+
+    直接调用 RPC，不使用 substrate 连接内部的 nonce 缓存（缓存只对单个连接有效）
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    response = await subtensor.substrate.rpc_request('system_accountNextIndex', [address])
+    return int(response['result'])
+
+def _transfer_event_amount(events):
+    """合计回执事件中 Balances.Transfer 的金额（rao），交易内的转账都由签名账户转出"""
+    total = 0
+    for event in events:
+        details = event['event']
+        if details['module_id'] != 'Balances' or details['event_id'] != 'Transfer':
+            continue
+        attributes = details['attributes']
+        total += int(attributes['amount'] if isinstance(attributes, dict) else attributes[2])
+    return total
+
+async def _submit_signed(subtensor, wallet, call, nonce, wait_for_finalization):
+    """
+    签名并提交交易，等待打包进区块
+
+    手续费和转账金额从回执事件中读取，事件在判断是否成功时已经查询，不产生额外的链上请求
+
+    Returns:
+        dict: success, block_hash, error,
+            fee（实际手续费，Balance）, amount（Transfer 事件金额合计，Balance），回执解析失败时为 None
+    """
+    extrinsic = await subtensor.substrate.create_signed_extrinsic(call=call, keypair=wallet.coldkey, nonce=nonce)
+    response = await subtensor.substrate.submit_extrinsic(
+        extrinsic,
+        wait_for_inclusion=True,
+        wait_for_finalization=wait_for_finalization,
     )
 
-    return success
+    result = {'success': await response.is_success, 'block_hash': response.block_hash,
+              'error': None, 'fee': None, 'amount': None}
+    if not result['success']:
+        result['error'] = format_error_message(await response.error_message)
+    try:
+        result['fee'] = bittensor.Balance.from_rao(int(await response.total_fee_amount))
+        result['amount'] = bittensor.Balance.from_rao(_transfer_event_amount(await response.triggered_events))
+    except Exception:
+        # 交易结果已确定，回执解析失败时由调用方读取链上余额
+        result['fee'] = result['amount'] = None
+    return result
+
+async def transfer(wallet, dest, amount, nonce=None, subtensor=None, wait_for_finalization=False):
+    """
+    单笔转账（Balances.transfer_keep_alive），使用调用方分配的 nonce 签名
+
+    异常在函数内捕获并作为失败结果返回，不会触发连接池重试导致重复提交
+
+    Args:
+        wallet: coldkey 已解锁的钱包
+        dest: 目标地址
+        amount: 转账数量（Balance）
+        nonce: 交易 nonce，为空时由节点确定
+        subtensor: 由连接池传入的常驻连接，为空时临时新建
+        wait_for_finalization: 是否等待最终确认（默认只等待打包进区块）
+
+    Returns:
+        dict: success, block_hash（打包区块）, error, fee（手续费）, amount（Transfer 事件金额）
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    try:
+        call = await subtensor.substrate.compose_call(
+            call_module='Balances',
+            call_function='transfer_keep_alive',
+            call_params={'dest': dest, 'value': amount.rao},
+        )
+        return await _submit_signed(subtensor, wallet, call, nonce, wait_for_finalization)
+    except Exception as e:
+        return {'success': False, 'block_hash': None, 'error': str(e), 'fee': None, 'amount': None}
+
+async def batch_transfer(groups, subtensor=None, wait_for_finalization=False):
+    """
+    按转出钱包批量转账：每个转出钱包的所有转账合并为一个 utility.batch_all 交易，各钱包并发提交
+
+    batch_all 是原子的，同一交易内的转账要么全部成功要么全部失败。
+    每组的异常在组内捕获，不会中断其他组，也不会触发连接池重试导致重复提交
+
+    Args:
+        groups: [(wallet, [(目标地址, Balance), ...], nonce), ...]，wallet 的 coldkey 需已解锁，nonce 为空时由节点确定
+        subtensor: 由连接池传入的常驻连接，为空时临时新建
+        wait_for_finalization: 是否等待最终确认（默认只等待打包进区块）
+
+    Returns:
+        list: 与 groups 顺序一致，每组一个 dict:
+            success, block_hash, error, fee, balance_before, balance_after（Balance，读取失败时为 None）
+            balance_after 按 转账前余额 − Transfer 事件金额 − 手续费 计算；读取转账前余额时该钱包还有
+            更早的交易未上链（链上 nonce 与本交易 nonce 不一致）或回执解析失败时，读取打包区块上的余额
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+
+    async def submit(wallet, legs, nonce):
+        address = wallet.coldkeypub.ss58_address
+        result = {'success': False, 'block_hash': None, 'error': None, 'fee': None,
+                  'balance_before': None, 'balance_after': None}
+        try:
+            result['balance_before'], account_nonce = await get_account_state(address, subtensor=subtensor)
+
+            calls = [
+                await subtensor.substrate.compose_call(
+                    call_module='Balances',
+                    call_function='transfer_keep_alive',
+                    call_params={'dest': dest, 'value': amount.rao},
+                )
+                for dest, amount in legs
+            ]
+            call = await subtensor.substrate.compose_call(
+                call_module='Utility',
+                call_function='batch_all',
+                call_params={'calls': calls},
+            )
+            receipt = await _submit_signed(subtensor, wallet, call, nonce, wait_for_finalization)
+            result.update(success=receipt['success'], block_hash=receipt['block_hash'],
+                          error=receipt['error'], fee=receipt['fee'])
+
+            if receipt['fee'] is not None and receipt['amount'] is not None and account_nonce == nonce:
+                # 转账前余额已包含该钱包之前的所有交易；打包失败时没有 Transfer 事件，只扣除手续费
+                result['balance_after'] = result['balance_before'] - receipt['amount'] - receipt['fee']
+            else:
+                try:
+                    result['balance_after'] = await get_free_balance(
+                        address, subtensor=subtensor, block_hash=receipt['block_hash']
+                    )
+                except Exception:
+                    # 交易结果已确定，余额读取失败只留空
+                    pass
+        except Exception as e:
+            result['error'] = str(e)
+        return result
+
+    return await asyncio.gather(*(submit(wallet, legs, nonce) for wallet, legs, nonce in groups))
 
 def remove_stake_extrinsics(wallet, alias, amount, wallet_password):
     wallet.coldkey_file.save_password_to_env(wallet_password)
@@ -36,22 +314,27 @@ def remove_stake_extrinsics(wallet, alias, amount, wallet_password):
 
     success = bittensor.core.extrinsics.unstaking.unstake_extrinsic(
         subtensor=current_app.subtensor,
-        wallet=bittensor.Wallet(name=alias),
+        wallet=wallet,
         amount=amount,
         unstake_all=False
     )
 
     return success
 
-async def remove_stake(wallet, alias, amount, wallet_password):
-    wallet.coldkey_file.save_password_to_env(wallet_password)
-    wallet.unlock_coldkey()
+async def remove_stake(wallet, amount, subtensor=None):
+    """
+    从钱包所有 hotkey 的根网（netuid 0）解质押
 
-    wallet_unstake=bittensor.Wallet(name=alias)
-    subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
+    Args:
+        wallet: coldkey 已解锁的钱包（使用其自身的钱包路径，不再按名称在默认路径下重新加载）
+        amount: 解质押数量
+        subtensor: 链上连接，为空时临时新建
+    """
+    if subtensor is None:
+        subtensor = SubtensorInterface(network=current_app.config['BITTENSOR_NETWORK'])
 
     return await unstake(
-        wallet=wallet_unstake,
+        wallet=wallet,
         subtensor=subtensor,
         hotkey_ss58_address=None,
         all_hotkeys=True,
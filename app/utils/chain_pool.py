@@ -0,0 +1,203 @@
+"""
+链上连接池
+每个 gunicorn worker 进程持有一个后台事件循环线程，循环内维护少量常驻的
+SubtensorInterface 连接，Flask 同步代码通过 run() 桥接调用异步链上查询，
+避免每次请求都重新建立 websocket 连接并解析运行时元数据
+"""
+
+import asyncio
+import os
+import threading
+import time
+from websockets.exceptions import ConnectionClosed
+from bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+from app.errors.custom_errors import BlockchainError
+from app.extensions import logger
+
+# 视为连接失效、需要重连的异常类型
+RECONNECT_EXCEPTIONS = (ConnectionClosed, ConnectionError, OSError, asyncio.TimeoutError)
+
+
+class ChainPool:
+    """SubtensorInterface 连接池（每个进程一个后台事件循环）"""
+
+    def __init__(self, app=None):
+        self.network = None
+        self.size = 2
+        self.idle_timeout = 300
+        self.max_retries = 1
+        self.call_timeout = 120
+
+        self._pid = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # 以下对象只在事件循环线程内访问
+        self._idle = []          # [(subtensor, 上次归还时间)]
+        self._semaphore = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """从应用配置读取连接池参数"""
+        self.network = app.config['BITTENSOR_NETWORK']
+        self.size = app.config.get('CHAIN_POOL_SIZE', self.size)
+        self.idle_timeout = app.config.get('CHAIN_POOL_IDLE_TIMEOUT', self.idle_timeout)
+        self.max_retries = app.config.get('CHAIN_POOL_MAX_RETRIES', self.max_retries)
+        self.call_timeout = app.config.get('CHAIN_POOL_CALL_TIMEOUT', self.call_timeout)
+        app.extensions['chain_pool'] = self
+
+    # =====================
+    # 同步桥接
+    # =====================
+
+    def run(self, func, *args, **kwargs):
+        """
+        在后台事件循环中执行 func(*args, subtensor=<连接>, **kwargs) 并同步等待结果
+
+        Args:
+            func: 接受 subtensor 关键字参数的协程函数
+
+        Returns:
+            协程的返回值
+        """
+        loop = self._ensure_started()
+        # 超时只计算占用连接后的执行时间（在 _call 内），等待空闲连接的时间不计入，
+        # 排队中的调用不会在提交之前就超时失败
+        return asyncio.run_coroutine_threadsafe(self._call(func, args, kwargs), loop).result()
+
+    def shutdown(self):
+        """关闭所有连接并停止事件循环"""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                return
+            loop = self._loop
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout=10)
+            except Exception as e:
+                logger.warning(f"关闭链上连接池时出错: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+            self._pid = None
+
+    def _ensure_started(self):
+        """按进程懒启动事件循环线程（gunicorn --preload fork 之后线程不会被继承）"""
+        pid = os.getpid()
+        if self._loop is not None and self._pid == pid:
+            return self._loop
+
+        with self._lock:
+            if self._loop is not None and self._pid == pid:
+                return self._loop
+
+            if self.network is None:
+                raise BlockchainError("链上连接池未初始化")
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run_loop():
+                asyncio.set_event_loop(loop)
+                self._idle = []
+                self._semaphore = asyncio.Semaphore(self.size)
+                loop.create_task(self._reap_idle())
+                ready.set()
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run_loop, name='chain-pool', daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = pid
+            logger.info(f"链上连接池已启动: pid={pid}, network={self.network}, size={self.size}")
+            return loop
+
+    # =====================
+    # 事件循环内部
+    # =====================
+
+    async def _call(self, func, args, kwargs):
+        """租用连接执行调用，连接失效时丢弃并重连重试"""
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                subtensor = await self._acquire()
+                task = asyncio.ensure_future(func(*args, subtensor=subtensor, **kwargs))
+                try:
+                    done, _ = await asyncio.wait({task}, timeout=self.call_timeout)
+                except BaseException:
+                    # 调用方被取消，连接状态不可信，直接丢弃
+                    task.cancel()
+                    await self._discard(subtensor)
+                    raise
+                if not done:
+                    task.cancel()
+                    await self._discard(subtensor)
+                    raise BlockchainError(f"链上调用超时（{self.call_timeout}秒）")
+
+                try:
+                    result = task.result()
+                except RECONNECT_EXCEPTIONS as e:
+                    await self._discard(subtensor)
+                    if attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    logger.warning(f"链上连接失效，重连后重试 ({attempt}/{self.max_retries}): {e}")
+                    continue
+                except BaseException:
+                    # 调用失败或被取消等情况下连接状态不可信，直接丢弃
+                    await self._discard(subtensor)
+                    raise
+                self._idle.append((subtensor, time.monotonic()))
+                return result
+
+    async def _acquire(self):
+        """取出最近归还的空闲连接，没有则新建"""
+        if self._idle:
+            subtensor, _ = self._idle.pop()
+            return subtensor
+
+        subtensor = SubtensorInterface(network=self.network)
+        try:
+            await subtensor.substrate.initialize()
+        except Exception:
+            await self._discard(subtensor)
+            raise
+        logger.debug(f"新建链上连接: {self.network}")
+        return subtensor
+
+    async def _discard(self, subtensor):
+        """关闭连接，忽略关闭过程中的错误"""
+        try:
+            await subtensor.substrate.close()
+        except Exception as e:
+            logger.debug(f"关闭链上连接时出错: {e}")
+
+    async def _reap_idle(self):
+        """定期关闭空闲超时的连接"""
+        interval = max(1, min(self.idle_timeout, 30))
+        while True:
+            await asyncio.sleep(interval)
+            deadline = time.monotonic() - self.idle_timeout
+            expired = [item for item in self._idle if item[1] < deadline]
+            if not expired:
+                continue
+            self._idle = [item for item in self._idle if item[1] >= deadline]
+            for subtensor, _ in expired:
+                await self._discard(subtensor)
+            logger.debug(f"关闭 {len(expired)} 个空闲链上连接")
+
+    async def _close_all(self):
+        idle, self._idle = self._idle, []
+        for subtensor, _ in idle:
+            await self._discard(subtensor)
+
+
+# 进程级连接池实例
+chain_pool = ChainPool()
@@ -0,0 +1,104 @@
+"""
+已解锁钱包缓存
+解锁 coldkey 要先用 PBKDF2 解密数据库中的钱包密码，再解密 keyfile，两次密钥派生都很耗时。
+每个进程在内存中缓存 coldkey 已解锁的 bittensor.Wallet（按钱包ID，LRU + TTL），
+同一钱包的重复转账、解质押直接复用；钱包密码变化时本进程显式清除，
+其他进程在取用时比对数据库中的加密密码发现变化
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+import bittensor
+from flask import current_app
+from app.extensions import logger
+from app.utils.wallet_crypto import WalletPasswordCrypto
+
+
+class KeypairCache:
+    """已解锁钱包的进程内 LRU 缓存"""
+
+    def __init__(self, app=None):
+        self.ttl = 300
+        self.max_size = 64
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # 钱包ID -> (wallet, 加密密码, 过期时间)
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """从应用配置读取缓存参数（TTL 或容量为 0 时不缓存）"""
+        self.ttl = app.config.get('KEYPAIR_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('KEYPAIR_CACHE_SIZE', self.max_size)
+        app.extensions['keypair_cache'] = self
+
+    def get(self, wallet_info):
+        """
+        获取 coldkey 已解锁的钱包，未命中时解密密码并解锁后放入缓存
+
+        Args:
+            wallet_info: Wallet 模型，需已设置密码
+
+        Returns:
+            bittensor.Wallet: coldkey 已解锁的钱包
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(wallet_info.id)
+            if entry is not None:
+                wallet, encrypted_password, expires_at = entry
+                if expires_at > now and encrypted_password == wallet_info.encrypted_password:
+                    self._entries.move_to_end(wallet_info.id)
+                    return wallet
+                # 过期或密码已变化
+                self._evict(wallet_info.id)
+
+        wallet = self._unlock(wallet_info)
+
+        if self.ttl > 0 and self.max_size > 0:
+            with self._lock:
+                self._evict(wallet_info.id)
+                self._entries[wallet_info.id] = (wallet, wallet_info.encrypted_password, now + self.ttl)
+                while len(self._entries) > self.max_size:
+                    self._evict(next(iter(self._entries)))
+        return wallet
+
+    def purge(self, wallet_id=None):
+        """清除指定钱包（为空时清除全部），钱包密码变化时调用"""
+        with self._lock:
+            if wallet_id is None:
+                for cached_id in list(self._entries):
+                    self._evict(cached_id)
+            else:
+                self._evict(wallet_id)
+
+    def _evict(self, wallet_id):
+        """
+        移除缓存项（调用方持有锁）
+
+        私钥由 bittensor-wallet 的 Rust 对象持有，Python 侧无法直接清零；
+        这里只释放引用，最后一个引用释放后由 Rust 侧在析构时清零
+        """
+        entry = self._entries.pop(wallet_id, None)
+        if entry is not None:
+            logger.debug(f"已解锁钱包 {entry[0].name} 移出缓存")
+
+    @staticmethod
+    def _unlock(wallet_info):
+        """解密钱包密码并解锁 coldkey，密码只在解锁期间放入环境变量"""
+        wallet_password = WalletPasswordCrypto.decrypt_password(wallet_info.encrypted_password, wallet_info.id)
+        wallet = bittensor.Wallet(name=wallet_info.coldkey_name, path=current_app.config['BITTENSOR_WALLET_PATH'])
+
+        wallet.coldkey_file.save_password_to_env(wallet_password)
+        try:
+            wallet.unlock_coldkey()
+        finally:
+            wallet.coldkey_file.remove_password_from_env()
+        return wallet
+
+
+# 进程级缓存实例
+keypair_cache = KeypairCache()
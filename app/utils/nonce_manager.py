@@ -0,0 +1,85 @@
+"""
+按 coldkey 分配交易 nonce
+每个 coldkey 地址的下一个可用 nonce 保存在 Redis 键 nonce:{地址} 中，API 进程和转账 worker
+通过 Lua 脚本原子地领取并递增，同一钱包的多笔交易无需等待上一笔上链即可依次提交，
+不同钱包互不影响。键不存在（首次使用、空闲过期或提交失败后被清除）时从链上
+system_accountNextIndex 重新同步
+"""
+
+# 领取 nonce：ARGV[1] 为链上的下一个 nonce（为空表示不提供），ARGV[2] 为键的过期时间（秒）
+# 键不存在且未提供链上值时返回 nil，由调用方查询链上后再次调用；
+# 两者都有时取较大值，链上已被其他程序（如注册服务）使用的 nonce 不会再分配
+ALLOCATE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    if ARGV[1] == '' then
+        return nil
+    end
+    current = ARGV[1]
+elseif ARGV[1] ~= '' and tonumber(ARGV[1]) > tonumber(current) then
+    current = ARGV[1]
+end
+redis.call('SET', KEYS[1], tonumber(current) + 1, 'EX', tonumber(ARGV[2]))
+return tonumber(current)
+"""
+
+# nonce 已被占用或过期等错误信息片段，出现时说明分配的 nonce 与链上不一致
+STALE_NONCE_ERRORS = ('outdated', 'stale', 'priority is too low')
+
+
+class NonceManager:
+    """基于 Redis 的 coldkey nonce 分配器"""
+
+    def __init__(self, app=None, prefix='nonce'):
+        self.prefix = prefix
+        # 键的过期时间（秒），钱包空闲超过该时间后下次分配重新从链上同步
+        self.ttl = 120
+        self._script = None
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """从应用配置读取过期时间"""
+        self.ttl = app.config.get('NONCE_TTL', self.ttl)
+        app.extensions['nonce_manager'] = self
+
+    def _key(self, address):
+        return f"{self.prefix}:{address}"
+
+    def allocate(self, client, address, fetch_next_index):
+        """
+        领取地址的下一个 nonce
+
+        Args:
+            client: Redis 客户端，为空时返回 None（由链上节点自行确定 nonce）
+            address: coldkey ss58 地址
+            fetch_next_index: 无参函数，返回链上 system_accountNextIndex，仅在需要同步时调用
+
+        Returns:
+            int: 分配的 nonce
+        """
+        if client is None:
+            return None
+        if self._script is None:
+            self._script = client.register_script(ALLOCATE_SCRIPT)
+
+        nonce = self._script(keys=[self._key(address)], args=['', self.ttl])
+        if nonce is None:
+            nonce = self._script(keys=[self._key(address)], args=[int(fetch_next_index()), self.ttl])
+        return int(nonce)
+
+    def reset(self, client, address):
+        """清除地址的 nonce（交易提交失败后调用），下次分配时从链上重新同步"""
+        if client is not None:
+            client.delete(self._key(address))
+
+    @staticmethod
+    def is_stale_nonce_error(error):
+        """判断提交失败是否因为 nonce 已被占用（此时交易未进入交易池，可以换新 nonce 重试）"""
+        message = str(error or '').lower()
+        return any(fragment in message for fragment in STALE_NONCE_ERRORS)
+
+
+# 进程级分配器实例
+nonce_manager = NonceManager()
@@ -0,0 +1,99 @@
+"""
+Redis 后台任务状态
+每个任务的状态保存在 Redis 哈希表 {name}:job:{id} 中，所有 worker 都能查询；
+{name}:active 记录正在运行的任务ID，用于去重：已有任务运行时再次提交直接返回该任务
+"""
+
+import time
+import uuid
+
+# 任务状态
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_SKIPPED = 'skipped'
+STATUS_FAILED = 'failed'
+
+FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_SKIPPED, STATUS_FAILED)
+
+
+class RedisJobs:
+    """基于 Redis 哈希表的任务状态存储"""
+
+    def __init__(self, name, ttl=86400, active_timeout=300):
+        """
+        Args:
+            name: 任务类型名，用于生成 Redis 键
+            ttl: 任务状态保留时间（秒）
+            active_timeout: 运行中标记的过期时间（秒），进程崩溃后过期即可重新提交；任务更新进度时续期
+        """
+        self.name = name
+        self.ttl = ttl
+        self.active_timeout = active_timeout
+        self.active_key = f"{name}:active"
+
+    def _job_key(self, job_id):
+        return f"{self.name}:job:{job_id}"
+
+    def start(self, client, **fields):
+        """
+        创建任务；已有任务在运行时不创建
+
+        Returns:
+            tuple: (任务ID, 是否新建)
+        """
+        job_id = uuid.uuid4().hex
+        if not client.set(self.active_key, job_id, nx=True, ex=self.active_timeout):
+            active_id = client.get(self.active_key)
+            if active_id is not None:
+                return active_id.decode(), False
+            # 运行中的任务恰好结束，重新抢占
+            return self.start(client, **fields)
+
+        now = time.time()
+        state = {'status': STATUS_QUEUED, 'created_at': now, 'updated_at': now}
+        state.update(fields)
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping=state)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.execute()
+        return job_id, True
+
+    def update(self, client, job_id, **fields):
+        """更新任务字段（值不能为 None），并续期运行中标记"""
+        fields['updated_at'] = time.time()
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping=fields)
+        pipe.expire(self.active_key, self.active_timeout)
+        pipe.execute()
+
+    def finish(self, client, job_id, status, **fields):
+        """标记任务结束并释放运行中标记（仅当标记仍属于该任务时）"""
+        now = time.time()
+        fields.update(status=status, finished_at=now, updated_at=now)
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping=fields)
+        pipe.expire(self._job_key(job_id), self.ttl)
+        pipe.execute()
+
+        if client.get(self.active_key) == job_id.encode():
+            client.delete(self.active_key)
+
+    def get(self, client, job_id):
+        """读取任务状态，不存在或已过期时返回 None"""
+        raw = client.hgetall(self._job_key(job_id))
+        if not raw:
+            return None
+        state = {key.decode(): _parse(value.decode()) for key, value in raw.items()}
+        state['id'] = job_id
+        return state
+
+
+def _parse(value):
+    """哈希表中的值都是字符串，数字还原为 int/float"""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            continue
+    return value
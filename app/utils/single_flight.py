@@ -0,0 +1,126 @@
+"""
+跨 worker 单飞执行
+基于 Redis 锁保证同一任务在所有 worker 中同时只有一个在执行：
+- 最近 min_interval 秒内已完成过的任务直接跳过
+- 其他 worker 正在执行时等待其完成，该次执行在本次开始等待之后才开始时直接复用结果（跳过）
+- 等待超时则跳过本次执行
+等待时间和跳过次数记录在 Redis 哈希表中
+"""
+
+import time
+from redis.exceptions import LockError
+from app.extensions import logger
+
+
+class SingleFlight:
+    """Redis 锁单飞执行器"""
+
+    def __init__(self, name, min_interval=5, lock_timeout=300, wait_timeout=30):
+        """
+        Args:
+            name: 任务名，用于生成 Redis 键
+            min_interval: 距上次完成不足该秒数时跳过
+            lock_timeout: 锁的过期时间（秒），防止持锁进程崩溃后死锁
+            wait_timeout: 等待其他 worker 完成的最长时间（秒）
+        """
+        self.name = name
+        self.min_interval = min_interval
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.lock_key = f"{name}:lock"
+        self.last_key = f"{name}:last_finished"
+        self.last_started_key = f"{name}:last_started"
+        self.stats_key = f"{name}:stats"
+
+    def run(self, client, func, force=False):
+        """
+        单飞执行 func
+
+        Args:
+            client: Redis 客户端，为空或不可用时直接执行（不加锁）
+            func: 要执行的函数
+            force: 为True时不因最近完成过而跳过（仍然串行执行）
+
+        Returns:
+            str: 'ran' | 'ran_unlocked' | 'skipped_recent' | 'skipped_waited' | 'skipped_timeout'
+        """
+        if client is None:
+            func()
+            return 'ran_unlocked'
+
+        try:
+            if not force and self._finished_within(client, self.min_interval):
+                self._incr(client, 'skipped_recent')
+                return 'skipped_recent'
+
+            lock = client.lock(self.lock_key, timeout=self.lock_timeout, blocking_timeout=self.wait_timeout)
+            wait_started = time.time()
+            acquired = lock.acquire()
+        except Exception as e:
+            logger.warning(f"{self.name} 获取 Redis 锁失败，直接执行: {e}")
+            func()
+            return 'ran_unlocked'
+
+        wait_ms = int((time.time() - wait_started) * 1000)
+        self._record_wait(client, wait_ms)
+
+        if not acquired:
+            self._incr(client, 'skipped_timeout')
+            logger.warning(f"{self.name} 等待其他 worker 超时（{self.wait_timeout} 秒），跳过本次执行")
+            return 'skipped_timeout'
+
+        try:
+            # 等待期间其他 worker 开始并完成了一次执行，直接复用其结果；
+            # 开始等待之前就已开始的执行可能没有看到调用方要处理的变化，需要重新执行
+            if not force and wait_ms and self._started_since(client, wait_started):
+                self._incr(client, 'skipped_waited')
+                return 'skipped_waited'
+
+            started = time.time()
+            func()
+            # 开始和完成时间一起写入，last_started 始终对应最近一次完成的执行
+            client.mset({self.last_started_key: started, self.last_key: time.time()})
+            self._incr(client, 'runs')
+            self._incr(client, 'run_ms_total', int((time.time() - started) * 1000))
+            return 'ran'
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # 执行时间超过锁过期时间，锁已被释放
+                logger.warning(f"{self.name} 执行时间超过锁过期时间（{self.lock_timeout} 秒）")
+
+    def get_stats(self, client):
+        """获取执行统计"""
+        stats = {key.decode(): int(value) for key, value in client.hgetall(self.stats_key).items()}
+        last_finished = client.get(self.last_key)
+        stats['last_finished'] = float(last_finished) if last_finished else None
+        return stats
+
+    def _finished_within(self, client, seconds):
+        last_finished = client.get(self.last_key)
+        return last_finished is not None and time.time() - float(last_finished) < seconds
+
+    def _started_since(self, client, timestamp):
+        last_started = client.get(self.last_started_key)
+        return last_started is not None and float(last_started) >= timestamp
+
+    def _record_wait(self, client, wait_ms):
+        # 统计写入失败不能影响已获取的锁
+        try:
+            pipe = client.pipeline()
+            pipe.hincrby(self.stats_key, 'lock_acquire_attempts', 1)
+            pipe.hincrby(self.stats_key, 'lock_wait_ms_total', wait_ms)
+            pipe.execute()
+            # 最大等待时间（非原子比较，仅用于观测）
+            current_max = client.hget(self.stats_key, 'lock_wait_ms_max')
+            if current_max is None or wait_ms > int(current_max):
+                client.hset(self.stats_key, 'lock_wait_ms_max', wait_ms)
+        except Exception as e:
+            logger.debug(f"{self.name} 统计写入失败: {e}")
+
+    def _incr(self, client, field, amount=1):
+        try:
+            client.hincrby(self.stats_key, field, amount)
+        except Exception as e:
+            logger.debug(f"{self.name} 统计写入失败: {e}")
@@ -0,0 +1,61 @@
+"""
+质押明细聚合
+将 StakeInfo 列表聚合为 coldkey×netuid 和 hotkey×netuid 矩阵（alpha 数量及按子网价格折算的 TAO）
+"""
+
+import numpy as np
+
+RAO_PER_TAO = 10 ** 9
+
+
+def aggregate_stakes(coldkeys, stake_infos, prices):
+    """
+    聚合质押明细
+
+    Args:
+        coldkeys: coldkey 地址列表（决定矩阵行顺序）
+        stake_infos: {coldkey: [StakeInfo]}
+        prices: {netuid: 价格（TAO/alpha）}
+
+    Returns:
+        dict: netuids, prices, hotkeys,
+              coldkey_alpha / coldkey_tao（len(coldkeys) × len(netuids)），
+              hotkey_alpha / hotkey_tao（len(hotkeys) × len(netuids)）
+    """
+    coldkey_index = {coldkey: i for i, coldkey in enumerate(coldkeys)}
+
+    # 展开为平铺数组
+    rows, hotkey_names, netuid_values, alpha_rao = [], [], [], []
+    for coldkey, infos in stake_infos.items():
+        row = coldkey_index.get(coldkey)
+        if row is None:
+            continue
+        for info in infos or ():
+            if not info.stake.rao:
+                continue
+            rows.append(row)
+            hotkey_names.append(info.hotkey_ss58)
+            netuid_values.append(info.netuid)
+            alpha_rao.append(info.stake.rao)
+
+    netuids, netuid_cols = np.unique(np.asarray(netuid_values, dtype=np.int64), return_inverse=True)
+    hotkeys, hotkey_rows = np.unique(np.asarray(hotkey_names, dtype=object), return_inverse=True)
+    rows = np.asarray(rows, dtype=np.int64)
+    alpha = np.asarray(alpha_rao, dtype=np.float64) / RAO_PER_TAO
+
+    price_vector = np.array([prices.get(int(netuid), 0.0) for netuid in netuids], dtype=np.float64)
+
+    coldkey_alpha = np.zeros((len(coldkeys), len(netuids)), dtype=np.float64)
+    hotkey_alpha = np.zeros((len(hotkeys), len(netuids)), dtype=np.float64)
+    np.add.at(coldkey_alpha, (rows, netuid_cols), alpha)
+    np.add.at(hotkey_alpha, (hotkey_rows, netuid_cols), alpha)
+
+    return {
+        'netuids': netuids.tolist(),
+        'prices': price_vector.tolist(),
+        'hotkeys': hotkeys.tolist(),
+        'coldkey_alpha': coldkey_alpha.tolist(),
+        'coldkey_tao': (coldkey_alpha * price_vector).tolist(),
+        'hotkey_alpha': hotkey_alpha.tolist(),
+        'hotkey_tao': (hotkey_alpha * price_vector).tolist(),
+    }
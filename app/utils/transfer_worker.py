@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转账任务执行后台服务程序
+从 transfer_jobs 表领取排队中的转账任务并执行，结果写入转账记录。
+多个线程并发执行，nonce 由分配器按 coldkey 分配，同一转出钱包的多笔转账也可以连续提交；
+每个线程在转账上链前一直占用一个链上连接，本进程的链上连接池至少扩大到并发数；
+TRANSFER_WORKER_SERIALIZE_WALLETS=true 时同一转出钱包的任务串行执行。
+每台主机只运行一个进程，并发度通过 TRANSFER_WORKER_CONCURRENCY 调整
+"""
+
+import os
+import sys
+import time
+import socket
+import signal
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Any
+from dotenv import load_dotenv
+
+from sqlalchemy.exc import OperationalError, InterfaceError, DatabaseError
+
+# 添加项目路径到sys.path
+project_root = os.path.dirname(os.path.abspath(__file__))
+console_root = os.path.dirname(os.path.dirname(project_root))  # 向上两级到项目根目录
+sys.path.insert(0, console_root)
+
+# 加载环境变量
+load_dotenv(os.path.join(console_root, '.env'))
+
+from app import create_app
+from app.extensions import db
+from app.models import TransferJob
+from app.utils.chain_pool import chain_pool
+from app.blueprints.wallet.services import TransferJobService
+
+# worker 配置
+TRANSFER_WORKER_CONCURRENCY = int(os.getenv('TRANSFER_WORKER_CONCURRENCY', '4'))        # 并发执行的任务数
+TRANSFER_WORKER_POLL_INTERVAL = float(os.getenv('TRANSFER_WORKER_POLL_INTERVAL', '1'))   # 没有任务时的轮询间隔（秒）
+TRANSFER_WORKER_SERIALIZE_WALLETS = os.getenv('TRANSFER_WORKER_SERIALIZE_WALLETS', 'false').lower() == 'true'  # 同一钱包的任务是否串行
+
+# 配置日志
+log_dir = 'logs'
+if not os.path.exists(log_dir):
+    os.makedirs(log_dir)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(log_dir, 'transfer_worker.log'))
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+class TransferWorkerService:
+    """
+    转账任务执行服务
+    """
+
+    def __init__(self, app, concurrency: int = 4, poll_interval: float = 1, serialize_wallets: bool = False):
+        """
+        初始化执行服务
+
+        Args:
+            app: Flask 应用
+            concurrency: 执行线程数
+            poll_interval: 没有任务时的轮询间隔（秒）
+            serialize_wallets: 同一转出钱包的任务是否串行执行
+        """
+        self.app = app
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.serialize_wallets = serialize_wallets
+        self.worker_prefix = f"{socket.gethostname()}:"
+        self.running = False
+        self.threads = []
+        # 本进程正在执行的转出钱包 -> 任务数
+        self.active_wallets = Counter()
+        self.lock = threading.Lock()
+        self.succeeded_count = 0
+        self.failed_count = 0
+
+    def start(self):
+        """
+        启动执行服务
+        """
+        if self.running:
+            logger.warning("转账任务执行服务已经在运行中")
+            return
+
+        # 上次运行时未执行完的任务无法确认链上结果，标记为中断，不自动重试
+        with self.app.app_context():
+            interrupted = TransferJob.mark_interrupted(self.worker_prefix)
+        if interrupted:
+            logger.warning(f"{interrupted} 个转账任务在上次运行中被中断，请人工核对")
+
+        # 连接池在首次链上调用时才创建，启动线程前调整大小即可生效
+        if chain_pool.size < self.concurrency:
+            logger.info(f"链上连接池大小 {chain_pool.size} 小于并发数，扩大到 {self.concurrency}")
+            chain_pool.size = self.concurrency
+
+        self.running = True
+        for n in range(self.concurrency):
+            worker_id = f"{self.worker_prefix}{os.getpid()}:{n}"
+            thread = threading.Thread(target=self._run_worker, args=(worker_id,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"转账任务执行服务已启动，并发数: {self.concurrency}，同一钱包串行: {self.serialize_wallets}")
+
+    def stop(self):
+        """
+        停止执行服务（等待正在执行的转账完成）
+        """
+        if not self.running:
+            logger.warning("转账任务执行服务未在运行")
+            return
+
+        self.running = False
+        for thread in self.threads:
+            if thread.is_alive():
+                thread.join(timeout=60)
+        logger.info("转账任务执行服务已停止")
+
+    def _run_worker(self, worker_id):
+        """
+        执行线程主循环：领取任务 -> 执行 -> 继续领取，没有任务时等待
+        """
+        while self.running:
+            try:
+                with self.app.app_context():
+                    executed = self._execute_next(worker_id)
+            except (OperationalError, InterfaceError, DatabaseError) as e:
+                logger.error(f"数据库连接异常，程序即将退出: {e}")
+                logger.error("等待外部管理程序重启...")
+                os._exit(1)
+            except Exception as e:
+                logger.error(f"[{worker_id}] 执行转账任务时出错: {e}")
+                executed = False
+
+            if not executed:
+                time.sleep(self.poll_interval)
+
+    def _execute_next(self, worker_id):
+        """
+        领取并执行一个任务
+
+        Returns:
+            bool: 是否执行了任务
+        """
+        try:
+            with self.lock:
+                job = TransferJob.claim_next(
+                    worker_id,
+                    exclude_wallets=set(self.active_wallets) if self.serialize_wallets else (),
+                    serialize_wallets=self.serialize_wallets
+                )
+                if job is None:
+                    return False
+                self.active_wallets[job.from_wallet_name] += 1
+
+            try:
+                logger.info(f"[{worker_id}] 开始执行转账任务 {job.id}: "
+                            f"{job.from_wallet_name} -> {job.to_wallet_address} ({job.amount} TAO)")
+                if TransferJobService.execute(job):
+                    self.succeeded_count += 1
+                else:
+                    self.failed_count += 1
+            finally:
+                with self.lock:
+                    self.active_wallets[job.from_wallet_name] -= 1
+                    if not self.active_wallets[job.from_wallet_name]:
+                        del self.active_wallets[job.from_wallet_name]
+            return True
+        finally:
+            db.session.remove()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+
+        Returns:
+            服务状态信息
+        """
+        return {
+            'running': self.running,
+            'concurrency': self.concurrency,
+            'serialize_wallets': self.serialize_wallets,
+            'active_wallets': dict(self.active_wallets),
+            'succeeded_count': self.succeeded_count,
+            'failed_count': self.failed_count,
+            'threads_alive': sum(1 for thread in self.threads if thread.is_alive())
+        }
+
+
+service = None
+
+def signal_handler(signum, frame):
+    """
+    信号处理器，用于优雅关闭服务
+    """
+    logger.info(f"接收到信号 {signum}，准备关闭服务...")
+    global service
+    if service:
+        service.stop()
+    sys.exit(0)
+
+def main():
+    """
+    主函数
+    """
+    logger.info("转账任务执行服务启动中...")
+
+    # 注册信号处理器
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # 创建并启动执行服务
+    global service
+    service = TransferWorkerService(
+        app=create_app(),
+        concurrency=TRANSFER_WORKER_CONCURRENCY,
+        poll_interval=TRANSFER_WORKER_POLL_INTERVAL,
+        serialize_wallets=TRANSFER_WORKER_SERIALIZE_WALLETS
+    )
+    service.start()
+
+    try:
+        # 保持主线程运行
+        while service.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("接收到键盘中断，关闭服务...")
+    finally:
+        if service.running:
+            service.stop()
+        logger.info("转账任务执行服务已关闭")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,30 @@
 import os
 import json
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import select
+from app.extensions import db
 from app.models.wallet import Wallet
 from app.models.miners import Miners
 
+# Rows per INSERT statement (keeps bound parameters below driver limits)
+BULK_INSERT_BATCH_SIZE = 500
+
+# Threads used to scan wallet folders for hotkeys
+HOTKEY_SCAN_WORKERS = 16
+
+# Wallets between progress callbacks in scan_wallet_changes
+PROGRESS_EVERY = 100
+
+# Pending rows that trigger a flush in sync_wallet_changes (bounds memory during sync)
+SYNC_BATCH_ROWS = 2000
+
 class Wallet_data:
+    __slots__ = ('coldkey_name', 'coldkey_address')
+
     def __init__(self, coldkey_name, coldkey_address):
         self.coldkey_name = coldkey_name
         self.coldkey_address = coldkey_address
@@ -12,6 +33,8 @@ class Wallet_data:
         return f"Wallet(coldkey_name='{self.coldkey_name}', coldkey_address='{self.coldkey_address}')"
 
 class Hotkey_data:
+    __slots__ = ('wallet_name', 'hotkey_name', 'hotkey_address')
+
     def __init__(self, wallet_name, hotkey_name, hotkey_address):
         self.wallet_name = wallet_name
         self.hotkey_name = hotkey_name
@@ -22,135 +45,496 @@ class Hotkey_data:
 
 def get_coldkey_wallets_for_path(path: str):
     """Get all coldkey wallet names and addresses from path."""
-    wallets = []
+    return list(iter_coldkey_wallets_for_path(path))
+
+def iter_coldkey_wallets_for_path(path: str):
+    """Stream Wallet_data for every wallet folder with a readable coldkeypub.txt."""
     try:
-        # Walk through the directory
         path = os.path.expanduser(path)
-
-        for folder_name in os.listdir(path):
-            folder_path = os.path.join(path, folder_name)
-            # Check if it is a directory (wallet folder)
-            if os.path.isdir(folder_path):
-                coldkeypub_file = os.path.join(folder_path, 'coldkeypub.txt')
-                if os.path.isfile(coldkeypub_file):
-                    with open(coldkeypub_file, 'r') as file:
-                        # Read and parse the coldkeypub.txt content
-                        data = json.load(file)
-                        coldkey_name = folder_name
-                        coldkey_address = data.get('ss58Address', '')
-                        wallets.append(Wallet_data(coldkey_name, coldkey_address))
-    except Exception as e:
+        entries = os.scandir(path)
+    except OSError as e:
         print(f"Read Wallets Error: {e}")
+        return
 
-    return wallets
+    with entries:
+        for entry in entries:
+            # Check if it is a directory (wallet folder)
+            if not entry.is_dir():
+                continue
+            coldkeypub_file = os.path.join(entry.path, 'coldkeypub.txt')
+            if not os.path.isfile(coldkeypub_file):
+                continue
+            try:
+                coldkey_address = _read_ss58(coldkeypub_file)
+            except (ValueError, OSError) as e:
+                print(f"Error reading coldkeypub file {coldkeypub_file}: {e}")
+                continue
+            yield Wallet_data(entry.name, coldkey_address)
 
 def insert_wallets_to_db(wallets):
-    """Insert wallets into the database, checking if they already exist."""
-    for wallet in wallets:
-        # Check if the wallet already exists in the database
-        existing_wallet = Wallet.find_by_name(wallet.coldkey_name)
+    """Bulk insert wallets that are not in the database yet.
+
+    wallets may be any iterable; it is consumed in BULK_INSERT_BATCH_SIZE
+    chunks, each checked against the database with one IN query and written
+    with INSERT ... ON CONFLICT DO NOTHING, all in a single transaction.
+    Returns the number of newly inserted wallets.
+    """
+    inserted = 0
+    try:
+        for batch in _batches(wallets, BULK_INSERT_BATCH_SIZE):
+            names = {wallet.coldkey_name for wallet in batch}
+            existing_names = set(db.session.execute(
+                select(Wallet.coldkey_name).where(Wallet.coldkey_name.in_(names))
+            ).scalars())
 
-        if existing_wallet:
-            continue  # Skip if the wallet already exists
+            rows = {}
+            for wallet in batch:
+                if wallet.coldkey_name in existing_names or wallet.coldkey_name in rows:
+                    continue  # Skip if the wallet already exists
+                rows[wallet.coldkey_name] = {
+                    'coldkey_name': wallet.coldkey_name,
+                    'coldkey_address': wallet.coldkey_address
+                }
+            inserted += _insert_ignore(Wallet.__table__, list(rows.values()))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
 
-        # Insert new wallet into the database
-        Wallet.create(
-            coldkey_name=wallet.coldkey_name,
-            coldkey_address=wallet.coldkey_address
-        )
+    return inserted
 
-def get_hotkey_wallets_for_path(path: str):
+def get_hotkey_wallets_for_path(path: str, workers: int = None):
     """Get all hotkey information from wallet path."""
+    return list(iter_hotkey_wallets_for_path(path, workers))
+
+def iter_hotkey_wallets_for_path(path: str, workers: int = None):
+    """Stream Hotkey_data for every wallet folder under path.
+
+    Wallet folders are scanned in a thread pool (the work is dominated by
+    file opens), with a bounded number of folders in flight so results are
+    yielded in folder order without buffering the whole tree.
+    """
+    workers = workers or HOTKEY_SCAN_WORKERS
+    try:
+        path = os.path.expanduser(path)
+        with os.scandir(path) as entries:
+            wallet_dirs = [(entry.name, entry.path) for entry in entries if entry.is_dir()]
+    except OSError as e:
+        print(f"Read Hotkeys Error: {e}")
+        return
+
+    for hotkeys in _map_ordered(_scan_hotkeys_dir, wallet_dirs, workers):
+        yield from hotkeys
+
+def _map_ordered(func, args_iterable, workers):
+    """Call func(*args) for each args tuple in a thread pool, yielding results in order.
+
+    At most workers * 2 calls are in flight, so results stream out without
+    buffering the whole input.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in args_iterable:
+            pending.append(executor.submit(func, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _scan_hotkeys_dir(wallet_name, wallet_path):
+    """Scan one wallet's hotkeys folder in a single directory pass.
+
+    pub.txt files are preferred; a private key file is only opened when its
+    hotkey has no usable pub.txt.
+    """
+    hotkeys_path = os.path.join(wallet_path, 'hotkeys')
+    pub_entries = []
+    private_entries = []
+    try:
+        with os.scandir(hotkeys_path) as entries:
+            for entry in entries:
+                # DirEntry.is_file uses the d_type from the directory listing, no extra stat
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith('pub.txt'):
+                    pub_entries.append(entry)
+                else:
+                    private_entries.append(entry)
+    except OSError:
+        return []
+
     hotkeys = []
+    processed_hotkeys = set()
+    for entry in pub_entries:
+        try:
+            hotkey_address = _read_ss58(entry.path)
+        except (ValueError, OSError) as e:
+            print(f"Error reading pub file {entry.path}: {e}")
+            continue
+        if hotkey_address:
+            hotkey_name = entry.name[:-7]  # Remove 'pub.txt' suffix
+            hotkeys.append(Hotkey_data(
+                wallet_name=wallet_name,
+                hotkey_name=hotkey_name,
+                hotkey_address=hotkey_address
+            ))
+            processed_hotkeys.add(hotkey_name)
+
+    for entry in private_entries:
+        if entry.name in processed_hotkeys:
+            continue
+        try:
+            # Try to read as JSON (private key file format)
+            hotkey_address = _read_ss58(entry.path)
+        except (ValueError, OSError) as e:
+            # Skip files that are not JSON format or can't be read
+            print(f"Skipping non-JSON file {entry.path}: {e}")
+            continue
+        if hotkey_address:
+            hotkeys.append(Hotkey_data(
+                wallet_name=wallet_name,
+                hotkey_name=entry.name,  # Use filename as hotkey name
+                hotkey_address=hotkey_address
+            ))
+
+    return hotkeys
+
+def _file_signature(st):
+    """File signature used by the manifest: [mtime_ns, size, inode]."""
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+def _read_ss58(file_path):
+    """Read the ss58Address field from a JSON key file."""
+    # Read raw bytes in one call; json.loads decodes UTF-8 itself
+    with open(file_path, 'rb') as file:
+        return json.loads(file.read()).get('ss58Address', '')
+
+def scan_wallet_changes(path: str, manifest, force=False, progress=None):
+    """Scan the wallet tree incrementally against a WalletManifest.
+
+    Collects the output of iter_wallet_changes into lists. If progress is
+    given it is called with the scan counters every PROGRESS_EVERY wallets
+    and once at the end.
+
+    Returns (changed_wallets, changed_hotkeys).
+    """
+    counters = _new_counters()
+    changed_wallets = []
+    changed_hotkeys = []
+    for wallet, hotkeys in iter_wallet_changes(path, manifest, force, counters):
+        if wallet:
+            changed_wallets.append(wallet)
+        changed_hotkeys.extend(hotkeys)
+        if progress and counters['wallets_scanned'] % PROGRESS_EVERY == 0:
+            progress(dict(counters))
+
+    if progress:
+        progress(dict(counters))
+    return changed_wallets, changed_hotkeys
+
+def iter_wallet_changes(path: str, manifest, force=False, counters=None):
+    """Stream the changes of each wallet folder against a WalletManifest.
+
+    Only files whose (mtime, size, inode) differ from the manifest are opened,
+    and a hotkeys directory whose mtime is unchanged is skipped entirely, so a
+    no-op scan costs two stats per wallet. Files rewritten in place without
+    touching their directory are only picked up by a forced scan.
+
+    Forced scans and the first scan against an empty manifest parse every
+    file, so their wallet folders are scanned in a thread pool of
+    HOTKEY_SCAN_WORKERS; incremental scans stay sequential.
+
+    Yields (Wallet_data or None, [Hotkey_data, ...]) per wallet folder. The
+    manifest only forgets removed folders once the generator is exhausted.
+    counters, if given, is updated in place (see _new_counters).
+    """
+    full_scan = force or not manifest.wallets
+    if force:
+        manifest.reset()
+    if counters is None:
+        counters = _new_counters()
+
+    seen = set()
     try:
-        # Walk through the directory
         path = os.path.expanduser(path)
+        entries = os.scandir(path)
+    except OSError as e:
+        print(f"Read Wallets Error: {e}")
+        return
 
-        for wallet_folder in os.listdir(path):
-            wallet_path = os.path.join(path, wallet_folder)
-            # Check if it is a directory (wallet folder)
-            if not os.path.isdir(wallet_path):
+    def wallet_folders():
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            seen.add(entry.name)
+
+            state = manifest.wallets.get(entry.name)
+            if state is None:
+                state = manifest.wallets[entry.name] = {'coldkey': None, 'hotkeys_mtime': None, 'hotkeys': {}}
+                manifest.dirty = True
+            yield entry.name, entry.path, state, manifest
+
+    with entries:
+        if full_scan:
+            results = _map_ordered(_scan_wallet_folder, wallet_folders(), HOTKEY_SCAN_WORKERS)
+        else:
+            results = (_scan_wallet_folder(*folder) for folder in wallet_folders())
+
+        for wallet, hotkeys, folder_counters in results:
+            for key, value in folder_counters.items():
+                counters[key] += value
+            counters['wallets_scanned'] += 1
+            counters['wallets_found'] += 1 if wallet else 0
+            counters['hotkeys_found'] += len(hotkeys)
+            yield wallet, hotkeys
+
+    # Forget wallet folders that no longer exist
+    for name in set(manifest.wallets) - seen:
+        del manifest.wallets[name]
+        manifest.dirty = True
+
+def sync_wallet_changes(path: str, manifest, force=False, progress=None, batch_rows=SYNC_BATCH_ROWS):
+    """Stream wallet changes into the database: scan -> parse -> batch -> bulk insert.
+
+    Changes are buffered until batch_rows wallets/hotkeys are pending, then the
+    batch's wallets are inserted before its hotkeys (hotkeys only reference
+    wallets of the same folder), so memory stays flat however many hotkeys are
+    on disk. Each batch commits on its own; a failure leaves earlier batches in
+    place, and re-inserting them on the next sync is a no-op.
+
+    progress, if given, is called with the counters after every batch.
+
+    Returns the counters dict (wallets_scanned, files_scanned, files_parsed,
+    file_errors, wallets_found, hotkeys_found, wallets_inserted, hotkeys_inserted).
+    """
+    counters = _new_counters()
+    wallets, hotkeys = [], []
+
+    def flush():
+        skipped_wallets = set()
+        counters['wallets_inserted'] += insert_wallets_to_db(wallets)
+        counters['hotkeys_inserted'] += insert_hotkeys_to_db(hotkeys, skipped_wallets)
+        # Hotkeys of wallets without a row were not inserted; rescan them next sync
+        for wallet_name in skipped_wallets:
+            manifest.forget_hotkeys(wallet_name)
+        wallets.clear()
+        hotkeys.clear()
+        if progress:
+            progress(dict(counters))
+
+    for wallet, wallet_hotkeys in iter_wallet_changes(path, manifest, force, counters):
+        if wallet:
+            wallets.append(wallet)
+        hotkeys.extend(wallet_hotkeys)
+        if len(wallets) + len(hotkeys) >= batch_rows:
+            flush()
+    flush()
+
+    return counters
+
+def _new_counters():
+    return {
+        'wallets_scanned': 0, 'files_scanned': 0, 'files_parsed': 0, 'file_errors': 0,
+        'wallets_found': 0, 'hotkeys_found': 0, 'wallets_inserted': 0, 'hotkeys_inserted': 0,
+    }
+
+def _batches(iterable, size):
+    """Yield lists of up to size items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _scan_wallet_folder(wallet_name, wallet_path, state, manifest):
+    """Scan one wallet folder against its manifest state.
+
+    Only this folder's state is modified, so folders can be scanned in
+    parallel. Returns (Wallet_data or None, [Hotkey_data, ...], counters).
+    """
+    counters = _new_counters()
+    wallet = _scan_coldkey_changes(wallet_path, wallet_name, state, manifest, counters)
+    hotkeys = _scan_hotkey_changes(wallet_path, wallet_name, state, manifest, counters)
+    return wallet, hotkeys, counters
+
+def _scan_coldkey_changes(wallet_path, wallet_name, state, manifest, counters):
+    """Return Wallet_data if coldkeypub.txt is new or changed, else None."""
+    coldkeypub_file = os.path.join(wallet_path, 'coldkeypub.txt')
+    try:
+        st = os.stat(coldkeypub_file)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        if state['coldkey'] is not None:
+            state['coldkey'] = None
+            manifest.dirty = True
+        return None
+
+    counters['files_scanned'] += 1
+    signature = _file_signature(st)
+    cached = state['coldkey']
+    if cached and cached[:3] == signature:
+        return None
+
+    manifest.dirty = True
+    counters['files_parsed'] += 1
+    try:
+        address = _read_ss58(coldkeypub_file)
+    except (ValueError, OSError) as e:
+        # Remember the broken file so it is not re-parsed until it changes
+        print(f"Error reading coldkeypub file {coldkeypub_file}: {e}")
+        counters['file_errors'] += 1
+        state['coldkey'] = signature + [None]
+        return None
+
+    state['coldkey'] = signature + [address]
+    return Wallet_data(wallet_name, address)
+
+def _scan_hotkey_changes(wallet_path, wallet_name, state, manifest, counters):
+    """Return Hotkey_data for new or changed hotkey files of one wallet."""
+    hotkeys_path = os.path.join(wallet_path, 'hotkeys')
+    try:
+        st = os.stat(hotkeys_path)
+    except OSError:
+        st = None
+    # Hotkeys can only be inserted once the wallet has a coldkey, so don't
+    # record them before that or they would never be picked up again
+    if st is None or not stat.S_ISDIR(st.st_mode) or not (state['coldkey'] and state['coldkey'][3]):
+        manifest.forget_hotkeys(wallet_name)
+        return []
+
+    # Directory listing unchanged since the last sync
+    if st.st_mtime_ns == state['hotkeys_mtime']:
+        return []
+
+    cached_files = state['hotkeys']
+    files = {}
+    changed = []
+    with os.scandir(hotkeys_path) as entries:
+        for item in entries:
+            if not item.is_file():
+                continue
+            try:
+                signature = _file_signature(item.stat())
+            except OSError:
                 continue
 
-            # Check if hotkeys directory exists
-            hotkeys_path = os.path.join(wallet_path, 'hotkeys')
-            if not os.path.exists(hotkeys_path) or not os.path.isdir(hotkeys_path):
+            counters['files_scanned'] += 1
+            cached = cached_files.get(item.name)
+            if cached and cached[:3] == signature:
+                files[item.name] = cached
                 continue
 
-            # Get all files in hotkeys directory
-            hotkey_files = os.listdir(hotkeys_path)
-            processed_hotkeys = set()  # Track processed hotkey names to avoid duplicates
-
-            # First pass: process pub.txt files (preferred)
-            for item in hotkey_files:
-                if item.endswith('pub.txt'):
-                    hotkey_name = item[:-7]  # Remove 'pub.txt' suffix
-                    hotkeypub_file = os.path.join(hotkeys_path, item)
-
-                    if os.path.isfile(hotkeypub_file):
-                        try:
-                            with open(hotkeypub_file, 'r') as file:
-                                # Read and parse the hotkeypub.txt content
-                                data = json.load(file)
-                                hotkey_address = data.get('ss58Address', '')
-                                if hotkey_address:
-                                    hotkeys.append(Hotkey_data(
-                                        wallet_name=wallet_folder,
-                                        hotkey_name=hotkey_name,
-                                        hotkey_address=hotkey_address
-                                    ))
-                                    processed_hotkeys.add(hotkey_name)
-                        except (json.JSONDecodeError, IOError) as e:
-                            print(f"Error reading pub file {hotkeypub_file}: {e}")
-
-            # Second pass: process private key files that don't have corresponding pub files
-            for item in hotkey_files:
-                # Skip pub.txt files and files we've already processed
-                if item.endswith('pub.txt') or item in processed_hotkeys:
-                    continue
+            hotkey_name = item.name[:-7] if item.name.endswith('pub.txt') else item.name
+            counters['files_parsed'] += 1
+            try:
+                address = _read_ss58(item.path)
+            except (ValueError, OSError) as e:
+                # Skip files that are not JSON format or can't be read
+                print(f"Skipping non-JSON file {item.path}: {e}")
+                counters['file_errors'] += 1
+                address = ''
+            files[item.name] = signature + [hotkey_name, address]
+            changed.append(item.name)
 
-                hotkey_file = os.path.join(hotkeys_path, item)
-                if os.path.isfile(hotkey_file):
-                    try:
-                        with open(hotkey_file, 'r') as file:
-                            # Try to read as JSON (private key file format)
-                            data = json.load(file)
-                            hotkey_address = data.get('ss58Address', '')
-                            if hotkey_address:
-                                hotkeys.append(Hotkey_data(
-                                    wallet_name=wallet_folder,
-                                    hotkey_name=item,  # Use filename as hotkey name
-                                    hotkey_address=hotkey_address
-                                ))
-                                processed_hotkeys.add(item)
-                    except (json.JSONDecodeError, IOError) as e:
-                        # Skip files that are not JSON format or can't be read
-                        print(f"Skipping non-JSON file {hotkey_file}: {e}")
-                        continue
-
-    except Exception as e:
-        print(f"Read Hotkeys Error: {e}")
+    state['hotkeys'] = files
+    state['hotkeys_mtime'] = st.st_mtime_ns
+    manifest.dirty = True
 
+    # Same rule as the full scan: pub.txt files win over private key files of the same name
+    pub_names = {entry[3] for name, entry in files.items() if name.endswith('pub.txt') and entry[4]}
+    hotkeys = []
+    for name in changed:
+        _, _, _, hotkey_name, address = files[name]
+        if not address:
+            continue
+        if not name.endswith('pub.txt') and name in pub_names:
+            continue
+        hotkeys.append(Hotkey_data(
+            wallet_name=wallet_name,
+            hotkey_name=hotkey_name,
+            hotkey_address=address
+        ))
     return hotkeys
 
-def insert_hotkeys_to_db(hotkeys):
-    """Insert hotkeys into miners table, checking if they already exist."""
-    for hotkey in hotkeys:
-        # Find corresponding wallet record
-        wallet = Wallet.find_by_name(hotkey.wallet_name)
-        if not wallet:
-            print(f"Warning: Wallet '{hotkey.wallet_name}' not found in database, skipping hotkey '{hotkey.hotkey_name}'")
-            continue
+def insert_hotkeys_to_db(hotkeys, skipped_wallets=None):
+    """Bulk insert hotkeys into the miners table.
+
+    hotkeys may be any iterable; it is consumed in BULK_INSERT_BATCH_SIZE
+    chunks. Each chunk loads its wallet ids and existing hotkeys with one IN
+    query each and is written with INSERT ... ON CONFLICT DO NOTHING, all in
+    a single transaction. Returns the number of newly inserted miners.
+
+    skipped_wallets, if given, is a set that collects the names of wallets
+    whose hotkeys were skipped because the wallet has no database row.
+    """
+    now = datetime.utcnow()
+    inserted = 0
+    try:
+        for batch in _batches(hotkeys, BULK_INSERT_BATCH_SIZE):
+            wallet_ids = dict(db.session.execute(
+                select(Wallet.coldkey_name, Wallet.id)
+                .where(Wallet.coldkey_name.in_({hotkey.wallet_name for hotkey in batch}))
+            ).all())
+            existing_hotkeys = set(db.session.execute(
+                select(Miners.hotkey).where(Miners.hotkey.in_({hotkey.hotkey_address for hotkey in batch}))
+            ).scalars())
+
+            rows = {}
+            for hotkey in batch:
+                # Find corresponding wallet record
+                wallet_id = wallet_ids.get(hotkey.wallet_name)
+                if wallet_id is None:
+                    print(f"Warning: Wallet '{hotkey.wallet_name}' not found in database, skipping hotkey '{hotkey.hotkey_name}'")
+                    if skipped_wallets is not None:
+                        skipped_wallets.add(hotkey.wallet_name)
+                    continue
+
+                if hotkey.hotkey_address in existing_hotkeys or hotkey.hotkey_address in rows:
+                    continue  # Skip if the hotkey already exists
+
+                rows[hotkey.hotkey_address] = {
+                    'name': hotkey.hotkey_name,
+                    'wallet': hotkey.wallet_name,
+                    'hotkey': hotkey.hotkey_address,
+                    'coldkey_id': wallet_id,
+                    'created_at': now,
+                    'updated_at': now
+                }
+            inserted += _insert_ignore(Miners.__table__, list(rows.values()))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return inserted
+
+def _insert_ignore(table, rows):
+    """Insert rows in batches, skipping rows that hit a unique constraint.
+
+    Returns the number of inserted rows.
+    """
+    if not rows:
+        return 0
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise NotImplementedError(f"Bulk insert is not supported for dialect '{dialect}'")
+
+    inserted = 0
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        stmt = insert(table).values(rows[start:start + BULK_INSERT_BATCH_SIZE])
+        if dialect in ('mysql', 'mariadb'):
+            stmt = stmt.prefix_with('IGNORE')
+        else:
+            stmt = stmt.on_conflict_do_nothing()
+        inserted += max(db.session.execute(stmt).rowcount, 0)
 
-        # Check if the hotkey already exists in the database
-        existing_miner = Miners.find_by_hotkey(hotkey.hotkey_address)
-        if existing_miner:
-            continue  # Skip if the hotkey already exists
-
-        # Insert new miner into the database
-        Miners.create(
-            name=hotkey.hotkey_name,
-            wallet=hotkey.wallet_name,
-            hotkey=hotkey.hotkey_address,
-            coldkey_id=wallet.id
-        )
+    return inserted
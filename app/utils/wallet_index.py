@@ -0,0 +1,232 @@
+"""
+钱包内存索引
+每个 worker 进程维护 wallets 和 external_wallets 的 名称/地址/ID 索引，热路径查找不再访问数据库。
+钱包同步和外部钱包增删改通过 Redis 发布失效通知，各进程收到后在下次查找时重新加载；
+索引未命中时回退查询数据库，保证新写入的钱包立即可见；数据库中也不存在的键
+在 WALLET_INDEX_MISS_TTL 秒内（或到索引重新加载前）直接返回未命中，不再重复查询
+"""
+
+import os
+import time
+import threading
+from collections import namedtuple
+
+from app.extensions import db, logger
+
+# 失效通知频道
+INDEX_CHANNEL = 'wallet_index:invalidate'
+
+# 未命中缓存的最大条目数，超过时整体清空
+MAX_MISSES = 10000
+
+IndexedWallet = namedtuple('IndexedWallet', ['id', 'name', 'address'])
+
+
+class WalletIndex:
+    """进程内钱包索引"""
+
+    def __init__(self):
+        self.app = None
+        self.max_age = 300
+        self.miss_ttl = 10
+        self._lock = threading.Lock()
+        self._stale = True
+        self._loaded_at = 0
+        self._loaded_pid = None
+        self._listener_pid = None
+        self._wallets_by_name = {}
+        self._wallets_by_address = {}
+        self._external_by_address = {}
+        self._misses = {}   # (类型, 键) -> 过期时间
+
+    def init_app(self, app):
+        """从应用配置初始化，并尝试预加载（数据库未就绪时在首次查找时加载）"""
+        self.app = app
+        self.max_age = app.config['WALLET_INDEX_MAX_AGE']
+        self.miss_ttl = app.config.get('WALLET_INDEX_MISS_TTL', self.miss_ttl)
+        app.extensions['wallet_index'] = self
+
+        try:
+            self.load()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"钱包索引预加载失败，将在首次使用时加载: {e}")
+        finally:
+            # gunicorn --preload 时这里运行在 fork 之前，不能把连接留给子进程共用
+            db.session.remove()
+            db.engine.dispose()
+
+    # =====================
+    # 查找
+    # =====================
+
+    def wallet_by_name(self, name):
+        """按钱包名查找本地钱包"""
+        self._ensure_fresh()
+        entry = self._wallets_by_name.get(name)
+        if entry is None:
+            entry = self._fallback_wallet(name=name)
+        return entry
+
+    def wallet_by_address(self, address):
+        """按地址查找本地钱包"""
+        self._ensure_fresh()
+        entry = self._wallets_by_address.get(address)
+        if entry is None:
+            entry = self._fallback_wallet(address=address)
+        return entry
+
+    def external_by_address(self, address):
+        """按地址查找启用中的外部钱包"""
+        self._ensure_fresh()
+        entry = self._external_by_address.get(address)
+        if entry is None:
+            entry = self._fallback_external(address)
+        return entry
+
+    def destination_by_address(self, address):
+        """
+        按地址查找转账目标：本地钱包或启用中的外部钱包
+
+        两个索引都查过之后才回退数据库，外部钱包地址不会先落到本地钱包的数据库查询
+
+        Returns:
+            tuple: (IndexedWallet, 'local' | 'external')，都不存在时为 (None, None)
+        """
+        self._ensure_fresh()
+        entry = self._wallets_by_address.get(address)
+        if entry is not None:
+            return entry, 'local'
+        entry = self._external_by_address.get(address)
+        if entry is not None:
+            return entry, 'external'
+
+        entry = self._fallback_wallet(address=address)
+        if entry is not None:
+            return entry, 'local'
+        entry = self._fallback_external(address)
+        if entry is not None:
+            return entry, 'external'
+        return None, None
+
+    # =====================
+    # 加载与失效
+    # =====================
+
+    def load(self):
+        """从数据库重新加载全部索引"""
+        from app.models.wallet import Wallet
+        from app.models.external_wallet import ExternalWallet
+
+        wallets = db.session.query(Wallet.id, Wallet.coldkey_name, Wallet.coldkey_address).all()
+        externals = db.session.query(ExternalWallet.id, ExternalWallet.name, ExternalWallet.address) \
+            .filter(ExternalWallet.is_active.is_(True)).all()
+
+        wallets_by_name, wallets_by_address = {}, {}
+        for row in wallets:
+            entry = IndexedWallet(*row)
+            wallets_by_name[entry.name] = entry
+            wallets_by_address[entry.address] = entry
+
+        external_by_address = {}
+        for row in externals:
+            entry = IndexedWallet(*row)
+            external_by_address[entry.address] = entry
+
+        # 整体替换，读取方无需加锁
+        self._wallets_by_name = wallets_by_name
+        self._wallets_by_address = wallets_by_address
+        self._external_by_address = external_by_address
+        self._misses = {}
+        self._loaded_at = time.time()
+        self._loaded_pid = os.getpid()
+        self._stale = False
+        logger.debug(f"钱包索引已加载: {len(wallets_by_name)} 个钱包，{len(external_by_address)} 个外部钱包")
+
+    def invalidate(self, publish=True):
+        """标记索引失效，并通知其他 worker"""
+        self._stale = True
+        if not publish:
+            return
+        try:
+            self.app.redis.publish(INDEX_CHANNEL, os.getpid())
+        except Exception as e:
+            logger.warning(f"发布钱包索引失效通知失败: {e}")
+
+    def _ensure_fresh(self):
+        self._ensure_listener()
+        if not self._stale and time.time() - self._loaded_at < self.max_age:
+            return
+        with self._lock:
+            if self._stale or time.time() - self._loaded_at >= self.max_age:
+                self.load()
+
+    def _ensure_listener(self):
+        """每个 worker 进程启动一个失效通知监听线程（fork 之后首次使用时启动）"""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            # fork 之前加载的数据在监听启动前可能已经过期
+            if self._loaded_pid != pid:
+                self._stale = True
+            threading.Thread(target=self._listen, name='wallet-index-listener', daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.app.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INDEX_CHANNEL)
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self._stale = True
+            except Exception as e:
+                # 断线期间可能错过通知，重连后重新加载
+                logger.warning(f"钱包索引失效通知监听异常: {e}")
+                self._stale = True
+                time.sleep(5)
+
+    def _fallback_wallet(self, name=None, address=None):
+        """索引未命中时查询数据库，查到说明索引已过期"""
+        from app.models.wallet import Wallet
+
+        key = ('name', name) if name is not None else ('address', address)
+        if self._recent_miss(key):
+            return None
+        wallet = Wallet.find_by_name(name) if name is not None else Wallet.find_by_address(address)
+        if wallet is None:
+            self._remember_miss(key)
+            return None
+        self._stale = True
+        return IndexedWallet(wallet.id, wallet.coldkey_name, wallet.coldkey_address)
+
+    def _fallback_external(self, address):
+        from app.models.external_wallet import ExternalWallet
+
+        key = ('external', address)
+        if self._recent_miss(key):
+            return None
+        external_wallet = ExternalWallet.find_by_address(address)
+        if external_wallet is None:
+            self._remember_miss(key)
+            return None
+        self._stale = True
+        return IndexedWallet(external_wallet.id, external_wallet.name, external_wallet.address)
+
+    def _recent_miss(self, key):
+        expires_at = self._misses.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def _remember_miss(self, key):
+        if self.miss_ttl <= 0:
+            return
+        misses = self._misses
+        if len(misses) >= MAX_MISSES:
+            misses = self._misses = {}
+        misses[key] = time.monotonic() + self.miss_ttl
+
+
+wallet_index = WalletIndex()
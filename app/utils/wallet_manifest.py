@@ -0,0 +1,129 @@
+"""
+钱包目录清单（扫描结果缓存）
+记录上次同步时每个钱包目录下文件的 (mtime, size, inode) 和解析出的地址，
+同步时只重新解析发生变化的文件；hotkeys 目录的 mtime 未变化时整个目录直接复用
+
+清单以 msgpack 二进制格式保存，新启动的 worker 一次读取即可恢复完整扫描结果，
+之后在同步时按目录 mtime 懒惰校验，不再重新解析整棵钱包树的 JSON 文件。
+旧版 JSON 清单（同名 .json 文件）在首次加载时自动迁移
+
+清单结构:
+    {
+        "version": 2,
+        "wallets": {
+            "<钱包名>": {
+                "coldkey": [mtime_ns, size, inode, ss58] | null,
+                "hotkeys_mtime": mtime_ns | null,
+                "hotkeys": {"<文件名>": [mtime_ns, size, inode, hotkey_name, ss58]}
+            }
+        }
+    }
+"""
+
+import os
+import json
+import threading
+
+import msgpack
+
+MANIFEST_VERSION = 2
+
+
+class WalletManifest:
+    """持久化的钱包目录清单（进程内缓存，文件被其他进程更新时重新加载）"""
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self.wallets = {}
+        self.dirty = False
+        self._loaded_mtime = None
+
+    @classmethod
+    def load(cls, path):
+        """获取指定路径的清单，文件未被其他进程修改时复用内存中的副本"""
+        with cls._instances_lock:
+            manifest = cls._instances.get(path)
+            if manifest is None:
+                manifest = cls._instances[path] = cls(path)
+        manifest._reload_if_changed()
+        return manifest
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self._loaded_mtime is None and not self.dirty:
+                self._migrate_legacy()
+            return
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = msgpack.unpackb(f.read(), raw=False)
+        except (OSError, ValueError, msgpack.UnpackException):
+            # 清单损坏时当作空清单，下次同步全量扫描
+            data = {}
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            data = {}
+
+        self.wallets = data.get('wallets', {})
+        self.dirty = False
+        self._loaded_mtime = mtime
+
+    def _migrate_legacy(self):
+        """导入旧版 JSON 清单，下次保存时写成 msgpack"""
+        legacy_path = os.path.splitext(self.path)[0] + '.json'
+        if legacy_path == self.path:
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != 1:
+            return
+
+        # 结构与当前版本一致，只是序列化格式不同
+        self.wallets = data.get('wallets', {})
+        self.dirty = True
+
+    def save(self):
+        """有变化时原子写入清单文件"""
+        if not self.dirty:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(msgpack.packb({'version': MANIFEST_VERSION, 'wallets': self.wallets}, use_bin_type=True))
+        os.replace(tmp_path, self.path)
+
+        self.dirty = False
+        self._loaded_mtime = os.stat(self.path).st_mtime_ns
+
+    def discard(self):
+        """丢弃内存中未保存的修改，重新从文件加载（同步写库失败时使用）"""
+        self.wallets = {}
+        self.dirty = False
+        self._loaded_mtime = None
+        self._reload_if_changed()
+
+    def forget_hotkeys(self, wallet_name):
+        """清除钱包的 hotkeys 记录，下次同步时重新解析该钱包的 hotkeys 目录（hotkey 未能入库时使用）"""
+        state = self.wallets.get(wallet_name)
+        if state is not None and (state['hotkeys_mtime'] is not None or state['hotkeys']):
+            state['hotkeys_mtime'] = None
+            state['hotkeys'] = {}
+            self.dirty = True
+
+    def reset(self):
+        """清空清单（强制全量重新扫描）"""
+        self.wallets = {}
+        self.dirty = True
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+钱包目录监听后台服务程序
+监听 BITTENSOR_WALLET_PATH 下钱包目录和 hotkeys 目录的变化（Linux 使用 inotify，
+其他平台或 inotify 不可用时退回定时轮询），发现变化后执行增量同步，
+将新增的 coldkey/hotkey 写入 wallets/miners 表
+"""
+
+import os
+import sys
+import time
+import errno
+import signal
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Dict, Any
+from dotenv import load_dotenv
+
+from sqlalchemy.exc import OperationalError, InterfaceError, DatabaseError
+
+# 添加项目路径到sys.path
+project_root = os.path.dirname(os.path.abspath(__file__))
+console_root = os.path.dirname(os.path.dirname(project_root))  # 向上两级到项目根目录
+sys.path.insert(0, console_root)
+
+# 加载环境变量
+load_dotenv(os.path.join(console_root, '.env'))
+
+from app import create_app
+from app.blueprints.wallet.services import WalletService
+
+# 监听配置
+WALLET_WATCH_DEBOUNCE = float(os.getenv('WALLET_WATCH_DEBOUNCE', '1'))          # 事件合并等待时间（秒）
+WALLET_WATCH_INTERVAL = int(os.getenv('WALLET_WATCH_INTERVAL', '5'))             # 轮询模式的扫描间隔（秒）
+WALLET_WATCH_RESCAN_INTERVAL = int(os.getenv('WALLET_WATCH_RESCAN_INTERVAL', '300'))  # inotify 模式下的兜底扫描间隔（秒）
+WALLET_WATCH_FORCE_POLLING = os.getenv('WALLET_WATCH_FORCE_POLLING', 'false').lower() == 'true'
+
+# 配置日志
+log_dir = 'logs'
+if not os.path.exists(log_dir):
+    os.makedirs(log_dir)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(os.path.join(log_dir, 'wallet_watcher.log'))
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# inotify 事件掩码
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM |
+              IN_DELETE | IN_DELETE_SELF | IN_ATTRIB | IN_MODIFY)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class Inotify:
+    """基于 ctypes 的最小 inotify 封装"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("inotify not supported")
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # wd -> 目录路径
+
+    def add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch failed: {os.strerror(err)}", path)
+        self.watches[wd] = path
+        return wd
+
+    def read_events(self, timeout):
+        """等待并读取事件，返回 [(目录路径, 文件名, 掩码)]"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0').decode(errors='replace')
+            offset += name_len
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            events.append((self.watches.get(wd), name, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class WalletWatcherService:
+    """
+    钱包目录监听服务类
+    """
+
+    def __init__(self, app, debounce: float = 1, poll_interval: int = 5,
+                 rescan_interval: int = 300, force_polling: bool = False):
+        """
+        初始化监听服务
+
+        Args:
+            app: Flask 应用（同步逻辑在应用上下文中执行）
+            debounce: 事件合并等待时间（秒）
+            poll_interval: 轮询模式的扫描间隔（秒）
+            rescan_interval: inotify 模式下的兜底扫描间隔（秒）
+            force_polling: 强制使用轮询模式
+        """
+        self.app = app
+        self.wallet_path = os.path.expanduser(app.config['BITTENSOR_WALLET_PATH'])
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.force_polling = force_polling
+        self.running = False
+        self.thread = None
+        self.mode = None
+        self.last_sync = None
+        self.sync_count = 0
+
+    def start(self):
+        """
+        启动监听服务
+        """
+        if self.running:
+            logger.warning("钱包目录监听服务已经在运行中")
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run_service, daemon=True)
+        self.thread.start()
+        logger.info(f"钱包目录监听服务已启动，监听路径: {self.wallet_path}")
+
+    def stop(self):
+        """
+        停止监听服务
+        """
+        if not self.running:
+            logger.warning("钱包目录监听服务未在运行")
+            return
+
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+        logger.info("钱包目录监听服务已停止")
+
+    def _run_service(self):
+        """
+        运行监听服务主循环
+        """
+        # 启动时先同步一次
+        self._sync()
+
+        inotify = None
+        if not self.force_polling:
+            try:
+                inotify = Inotify()
+            except OSError as e:
+                logger.warning(f"inotify 不可用，使用轮询模式: {e}")
+
+        if inotify is None:
+            self.mode = 'polling'
+            self._poll_loop()
+        else:
+            self.mode = 'inotify'
+            try:
+                self._inotify_loop(inotify)
+            finally:
+                inotify.close()
+
+    def _poll_loop(self):
+        """轮询模式：定时执行增量同步（依赖清单，未变化时开销很小）"""
+        while self.running:
+            time.sleep(self.poll_interval)
+            self._sync()
+
+    def _inotify_loop(self, inotify):
+        """inotify 模式：收到事件后合并一段时间再同步"""
+        self._add_watches(inotify)
+        last_sync = time.time()
+        pending = False
+        overflowed = False
+
+        while self.running:
+            events = inotify.read_events(self.debounce if pending else 1)
+            if events:
+                pending = True
+                for directory, name, mask in events:
+                    if mask & IN_Q_OVERFLOW:
+                        logger.warning("inotify 事件队列溢出，将执行全量扫描")
+                        overflowed = True
+                    # 新建的钱包目录或 hotkeys 目录需要加入监听
+                    if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and directory:
+                        self._add_watches(inotify, os.path.join(directory, name))
+                continue
+
+            # 事件停止后执行同步，或到达兜底扫描间隔
+            if pending or time.time() - last_sync >= self.rescan_interval:
+                # 队列溢出时丢失的事件无法通过目录 mtime 完全找回，忽略清单全量扫描
+                if not self._sync(force=overflowed):
+                    # 被单飞跳过的同步可能没有看到本次变化，保留待同步状态，合并等待后重试
+                    continue
+                self._add_watches(inotify)
+                last_sync = time.time()
+                pending = False
+                overflowed = False
+
+    def _add_watches(self, inotify, path=None):
+        """为钱包根目录、每个钱包目录及其 hotkeys 目录添加监听（已监听的跳过）"""
+        watched = set(inotify.watches.values())
+        candidates = []
+        if path is None:
+            candidates.append(self.wallet_path)
+            try:
+                for entry in os.scandir(self.wallet_path):
+                    if entry.is_dir():
+                        candidates.append(entry.path)
+                        candidates.append(os.path.join(entry.path, 'hotkeys'))
+            except OSError as e:
+                logger.error(f"读取钱包目录失败: {e}")
+        else:
+            candidates.append(path)
+            candidates.append(os.path.join(path, 'hotkeys'))
+
+        for candidate in candidates:
+            if candidate in watched or not os.path.isdir(candidate):
+                continue
+            try:
+                inotify.add_watch(candidate)
+            except OSError as e:
+                logger.warning(f"添加目录监听失败 {candidate}: {e}")
+
+    def _sync(self, force=False):
+        """
+        在应用上下文中执行增量同步（force 为True时全量扫描）
+
+        Returns:
+            bool: 同步被单飞跳过（skipped_*）时返回False，需要稍后重试
+        """
+        try:
+            with self.app.app_context():
+                outcome = WalletService.sync_wallets_from_filesystem(force=force)
+            if outcome.startswith('skipped'):
+                return False
+            self.last_sync = time.time()
+            self.sync_count += 1
+        except (OperationalError, InterfaceError, DatabaseError) as e:
+            logger.error(f"数据库连接异常，程序即将退出: {e}")
+            logger.error("等待外部管理程序重启...")
+            os._exit(1)
+        except Exception as e:
+            logger.error(f"同步钱包时出错: {e}")
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+
+        Returns:
+            服务状态信息
+        """
+        return {
+            'running': self.running,
+            'mode': self.mode,
+            'wallet_path': self.wallet_path,
+            'last_sync': self.last_sync,
+            'sync_count': self.sync_count,
+            'thread_alive': self.thread.is_alive() if self.thread else False
+        }
+
+
+service = None
+
+def signal_handler(signum, frame):
+    """
+    信号处理器，用于优雅关闭服务
+    """
+    logger.info(f"接收到信号 {signum}，准备关闭服务...")
+    global service
+    if service:
+        service.stop()
+    sys.exit(0)
+
+def main():
+    """
+    主函数
+    """
+    logger.info("钱包目录监听服务启动中...")
+
+    # 注册信号处理器
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # 创建并启动监听服务
+    global service
+    service = WalletWatcherService(
+        app=create_app(),
+        debounce=WALLET_WATCH_DEBOUNCE,
+        poll_interval=WALLET_WATCH_INTERVAL,
+        rescan_interval=WALLET_WATCH_RESCAN_INTERVAL,
+        force_polling=WALLET_WATCH_FORCE_POLLING
+    )
+    service.start()
+
+    try:
+        # 保持主线程运行
+        while service.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("接收到键盘中断，关闭服务...")
+    finally:
+        service.stop()
+        logger.info("钱包目录监听服务已关闭")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+余额查询基准测试：对比一次性查询与分块并发查询在不同钱包数量下的耗时
+
+默认使用模拟节点（延迟 = 固定往返 + 每地址处理/传输时间），无需连接网络：
+    python benchmarks/bench_balances.py --counts 100 500 1000 5000
+
+连接真实网络（地址从文件读取，每行一个 ss58 地址，按需截取前 N 个）：
+    python benchmarks/bench_balances.py --network finney --coldkeys-file coldkeys.txt
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.blockchain import get_wallets_balances
+
+
+class FakeSubstrate:
+    async def get_chain_head(self):
+        return '0x' + '00' * 32
+
+
+class SimulatedRPCError(Exception):
+    """模拟的 RPC 请求错误（非连接断开，按分块重试）"""
+
+
+class FakeSubtensor:
+    """模拟 SubtensorInterface：单次调用延迟随地址数线性增长，并按概率失败"""
+
+    def __init__(self, rtt=0.05, per_key=0.0004, failure_rate=0.0):
+        self.substrate = FakeSubstrate()
+        self.rtt = rtt
+        self.per_key = per_key
+        self.failure_rate = failure_rate
+
+    async def _simulate(self, coldkeys):
+        await asyncio.sleep(self.rtt + self.per_key * len(coldkeys))
+        if random.random() < self.failure_rate:
+            raise SimulatedRPCError("simulated RPC failure")
+
+    async def get_balances(self, *coldkeys, block_hash=None):
+        await self._simulate(coldkeys)
+        return {coldkey: 0 for coldkey in coldkeys}
+
+    async def get_total_stake_for_coldkey(self, *coldkeys, block_hash=None):
+        await self._simulate(coldkeys)
+        return {coldkey: (0, 0) for coldkey in coldkeys}
+
+
+async def run_once(subtensor, coldkeys, chunk_size, concurrency, retries):
+    started = time.perf_counter()
+    try:
+        await get_wallets_balances(
+            coldkeys, subtensor=subtensor,
+            chunk_size=chunk_size, concurrency=concurrency, retries=retries
+        )
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+async def main(args):
+    if args.network:
+        from bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+        subtensor = SubtensorInterface(network=args.network)
+        await subtensor.substrate.initialize()
+        with open(args.coldkeys_file) as f:
+            pool = [line.strip() for line in f if line.strip()]
+    else:
+        subtensor = FakeSubtensor(rtt=args.rtt, per_key=args.per_key, failure_rate=args.failure_rate)
+        pool = [f"5Fake{i:043d}" for i in range(max(args.counts))]
+
+    results = []
+    for count in args.counts:
+        coldkeys = pool[:count]
+        for mode, chunk_size in (('single', None), ('chunked', args.chunk_size)):
+            timings, failures = [], 0
+            for _ in range(args.repeat):
+                elapsed, ok = await run_once(subtensor, coldkeys, chunk_size, args.concurrency, args.retries)
+                timings.append(elapsed)
+                failures += 0 if ok else 1
+            timings.sort()
+            results.append({
+                'wallets': len(coldkeys),
+                'mode': mode,
+                'chunk_size': chunk_size,
+                'concurrency': args.concurrency if chunk_size else 1,
+                'median_s': round(timings[len(timings) // 2], 4),
+                'max_s': round(timings[-1], 4),
+                'failures': failures,
+            })
+            print(f"{len(coldkeys):>6} wallets  {mode:<8} median {results[-1]['median_s']:.3f}s  "
+                  f"max {results[-1]['max_s']:.3f}s  failures {failures}/{args.repeat}")
+
+    if args.network:
+        await subtensor.substrate.close()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="余额查询基准测试")
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000])
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rtt', type=float, default=0.05, help="模拟单次往返延迟（秒）")
+    parser.add_argument('--per-key', type=float, default=0.0004, help="模拟每个地址的处理时间（秒）")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="模拟单次调用失败概率")
+    parser.add_argument('--network', help="连接真实网络（如 finney, test）")
+    parser.add_argument('--coldkeys-file', help="真实网络测试使用的地址文件")
+    parser.add_argument('--output', help="JSON 结果输出路径")
+    asyncio.run(main(parser.parse_args()))
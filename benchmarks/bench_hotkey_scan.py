@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hotkey 扫描基准测试：对比旧的串行 listdir 实现与并行 scandir 实现
+
+在临时目录生成合成钱包树（默认 1000 个钱包 × 100 个 hotkey），每个实现运行多次取中位数：
+    python benchmarks/bench_hotkey_scan.py --wallets 1000 --hotkeys 100 --output hotkey_scan.json
+
+页缓存会显著影响结果：热缓存时解析 JSON 占主要耗时（受 GIL 限制，线程数影响不大），
+冷缓存或网络文件系统上等待 I/O 占主要耗时，并行扫描收益明显。
+--drop-caches（需要 root）在每次运行前清空页缓存以测量冷启动
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.wallet_db import Hotkey_data, get_hotkey_wallets_for_path
+from benchmarks.wallet_tree import build_tree
+
+
+def legacy_get_hotkey_wallets_for_path(path: str):
+    """旧实现（os.listdir + 逐项 isdir/isfile，两遍扫描，串行读取），仅用于对比"""
+    hotkeys = []
+    try:
+        # Walk through the directory
+        path = os.path.expanduser(path)
+
+        for wallet_folder in os.listdir(path):
+            wallet_path = os.path.join(path, wallet_folder)
+            # Check if it is a directory (wallet folder)
+            if not os.path.isdir(wallet_path):
+                continue
+
+            # Check if hotkeys directory exists
+            hotkeys_path = os.path.join(wallet_path, 'hotkeys')
+            if not os.path.exists(hotkeys_path) or not os.path.isdir(hotkeys_path):
+                continue
+
+            # Get all files in hotkeys directory
+            hotkey_files = os.listdir(hotkeys_path)
+            processed_hotkeys = set()  # Track processed hotkey names to avoid duplicates
+
+            # First pass: process pub.txt files (preferred)
+            for item in hotkey_files:
+                if item.endswith('pub.txt'):
+                    hotkey_name = item[:-7]  # Remove 'pub.txt' suffix
+                    hotkeypub_file = os.path.join(hotkeys_path, item)
+
+                    if os.path.isfile(hotkeypub_file):
+                        try:
+                            with open(hotkeypub_file, 'r') as file:
+                                # Read and parse the hotkeypub.txt content
+                                data = json.load(file)
+                                hotkey_address = data.get('ss58Address', '')
+                                if hotkey_address:
+                                    hotkeys.append(Hotkey_data(
+                                        wallet_name=wallet_folder,
+                                        hotkey_name=hotkey_name,
+                                        hotkey_address=hotkey_address
+                                    ))
+                                    processed_hotkeys.add(hotkey_name)
+                        except (json.JSONDecodeError, IOError) as e:
+                            print(f"Error reading pub file {hotkeypub_file}: {e}")
+
+            # Second pass: process private key files that don't have corresponding pub files
+            for item in hotkey_files:
+                # Skip pub.txt files and files we've already processed
+                if item.endswith('pub.txt') or item in processed_hotkeys:
+                    continue
+
+                hotkey_file = os.path.join(hotkeys_path, item)
+                if os.path.isfile(hotkey_file):
+                    try:
+                        with open(hotkey_file, 'r') as file:
+                            # Try to read as JSON (private key file format)
+                            data = json.load(file)
+                            hotkey_address = data.get('ss58Address', '')
+                            if hotkey_address:
+                                hotkeys.append(Hotkey_data(
+                                    wallet_name=wallet_folder,
+                                    hotkey_name=item,  # Use filename as hotkey name
+                                    hotkey_address=hotkey_address
+                                ))
+                                processed_hotkeys.add(item)
+                    except (json.JSONDecodeError, IOError) as e:
+                        # Skip files that are not JSON format or can't be read
+                        print(f"Skipping non-JSON file {hotkey_file}: {e}")
+                        continue
+
+    except Exception as e:
+        print(f"Read Hotkeys Error: {e}")
+
+    return hotkeys
+
+
+def drop_caches():
+    subprocess.run(['sync'], check=True)
+    with open('/proc/sys/vm/drop_caches', 'w') as f:
+        f.write('3\n')
+
+
+def measure(func, root, repeat, cold):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        if cold:
+            drop_caches()
+        started = time.perf_counter()
+        count = len(func(root))
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return count, timings
+
+
+def main(args):
+    root = args.path or tempfile.mkdtemp(prefix='wallet_tree_')
+    try:
+        if not args.path:
+            started = time.perf_counter()
+            build_tree(root, args.wallets, args.hotkeys)
+            print(f"生成钱包树 {args.wallets} × {args.hotkeys}，耗时 {time.perf_counter() - started:.1f}s")
+
+        implementations = [('legacy', legacy_get_hotkey_wallets_for_path)]
+        for workers in args.workers:
+            implementations.append((f"scandir_x{workers}",
+                                    lambda path, workers=workers: get_hotkey_wallets_for_path(path, workers)))
+
+        results = []
+        for name, func in implementations:
+            count, timings = measure(func, root, args.repeat, args.drop_caches)
+            results.append({
+                'implementation': name,
+                'wallets': args.wallets,
+                'hotkeys_per_wallet': args.hotkeys,
+                'hotkeys_found': count,
+                'median_s': round(timings[len(timings) // 2], 4),
+                'min_s': round(timings[0], 4),
+                'cold_cache': args.drop_caches,
+            })
+            print(f"{name:<14} {count:>8} hotkeys  median {results[-1]['median_s']:.3f}s  min {results[-1]['min_s']:.3f}s")
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+    finally:
+        if not args.path:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="hotkey 扫描基准测试")
+    parser.add_argument('--wallets', type=int, default=1000)
+    parser.add_argument('--hotkeys', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 16])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--path', help="使用已有的钱包目录而不是生成合成树")
+    parser.add_argument('--drop-caches', action='store_true', help="每次运行前清空页缓存（需要 root）")
+    parser.add_argument('--output', help="JSON 结果输出路径")
+    main(parser.parse_args())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+合成 Bittensor 钱包树生成器（基准测试共用）
+
+目录结构与 btcli 生成的一致：
+    <root>/<coldkey>/coldkey              加密私钥（内容无关紧要）
+    <root>/<coldkey>/coldkeypub.txt       {"ss58Address": ...}
+    <root>/<coldkey>/hotkeys/<name>       hotkey 私钥文件（JSON）
+    <root>/<coldkey>/hotkeys/<name>pub.txt
+
+hotkey 按比例生成 "私钥+pub"、"仅 pub"、"仅私钥" 三种组合，另外按比例混入损坏文件
+（截断的 JSON、缺少 ss58Address、二进制内容、空文件），用于覆盖扫描代码的异常分支。
+损坏文件只放在 hotkeys 目录下，不计入预期的 hotkey 数量
+"""
+
+import os
+import json
+import random
+
+# 损坏文件的内容
+MALFORMED_CONTENTS = [
+    b'{"ss58Address": "5F',
+    b'{"publicKey": "0x00"}',
+    b'\x00\x01\x02\xff\xfe',
+    b'',
+]
+
+
+def fake_address(prefix, *numbers):
+    """生成 48 个字符、在整棵树内唯一的伪 ss58 地址"""
+    return (prefix + ''.join(f"{n:06d}" for n in numbers)).ljust(48, 'x')
+
+
+def build_tree(root, coldkeys, hotkeys, pub_only=0.0, priv_only=0.0, malformed=0.0,
+               missing_coldkeypub=0.0, seed=0):
+    """
+    在 root 下生成钱包树
+
+    Args:
+        root: 目标目录（需为空或不存在）
+        coldkeys: coldkey 数量
+        hotkeys: 每个 coldkey 的 hotkey 数量
+        pub_only: 只有 pub.txt 的 hotkey 比例
+        priv_only: 只有私钥文件的 hotkey 比例（其余同时有两种文件）
+        malformed: 每个 hotkey 额外生成一个损坏文件的概率
+        missing_coldkeypub: 缺少 coldkeypub.txt 的 coldkey 比例
+        seed: 随机种子，相同参数生成相同的树
+
+    Returns:
+        dict: 生成统计（文件数、预期可解析的 coldkey/hotkey 数量等）
+    """
+    rng = random.Random(seed)
+    stats = {
+        'coldkeys': coldkeys,
+        'hotkeys_per_coldkey': hotkeys,
+        'expected_coldkeys': 0,
+        'expected_hotkeys': 0,
+        'files': 0,
+        'malformed_files': 0,
+    }
+
+    for c in range(coldkeys):
+        wallet_path = os.path.join(root, f"wallet{c:05d}")
+        hotkeys_path = os.path.join(wallet_path, 'hotkeys')
+        os.makedirs(hotkeys_path)
+
+        _write(os.path.join(wallet_path, 'coldkey'), os.urandom(64))
+        stats['files'] += 1
+        if rng.random() >= missing_coldkeypub:
+            _write_json(os.path.join(wallet_path, 'coldkeypub.txt'), {
+                'accountId': '0x' + '00' * 32,
+                'publicKey': '0x' + '00' * 32,
+                'ss58Address': fake_address('5C', c),
+            })
+            stats['files'] += 1
+            stats['expected_coldkeys'] += 1
+
+        for h in range(hotkeys):
+            address = fake_address('5H', c, h)
+            kind = rng.random()
+            if kind >= pub_only:
+                _write_json(os.path.join(hotkeys_path, f"h{h}"), {
+                    'accountId': '0x' + '00' * 32,
+                    'publicKey': '0x' + '00' * 32,
+                    'secretPhrase': ' '.join(['word'] * 12),
+                    'secretSeed': '0x' + '00' * 32,
+                    'ss58Address': address,
+                })
+                stats['files'] += 1
+            if kind < pub_only or kind >= pub_only + priv_only:
+                _write_json(os.path.join(hotkeys_path, f"h{h}pub.txt"), {
+                    'accountId': '0x' + '00' * 32,
+                    'publicKey': '0x' + '00' * 32,
+                    'ss58Address': address,
+                })
+                stats['files'] += 1
+            stats['expected_hotkeys'] += 1
+
+            if rng.random() < malformed:
+                name = f"broken{h}pub.txt" if rng.random() < 0.5 else f"broken{h}"
+                _write(os.path.join(hotkeys_path, name), rng.choice(MALFORMED_CONTENTS))
+                stats['files'] += 1
+                stats['malformed_files'] += 1
+
+    return stats
+
+
+def _write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _write_json(path, data):
+    _write(path, json.dumps(data).encode())
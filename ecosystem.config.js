@@ -65,6 +65,106 @@ module.exports = {
             restart_delay: 5000,
             max_restarts: 10,
             min_uptime: '10s'
+        },
+        {
+            name: 'balance-poller',
+            script: 'app/utils/balance_poller.py',
+            interpreter: './venv/bin/python',
+            cwd: '/root/workspace/wallet_management_flask',
+            instances: 1,
+            autorestart: true,
+            watch: false,
+            max_memory_restart: '1G',
+            env: {
+                PYTHONPATH: '/root/workspace/wallet_management_flask',
+                PYTHONUNBUFFERED: '1'
+            },
+            env_file: '.env',
+            error_file: './logs/balance-poller-error.log',
+            out_file: './logs/balance-poller-out.log',
+            log_file: './logs/balance-poller-combined.log',
+            time: true,
+            log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
+            merge_logs: true,
+            kill_timeout: 5000,
+            restart_delay: 5000,
+            max_restarts: 10,
+            min_uptime: '10s'
+        },
+        {
+            name: 'balance-subscriber',
+            script: 'app/utils/balance_subscriber.py',
+            interpreter: './venv/bin/python',
+            cwd: '/root/workspace/wallet_management_flask',
+            instances: 1,
+            autorestart: true,
+            watch: false,
+            max_memory_restart: '1G',
+            env: {
+                PYTHONPATH: '/root/workspace/wallet_management_flask',
+                PYTHONUNBUFFERED: '1'
+            },
+            env_file: '.env',
+            error_file: './logs/balance-subscriber-error.log',
+            out_file: './logs/balance-subscriber-out.log',
+            log_file: './logs/balance-subscriber-combined.log',
+            time: true,
+            log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
+            merge_logs: true,
+            kill_timeout: 5000,
+            restart_delay: 5000,
+            max_restarts: 10,
+            min_uptime: '10s'
+        },
+        {
+            name: 'wallet-watcher',
+            script: 'app/utils/wallet_watcher.py',
+            interpreter: './venv/bin/python',
+            cwd: '/root/workspace/wallet_management_flask',
+            instances: 1,
+            autorestart: true,
+            watch: false,
+            max_memory_restart: '1G',
+            env: {
+                PYTHONPATH: '/root/workspace/wallet_management_flask',
+                PYTHONUNBUFFERED: '1'
+            },
+            env_file: '.env',
+            error_file: './logs/wallet-watcher-error.log',
+            out_file: './logs/wallet-watcher-out.log',
+            log_file: './logs/wallet-watcher-combined.log',
+            time: true,
+            log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
+            merge_logs: true,
+            kill_timeout: 5000,
+            restart_delay: 5000,
+            max_restarts: 10,
+            min_uptime: '10s'
+        },
+        {
+            name: 'transfer-worker',
+            script: 'app/utils/transfer_worker.py',
+            interpreter: './venv/bin/python',
+            cwd: '/root/workspace/wallet_management_flask',
+            instances: 1,
+            autorestart: true,
+            watch: false,
+            max_memory_restart: '1G',
+            env: {
+                PYTHONPATH: '/root/workspace/wallet_management_flask',
+                PYTHONUNBUFFERED: '1'
+            },
+            env_file: '.env',
+            error_file: './logs/transfer-worker-error.log',
+            out_file: './logs/transfer-worker-out.log',
+            log_file: './logs/transfer-worker-combined.log',
+            time: true,
+            log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
+            merge_logs: true,
+            kill_timeout: 70000,
+            restart_delay: 5000,
+            max_restarts: 10,
+            min_uptime: '10s'
         }
     ]
 };
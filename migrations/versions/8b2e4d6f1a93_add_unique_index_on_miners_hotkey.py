@@ -0,0 +1,34 @@
+"""Add unique index on miners.hotkey
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9a1c2d7b45
+Create Date: 2026-10-16 14:27:05.631902
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f9a1c2d7b45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 合并重复的 hotkey：注册记录指向保留的（id 最小的）矿工，再删除重复行
+    op.execute("""
+        UPDATE miners_to_reg SET miners_id = (
+            SELECT MIN(keep.id) FROM miners dup JOIN miners keep ON keep.hotkey = dup.hotkey
+            WHERE dup.id = miners_to_reg.miners_id
+        )
+    """)
+    op.execute("DELETE FROM miners WHERE id NOT IN (SELECT MIN(id) FROM miners GROUP BY hotkey)")
+
+    with op.batch_alter_table('miners', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_miners_hotkey'), ['hotkey'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('miners', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_miners_hotkey'))